@@ -0,0 +1,51 @@
+"""price history runs
+
+Revision ID: 3f9a1c2d7e54
+Revises: 26152d44c7b6
+Create Date: 2026-10-17 10:12:03.114520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7e54'
+down_revision: Union[str, Sequence[str], None] = '26152d44c7b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = _columns("price_history")
+    if not columns:
+        # Fresh database: init_db creates the table with the new layout
+        return
+
+    if "last_seen_at" not in columns:
+        op.add_column("price_history", sa.Column("last_seen_at", sa.DateTime(), nullable=True))
+        op.execute("UPDATE price_history SET last_seen_at = scraped_at")
+        op.alter_column("price_history", "last_seen_at", nullable=False)
+        op.create_index("ix_price_history_last_seen_at", "price_history", ["last_seen_at"])
+    if "sample_count" not in columns:
+        op.add_column("price_history", sa.Column("sample_count", sa.Integer(), nullable=False, server_default="1"))
+    if "is_available" not in columns:
+        op.add_column("price_history", sa.Column("is_available", sa.Boolean(), nullable=False, server_default=sa.true()))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_price_history_last_seen_at", table_name="price_history")
+    op.drop_column("price_history", "is_available")
+    op.drop_column("price_history", "sample_count")
+    op.drop_column("price_history", "last_seen_at")
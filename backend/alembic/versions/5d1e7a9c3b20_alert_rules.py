@@ -0,0 +1,54 @@
+"""alert rules
+
+Revision ID: 5d1e7a9c3b20
+Revises: 8b2e4f6a1c93
+Create Date: 2026-10-17 14:05:12.118374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e7a9c3b20'
+down_revision: Union[str, Sequence[str], None] = '8b2e4f6a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = _columns("alerts")
+    if not columns:
+        # Fresh database: init_db creates the table with the new layout
+        return
+
+    if "rule_type" not in columns:
+        # Every existing alert is a fixed-target alert
+        op.add_column(
+            "alerts",
+            sa.Column("rule_type", sa.String(), nullable=False, server_default="target_price")
+        )
+    if "rule_percent" not in columns:
+        op.add_column("alerts", sa.Column("rule_percent", sa.Float(), nullable=True))
+    if "rule_window_days" not in columns:
+        op.add_column("alerts", sa.Column("rule_window_days", sa.Integer(), nullable=True))
+    op.alter_column("alerts", "target_price", existing_type=sa.Float(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM alerts WHERE target_price IS NULL")
+    op.alter_column("alerts", "target_price", existing_type=sa.Float(), nullable=False)
+    op.drop_column("alerts", "rule_window_days")
+    op.drop_column("alerts", "rule_percent")
+    op.drop_column("alerts", "rule_type")
@@ -0,0 +1,47 @@
+"""adaptive scrape schedule
+
+Revision ID: 8b2e4f6a1c93
+Revises: 3f9a1c2d7e54
+Create Date: 2026-10-17 11:40:27.501338
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4f6a1c93'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c2d7e54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = _columns("products")
+    if not columns:
+        # Fresh database: init_db creates the table with the new layout
+        return
+
+    if "last_scraped_at" not in columns:
+        op.add_column("products", sa.Column("last_scraped_at", sa.DateTime(), nullable=True))
+    if "next_scrape_at" not in columns:
+        # NULL means "due now", so existing products are picked up on the next tick
+        op.add_column("products", sa.Column("next_scrape_at", sa.DateTime(), nullable=True))
+        op.create_index("ix_products_next_scrape_at", "products", ["next_scrape_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_next_scrape_at", table_name="products")
+    op.drop_column("products", "next_scrape_at")
+    op.drop_column("products", "last_scraped_at")
@@ -0,0 +1,51 @@
+"""notification outbox
+
+Revision ID: 9a4c2e6b8d17
+Revises: 5d1e7a9c3b20
+Create Date: 2026-10-17 14:52:40.663015
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c2e6b8d17'
+down_revision: Union[str, Sequence[str], None] = '5d1e7a9c3b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table("notification_outbox"):
+        # Fresh database: init_db already created it
+        return
+
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("dedup_key", sa.String(), nullable=False),
+        sa.Column("alert_id", sa.Integer(), nullable=True),
+        sa.Column("contact_method", sa.String(), nullable=False),
+        sa.Column("contact_value", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_notification_outbox_dedup_key", "notification_outbox", ["dedup_key"], unique=True)
+    op.create_index("ix_notification_outbox_alert_id", "notification_outbox", ["alert_id"])
+    op.create_index("ix_notification_outbox_status", "notification_outbox", ["status"])
+    op.create_index("ix_notification_outbox_next_attempt_at", "notification_outbox", ["next_attempt_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("notification_outbox")
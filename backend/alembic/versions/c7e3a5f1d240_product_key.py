@@ -0,0 +1,73 @@
+"""product key
+
+Revision ID: c7e3a5f1d240
+Revises: 9a4c2e6b8d17
+Create Date: 2026-10-17 16:05:12.318774
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.scraper.canonical import canonicalize
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e3a5f1d240'
+down_revision: Union[str, Sequence[str], None] = '9a4c2e6b8d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = _columns("products")
+    if not columns or "product_key" in columns:
+        # Fresh database: init_db creates the table with the new layout
+        return
+
+    op.add_column("products", sa.Column("product_key", sa.String(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, url FROM products ORDER BY id")).all()
+
+    # Links that turn out to be the same product merge into the oldest row
+    survivors = {}
+    duplicates = {}
+    for product_id, url in rows:
+        key = canonicalize(url).key
+        if key in survivors:
+            duplicates[product_id] = survivors[key]
+        else:
+            survivors[key] = product_id
+
+    for duplicate_id, survivor_id in duplicates.items():
+        params = {"duplicate": duplicate_id, "survivor": survivor_id}
+        bind.execute(sa.text("UPDATE price_history SET product_id = :survivor WHERE product_id = :duplicate"), params)
+        bind.execute(sa.text("UPDATE alerts SET product_id = :survivor WHERE product_id = :duplicate"), params)
+        bind.execute(sa.text("DELETE FROM products WHERE id = :duplicate"), params)
+
+    for key, product_id in survivors.items():
+        bind.execute(
+            sa.text("UPDATE products SET product_key = :key WHERE id = :id"),
+            {"key": key, "id": product_id}
+        )
+
+    if duplicates:
+        print(f"[Migration] Merged {len(duplicates)} duplicate product(s) into {len(survivors)} canonical ones")
+
+    op.create_index("ix_products_product_key", "products", ["product_key"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_product_key", table_name="products")
+    op.drop_column("products", "product_key")
@@ -21,7 +21,7 @@ Example:
 from datetime import datetime, timedelta
 from typing import Optional, List
 from dataclasses import dataclass
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.product import Product, PriceHistory
@@ -52,34 +52,72 @@ class PriceAnalysis:
     recommendation: str
     
 
+def _samples_in_window(cutoff_date: datetime):
+    """
+    How many scrapes of each price_history run fall after cutoff_date.
+    
+    Runs fully inside the window count all their samples; a run straddling the
+    cutoff counts the share of its samples after it (assuming even spacing).
+    With one row per scrape this is always 1, so stats match the old layout.
+    """
+    run_seconds = func.extract("epoch", PriceHistory.last_seen_at - PriceHistory.scraped_at)
+    seconds_in_window = func.extract("epoch", PriceHistory.last_seen_at - cutoff_date)
+    return case(
+        (PriceHistory.scraped_at >= cutoff_date, PriceHistory.sample_count),
+        else_=PriceHistory.sample_count * func.greatest(seconds_in_window, 0) / func.nullif(run_seconds, 0)
+    )
+
+
+def _window_stats(cutoff_date: datetime, suffix: str) -> list:
+    """
+    avg/min/max/data_points over runs seen since cutoff_date, as FILTERed
+    aggregates: several windows can share one scan of the widest window.
+    """
+    weight = _samples_in_window(cutoff_date)
+    in_window = PriceHistory.last_seen_at >= cutoff_date
+    return [
+        (
+            func.sum(PriceHistory.price * weight).filter(in_window)
+            / func.nullif(func.sum(weight).filter(in_window), 0)
+        ).label(f"avg_{suffix}"),
+        func.min(PriceHistory.price).filter(in_window).label(f"min_{suffix}"),
+        func.max(PriceHistory.price).filter(in_window).label(f"max_{suffix}"),
+        func.coalesce(func.round(func.sum(weight).filter(in_window)), 0).label(f"data_points_{suffix}")
+    ]
+
+
+def _stats_from_row(row, suffix: str) -> dict:
+    avg_price = getattr(row, f"avg_{suffix}")
+    min_price = getattr(row, f"min_{suffix}")
+    max_price = getattr(row, f"max_{suffix}")
+    return {
+        "avg": float(avg_price) if avg_price else None,
+        "min": float(min_price) if min_price else None,
+        "max": float(max_price) if max_price else None,
+        "data_points": int(getattr(row, f"data_points_{suffix}"))
+    }
+
+
 async def get_price_stats(
     session: AsyncSession, 
     product_id: int,
     days: int = 30
 ) -> dict:
-    """Get price statistics for a product over N days."""
+    """Get price statistics for a product over N days (runs weighted by samples)."""
     
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
     result = await session.execute(
-        select(
-            func.avg(PriceHistory.price).label("avg_price"),
-            func.min(PriceHistory.price).label("min_price"),
-            func.max(PriceHistory.price).label("max_price"),
-            func.count(PriceHistory.id).label("data_points")
-        )
+        select(*_window_stats(cutoff_date, str(days)))
         .where(PriceHistory.product_id == product_id)
-        .where(PriceHistory.scraped_at >= cutoff_date)
+        .where(PriceHistory.last_seen_at >= cutoff_date)
     )
     
-    row = result.one()
-    
-    return {
-        "avg": float(row.avg_price) if row.avg_price else None,
-        "min": float(row.min_price) if row.min_price else None,
-        "max": float(row.max_price) if row.max_price else None,
-        "data_points": row.data_points
-    }
+    return _stats_from_row(result.one(), str(days))
+
+
+# Windows analyze_price reports; the widest one bounds the history scan
+ANALYSIS_WINDOWS = (7, 30, 90)
 
 
 async def analyze_price(
@@ -94,23 +132,40 @@ async def analyze_price(
     - Fake sale detection
     - Real discount percentage
     - Buy recommendation
+    
+    The product row and every window's stats come back in one round trip:
+    price history is scanned once for the widest window and each narrower
+    window is a FILTERed aggregate over the same rows.
     """
     
-    # Get product
+    now = datetime.utcnow()
+    cutoffs = {days: now - timedelta(days=days) for days in ANALYSIS_WINDOWS}
+    
     result = await session.execute(
-        select(Product).where(Product.id == product_id)
+        select(
+            Product.name,
+            Product.current_price,
+            *[column for days, cutoff in cutoffs.items() for column in _window_stats(cutoff, str(days))]
+        )
+        .select_from(Product)
+        .outerjoin(
+            PriceHistory,
+            (PriceHistory.product_id == Product.id)
+            & (PriceHistory.last_seen_at >= cutoffs[max(ANALYSIS_WINDOWS)])
+        )
+        .where(Product.id == product_id)
+        .group_by(Product.id)
     )
-    product = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not product:
+    if not row:
         raise ValueError(f"Product {product_id} not found")
     
-    current_price = product.current_price
+    current_price = row.current_price
     
-    # Get stats for different time periods
-    stats_7 = await get_price_stats(session, product_id, days=7)
-    stats_30 = await get_price_stats(session, product_id, days=30)
-    stats_90 = await get_price_stats(session, product_id, days=90)
+    stats_7 = _stats_from_row(row, "7")
+    stats_30 = _stats_from_row(row, "30")
+    stats_90 = _stats_from_row(row, "90")
     
     # Calculate fake sale detection
     is_fake_sale = False
@@ -174,7 +229,7 @@ async def analyze_price(
     
     return PriceAnalysis(
         product_id=product_id,
-        product_name=product.name,
+        product_name=row.name,
         current_price=current_price,
         avg_7_day=stats_7["avg"],
         avg_30_day=stats_30["avg"],
@@ -201,21 +256,22 @@ async def get_price_trend(
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
     result = await session.execute(
-        select(PriceHistory.scraped_at, PriceHistory.price)
+        select(PriceHistory.scraped_at, PriceHistory.last_seen_at, PriceHistory.price)
         .where(PriceHistory.product_id == product_id)
-        .where(PriceHistory.scraped_at >= cutoff_date)
+        .where(PriceHistory.last_seen_at >= cutoff_date)
         .order_by(PriceHistory.scraped_at.asc())
     )
     
     history = result.all()
     
-    return [
-        {
-            "date": row.scraped_at.isoformat(),
-            "price": row.price
-        }
-        for row in history
-    ]
+    # Expand each run into its first and last observation inside the window
+    points = []
+    for row in history:
+        start = max(row.scraped_at, cutoff_date)
+        points.append({"date": start.isoformat(), "price": row.price})
+        if row.last_seen_at > start:
+            points.append({"date": row.last_seen_at.isoformat(), "price": row.price})
+    return points
 
 
 def calculate_savings(
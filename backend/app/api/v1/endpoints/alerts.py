@@ -4,8 +4,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.api.deps import get_db
+from app.services.alert_index import alert_index
+from app.services.alert_rules import STATS_RULES, default_window_days, validate_rule
 from app.models.product import (
-    Product, Alert, AlertCreate, AlertRead
+    Product, Alert, AlertCreate, AlertRead, AlertRule
 )
 
 router = APIRouter()
@@ -17,9 +19,17 @@ async def create_alert(
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Create a price alert for a product.
-    - User will be notified when price drops to or below target price.
+    Create an alert for a product. Rules:
+    - target_price: price drops to or below target_price
+    - percent_below_average: price is rule_percent% below its rule_window_days average
+    - new_low: price is below every price seen in the last rule_window_days
+    - back_in_stock: product becomes available again
     """
+    rule_type = alert_in.rule_type.value
+    error = validate_rule(rule_type, alert_in.target_price, alert_in.rule_percent, alert_in.rule_window_days)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    
     # Verify product exists
     result = await db.execute(
         select(Product).where(Product.id == alert_in.product_id)
@@ -32,7 +42,13 @@ async def create_alert(
     # Create alert
     new_alert = Alert(
         product_id=alert_in.product_id,
-        target_price=alert_in.target_price,
+        rule_type=rule_type,
+        target_price=alert_in.target_price if rule_type == AlertRule.TARGET_PRICE.value else None,
+        rule_percent=alert_in.rule_percent if rule_type == AlertRule.PERCENT_BELOW_AVERAGE.value else None,
+        rule_window_days=(
+            alert_in.rule_window_days or default_window_days(rule_type)
+            if rule_type in STATS_RULES else None
+        ),
         contact_method=alert_in.contact_method,
         contact_value=alert_in.contact_value,
         is_active=True
@@ -42,6 +58,9 @@ async def create_alert(
     await db.commit()
     await db.refresh(new_alert)
     
+    # Let scrapes of this product know an alert could now fire
+    await alert_index.add(new_alert.id, new_alert.product_id, new_alert.rule_type, new_alert.target_price)
+    
     return new_alert
 
 
@@ -78,6 +97,8 @@ async def delete_alert(
     alert.is_active = False
     await db.commit()
     
+    await alert_index.remove([(alert.id, alert.product_id)])
+    
     return {"message": "Alert deactivated successfully"}
 
 
@@ -0,0 +1,45 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.api.deps import get_db
+from app.models.product import NotificationOutbox, NotificationOutboxRead, OutboxStatus
+from app.services.outbox import outbox_stats
+
+router = APIRouter()
+
+
+@router.get("/outbox", response_model=List[NotificationOutboxRead])
+async def list_outbox(
+    status: Optional[OutboxStatus] = None,
+    alert_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = Query(default=50, le=500),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Notification delivery records, newest first.
+    - Filter by `status` (pending, sending, sent, failed) or `alert_id`
+    """
+    query = select(NotificationOutbox)
+    if status is not None:
+        query = query.where(NotificationOutbox.status == status.value)
+    if alert_id is not None:
+        query = query.where(NotificationOutbox.alert_id == alert_id)
+    result = await db.execute(
+        query.order_by(NotificationOutbox.created_at.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
+
+
+@router.get("/outbox/stats")
+async def get_outbox_stats(
+    window_hours: int = Query(default=24, ge=1, le=24 * 30),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delivery health: rows per status, trigger-to-delivery latency
+    percentiles, average attempts and the age of the oldest undelivered row.
+    """
+    return await outbox_stats(db, window_hours)
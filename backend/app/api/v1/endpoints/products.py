@@ -1,117 +1,172 @@
 from typing import List, Optional
-import traceback
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from uuid import uuid4
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from sqlalchemy.orm import selectinload
 from datetime import datetime
 
 from app.api.deps import get_db
+from app.db.session import async_session_factory
+from app.core.config import settings
 from app.models.product import (
     Product, ProductCreate, ProductRead, ProductWithHistory,
     PriceHistory, PriceHistoryRead,
-    Alert, AlertCreate, AlertRead,
-    Platform
+    Alert, AlertCreate, AlertRead
 )
-from app.scraper.factory import ScraperFactory
-from app.scraper.utils import get_stealth_context, apply_stealth, simulate_human_behavior
+from app.services.track_jobs import track_jobs, STAGE_SAVED
+from app.scraper.canonical import canonicalize
+from app.services.bulk_import import read_lines, LineParser, import_batch, STATUS_INVALID
+from app.worker.dedup import try_lease, fresh_results
+from app.services.alert_index import alert_index
 
 ERROR_PRODUCT_NOT_FOUND = "Product not found"
 
 
 router = APIRouter()
 
-def detect_platform(url: str) -> Platform:
-    """Detect e-commerce platform from URL."""
-    url_lower = url.lower()
-    if "amazon" in url_lower:
-        return Platform.AMAZON
-    elif "flipkart" in url_lower:
-        return Platform.FLIPKART
-    elif "myntra" in url_lower:
-        return Platform.MYNTRA
-    return Platform.UNKNOWN
+def _job_response(job: dict) -> dict:
+    return {
+        **job,
+        "status_url": f"{settings.API_V1_STR}/products/track/{job['job_id']}",
+        "events_url": f"{settings.API_V1_STR}/products/track/{job['job_id']}/events"
+    }
 
 
-@router.post("/track", response_model=ProductRead)
+@router.post("/track", status_code=202)
 async def track_product(
     product_in: ProductCreate,
-    background_tasks: BackgroundTasks,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Start tracking a new product.
-    - Checks if product already exists by URL
-    - If new, scrapes current price and saves to database
-    - Returns product data
+    - Returns at once with a job id; the first scrape runs on the worker's
+      interactive queue
+    - Follow progress (queued, navigating, extracted, saved / failed) via
+      GET /products/track/{job_id} or the SSE stream at .../events
+    - Links are matched by product, not by string: tracking parameters, ref
+      tags and mobile hosts of an already-tracked product return a finished
+      job for it, and a submission racing an in-flight one joins its job
     """
+    canonical = canonicalize(product_in.url)
+    
     # Check if product already exists
     result = await db.execute(
-        select(Product).where(Product.url == product_in.url)
+        select(Product.id).where(Product.product_key == canonical.key)
     )
-    existing_product = result.scalar_one_or_none()
+    existing_id = result.scalar_one_or_none()
     
-    if existing_product:
-        return existing_product
-    
-    # Scrape product data
-    try:
-        from playwright.async_api import async_playwright
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-gpu"
-                ]
-            )
-            context = await get_stealth_context(browser)
-            page = await context.new_page()
-            await apply_stealth(page)
-            
-            await page.goto(product_in.url, wait_until="domcontentloaded", timeout=60000)
-            await simulate_human_behavior(page)
-            
-            scraper = ScraperFactory.get_scraper(product_in.url)
-            scraped_data = await scraper.scrape(page, product_in.url)
-            
-            await context.close()
-            await browser.close()
-        
-        # Create product in database
-        platform = detect_platform(product_in.url)
-        new_product = Product(
-            url=product_in.url,
-            name=scraped_data.title,
-            current_price=scraped_data.price,
-            currency=scraped_data.currency,
-            platform=platform,
-            is_available=scraped_data.availability,
-            image_url=scraped_data.image_url
+    if existing_id is not None:
+        job = await track_jobs.create(
+            canonical.url, stage=STAGE_SAVED, product_id=existing_id, product_key=canonical.key
         )
+        response.status_code = 200
+        return _job_response(job)
+    
+    # Join a job already scraping this product
+    job_id = str(uuid4())
+    owner = await track_jobs.claim(canonical.key, job_id)
+    if owner != job_id:
+        job = await track_jobs.get(owner)
+        if job is not None:
+            return _job_response(job)
+    
+    # Queue the first scrape
+    from app.worker.tasks import track_product as track_product_task
+    job = await track_jobs.create(canonical.url, job_id=job_id, product_key=canonical.key)
+    track_product_task.apply_async(args=[job_id, canonical.url, canonical.key], task_id=job_id)
+    
+    return _job_response(job)
+
+
+@router.post("/import")
+async def import_products(request: Request):
+    """
+    Track many URLs at once from a streamed CSV or NDJSON body
+    (Content-Type: text/csv or application/x-ndjson).
+    - Lines are deduped against tracked products (by canonical product, not
+      by string) and inserted as placeholders, IMPORT_BATCH_ROWS at a time
+    - First scrapes go through the scheduler at its normal, rate-limited
+      pace; nothing is scraped inside this request
+    - Streams back one NDJSON result per line (created / exists / duplicate /
+      invalid) as batches are written, then a summary line
+    """
+    ndjson = "json" in request.headers.get("content-type", "")
+    
+    async def results_stream():
+        parser = LineParser(ndjson=ndjson)
+        counts = {}
+        seen = set()
+        batch = []
         
-        db.add(new_product)
-        await db.commit()
-        await db.refresh(new_product)
+        async def flush():
+            async with async_session_factory() as session:
+                results = await import_batch(session, batch, datetime.utcnow(), seen)
+                await session.commit()
+            batch.clear()
+            return results
         
-        # Add first price history entry
-        price_entry = PriceHistory(
-            product_id=new_product.id,
-            price=scraped_data.price,
-            currency=scraped_data.currency
-        )
-        db.add(price_entry)
-        await db.commit()
+        async for line_number, line in read_lines(request.stream()):
+            url, error = parser.parse(line_number, line)
+            if error:
+                counts[STATUS_INVALID] = counts.get(STATUS_INVALID, 0) + 1
+                yield json.dumps({"line": line_number, "status": STATUS_INVALID, "error": error}) + "\n"
+            elif url:
+                batch.append((line_number, url))
+            
+            if len(batch) >= settings.IMPORT_BATCH_ROWS:
+                for result in await flush():
+                    counts[result["status"]] = counts.get(result["status"], 0) + 1
+                    yield json.dumps(result) + "\n"
         
-        return new_product
+        if batch:
+            for result in await flush():
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+                yield json.dumps(result) + "\n"
         
-    except Exception as e:
-        traceback.print_exc()
-        print(f"!!! SCRAPING ERROR: {repr(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to scrape product: {type(e).__name__} - {str(e)}")
+        print(f"[Import] {sum(counts.values())} lines: {counts}")
+        yield json.dumps({"summary": counts}) + "\n"
+    
+    return StreamingResponse(
+        results_stream(),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/track/{job_id}")
+async def get_track_job(job_id: str):
+    """Current state of a track job (kept for TRACK_JOB_TTL_SECONDS)."""
+    job = await track_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Track job not found")
+    return _job_response(job)
+
+
+@router.get("/track/{job_id}/events")
+async def stream_track_job(job_id: str):
+    """
+    Server-sent events for a track job: one `event: <stage>` per update,
+    ending after `saved` or `failed`.
+    """
+    if not await track_jobs.get(job_id):
+        raise HTTPException(status_code=404, detail="Track job not found")
+    
+    async def event_stream():
+        async for job in track_jobs.events(job_id):
+            if job is None:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {job['stage']}\ndata: {json.dumps(job)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/{product_id}", response_model=ProductRead)
@@ -137,7 +192,10 @@ async def get_price_history(
     limit: int = 100,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get price history for a product (for charts)."""
+    """
+    Get price history for a product (for charts).
+    Each entry is a run of identical prices, from scraped_at to last_seen_at.
+    """
     # First check if product exists
     product_result = await db.execute(
         select(Product).where(Product.id == product_id)
@@ -192,9 +250,29 @@ async def refresh_product_price(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    # Skip the scrape entirely if we have a result from seconds ago
+    fresh = (await fresh_results([product_id])).get(product_id)
+    if fresh:
+        return {
+            "message": "Price is already fresh",
+            "product_id": product_id,
+            "result": fresh
+        }
+    
+    # Take the in-flight lease on the task's behalf; if someone else holds it,
+    # attach to their scrape instead of queueing another one
+    task_id = str(uuid4())
+    holder = await try_lease(product_id, task_id)
+    if holder is not None:
+        return {
+            "message": "Price refresh already in progress",
+            "product_id": product_id,
+            "task_id": holder
+        }
+    
     # Queue the scrape task
     from app.worker.tasks import scrape_product
-    task = scrape_product.delay(product_id, product.url)
+    task = scrape_product.apply_async(args=[product_id, product.url], task_id=task_id)
     
     return {
         "message": "Price refresh queued",
@@ -242,4 +320,6 @@ async def delete_product(
     await db.delete(product)
     await db.commit()
     
+    await alert_index.remove_product(product_id)
+    
     return {"message": "Product deleted successfully", "product_id": product_id}
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException
+
+from app.db.redis import get_redis
+from app.scraper.factory import ScraperFactory
+from app.scraper.selector_stats import selector_stats
+from app.worker.queue_metrics import get_queue_stats
+
+router = APIRouter()
+
+
+@router.get("/selectors")
+async def get_selector_stats():
+    """
+    Selector hit/miss statistics per platform and field.
+    - Candidates are listed in the order scrapers currently try them
+    - `dead` marks selectors that haven't matched in SELECTOR_DEAD_AFTER_DAYS
+    """
+    try:
+        return {
+            scraper.PLATFORM: await selector_stats.report(scraper.PLATFORM, scraper.SELECTORS)
+            for scraper in ScraperFactory.all_scrapers()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Selector stats unavailable: {e}")
+
+
+@router.get("/queues")
+async def get_scrape_queue_stats():
+    """
+    Depth and recent wait-time percentiles for each Celery queue
+    (interactive refreshes, scheduler ticks, notifications, alert-near products,
+    routine sweep).
+    """
+    try:
+        return await get_queue_stats(get_redis())
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Queue stats unavailable: {e}")
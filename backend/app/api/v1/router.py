@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import products, alerts, analytics
+from app.api.v1.endpoints import products, alerts, analytics, scrapers, notifications
 
 api_router = APIRouter()
 
@@ -20,3 +20,15 @@ api_router.include_router(
     prefix="/analytics",
     tags=["analytics"]
 )
+
+api_router.include_router(
+    scrapers.router,
+    prefix="/scrapers",
+    tags=["scrapers"]
+)
+
+api_router.include_router(
+    notifications.router,
+    prefix="/notifications",
+    tags=["notifications"]
+)
@@ -1,6 +1,6 @@
 from typing import List
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Optional, Dict
 from pydantic import AnyHttpUrl, validator
 
 class Settings(BaseSettings):
@@ -26,9 +26,128 @@ class Settings(BaseSettings):
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0"
 
+    # Browser Pool Configuration (per Celery worker process)
+    BROWSER_MAX_PAGES: int = 200  # Recycle browser after this many pages
+    BROWSER_MAX_RSS_MB: int = 1500  # Recycle browser once its process tree exceeds this
+    BROWSER_RSS_CHECK_SECONDS: int = 30  # How often to measure that (walks /proc)
+
+    # Batch Scraping Configuration
+    SCRAPE_BATCH_SIZE: int = 50  # Products per scrape_batch task
+    SCRAPE_CONCURRENCY_PER_PLATFORM: int = 4  # Pages in flight per platform per batch
+
+    # Scrape Rate Limits (token bucket per platform, shared across workers)
+    SCRAPE_RATE_LIMITS: Dict[str, float] = {  # Requests per second
+        "amazon": 0.5,
+        "flipkart": 0.5,
+        "myntra": 0.5,
+        "unknown": 0.2,
+    }
+    SCRAPE_BURST_SIZES: Dict[str, int] = {  # Max requests allowed back-to-back
+        "amazon": 5,
+        "flipkart": 5,
+        "myntra": 5,
+        "unknown": 2,
+    }
+
+    # HTTP Fast Path (structured-data extraction before launching a browser)
+    FAST_PATH_ENABLED: bool = True
+    FAST_PATH_TIMEOUT: float = 10.0  # Seconds
+
+    # Resource Blocking (page routing applied to every scrape context)
+    BLOCK_RESOURCES: bool = True
+    BLOCKED_RESOURCE_TYPES: List[str] = ["image", "media", "font"]
+    RESOURCE_ALLOW_PATTERNS: Dict[str, List[str]] = {  # Never blocked, per platform
+        "amazon": [],
+        "flipkart": [],
+        "myntra": ["myntassets.com/assets/js"],  # PDP price is rendered client-side
+    }
+    RESOURCE_DENY_PATTERNS: Dict[str, List[str]] = {  # Blocked in addition to trackers
+        "amazon": ["fls-", "unagi.amazon", "aax-"],  # Logging/ad beacons
+        "flipkart": [],
+        "myntra": [],
+    }
+
+    # Selector Statistics (self-ordering selector candidates)
+    SELECTOR_STATS_ENABLED: bool = True
+    SELECTOR_STATS_WINDOW_DAYS: int = 7  # Success rate is computed over this window
+    SELECTOR_DEAD_AFTER_DAYS: int = 14  # Flag selectors with no hit for this long
+    SELECTOR_ORDER_CACHE_SECONDS: int = 60
+
+    # Price History Storage
+    # "every_scrape": store a row for every scrape
+    # "runs": store a row only when price/currency/availability changes. Opt-in,
+    # as it approximates: a run straddling a window cutoff is prorated assuming
+    # evenly spaced scrapes (averages and data_points can shift slightly), and
+    # the trend/history endpoints return one point per run. Switch together
+    # with compact_price_history so old rows are stored the same way.
+    PRICE_HISTORY_MODE: str = "every_scrape"
+
+    # Adaptive Scrape Scheduling
+    SCRAPE_INTERVAL_MIN_MINUTES: float = 5  # Floor, used for products near an alert target
+    SCRAPE_INTERVAL_BASE_MINUTES: float = 60  # Interval for a product whose price never moves
+    SCRAPE_INTERVAL_MAX_MINUTES: float = 720
+    SCRAPE_VOLATILITY_WINDOW_DAYS: int = 14
+    SCRAPE_ALERT_NEAR_PERCENT: float = 5.0  # Within this % of a target -> minimum interval
+    SCHEDULER_TICK_SECONDS: int = 5  # How often the time wheel releases due products
+    SCHEDULER_WHEEL_SECONDS: int = 300  # Products get a stable slot within this period
+    SCHEDULER_MAX_PER_TICK: int = 25  # Upper bound on products released per tick
+    SCRAPE_CLAIM_MINUTES: int = 20  # Dispatched products aren't re-dispatched for this long
+
+    # Worker DB Pool (one per worker process, on its persistent event loop)
+    WORKER_DB_POOL_SIZE: int = 5
+    WORKER_DB_MAX_OVERFLOW: int = 5
+    WORKER_DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
+
+    # Bulk Ingestion of Scrape Results (per worker process, within a scrape batch:
+    # results land a few per second, so the wait sets the typical batch size)
+    INGEST_BATCH_ROWS: int = 50  # Write as soon as this many results are buffered (one SCRAPE_BATCH_SIZE)
+    INGEST_FLUSH_SECONDS: float = 2.0  # ...or this long after the first one arrived
+
+    # Alert Index (Redis sorted sets of alert targets per product)
+    ALERT_INDEX_ENABLED: bool = True
+    ALERT_INDEX_REBUILD_MINUTES: int = 60
+
+    # Notification Outbox
+    OUTBOX_DRAIN_SECONDS: int = 5  # Beat interval for the drainer
+    OUTBOX_BATCH_SIZE: int = 100  # Rows claimed per drain (coalesced per chat)
+    OUTBOX_SEND_LEASE_SECONDS: int = 120  # Claimed rows become due again after this
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_BASE_SECONDS: int = 30  # Doubles per failed attempt
+    OUTBOX_BACKOFF_MAX_SECONDS: int = 3600
+
+    # Track Jobs (async first scrape of a new URL)
+    TRACK_JOB_TTL_SECONDS: int = 3600
+    TRACK_EVENTS_KEEPALIVE_SECONDS: int = 15
+
+    # Alert Rules (default windows when an alert doesn't set rule_window_days)
+    ALERT_AVERAGE_WINDOW_DAYS: int = 30
+    ALERT_LOW_WINDOW_DAYS: int = 90
+
+    # In-flight Scrape Deduplication
+    SCRAPE_LEASE_SECONDS: int = 600  # Max time one scrape (incl. queue wait) holds a product
+    SCRAPE_FRESHNESS_SECONDS: int = 60  # Skip scrapes of products scraped this recently
+
+    # Canonical Product Links
+    SCRAPE_CACHE_SECONDS: int = 120  # Reuse a scrape of the same product key this recent (0 = off)
+    TRACK_KEY_CLAIM_SECONDS: int = 300  # Concurrent submissions of one product share a track job
+
+    # Bulk Import (POST /products/import)
+    IMPORT_BATCH_ROWS: int = 500  # Lines deduped and inserted per round trip
+
+    # Full Sweep (check_all_prices, keyset-paged and partitioned by id)
+    SWEEP_PARTITIONS: int = 4  # A full sweep fans out into this many partition tasks
+    SWEEP_PAGE_SIZE: int = 1000  # Product ids read per page
+    SWEEP_BEAT_MINUTES: int = 0  # Also sweep every partition on this schedule (0 = manual only)
+
     # Telegram Configuration
     TELEGRAM_BOT_TOKEN: Optional[str] = None
     TELEGRAM_CHAT_ID: Optional[str] = None
+    TELEGRAM_API_BASE: str = "https://api.telegram.org"  # Point at a stand-in server for tests
+    TELEGRAM_GLOBAL_RATE: float = 25.0  # Messages/second for the whole bot (Telegram allows ~30)
+    TELEGRAM_CHAT_INTERVAL: float = 1.0  # Seconds between messages to the same chat
+    TELEGRAM_MAX_CONCURRENCY: int = 10  # Pooled connections to the Bot API
+    TELEGRAM_MAX_RETRIES: int = 3
+    TELEGRAM_TIMEOUT: float = 10.0
 
     # App Configuration:
     class Config:
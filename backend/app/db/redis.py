@@ -0,0 +1,18 @@
+import asyncio
+import weakref
+from redis import asyncio as aioredis
+from app.core.config import settings
+
+# redis.asyncio connections are bound to the loop they were opened on, and the
+# API, Celery tasks and the browser pool each run their own loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> aioredis.Redis:
+    """Get the Redis client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        _clients[loop] = client
+    return client
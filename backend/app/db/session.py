@@ -33,7 +33,7 @@ async def init_db():
     """Initialize database tables."""
     async with async_engine.begin() as conn:
         # Import all models to register them
-        from app.models.product import Product, PriceHistory, Alert
+        from app.models.product import Product, PriceHistory, Alert, NotificationOutbox
         await conn.run_sync(SQLModel.metadata.create_all)
 
 async def close_db():
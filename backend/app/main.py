@@ -10,7 +10,8 @@ if sys.platform == "win32":
 
 from app.core.config import settings
 from app.api.v1.router import api_router
-from app.db.session import init_db, close_db
+from app.db.session import init_db, close_db, async_session_factory
+from app.services.alert_index import alert_index
 
 
 @asynccontextmanager
@@ -20,6 +21,13 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting Price-Drop Sniper API...")
     await init_db()
     print("✅ Database initialized")
+    try:
+        async with async_session_factory() as session:
+            indexed = await alert_index.rebuild(session)
+        print(f"✅ Alert index loaded ({indexed} alerts)")
+    except Exception as e:
+        # Scrapes fall back to checking alerts in Postgres until the next rebuild
+        print(f"⚠️ Alert index not loaded: {e}")
     
     yield
     
@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
+from sqlalchemy import Column, JSON
 from sqlmodel import SQLModel, Field, Relationship
 from enum import Enum
 
@@ -27,6 +28,14 @@ class Product(ProductBase, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
+    # Adaptive scheduling: each product has its own next scrape time
+    last_scraped_at: Optional[datetime] = None
+    next_scrape_at: Optional[datetime] = Field(default=None, index=True)
+    
+    # Platform identity of the URL (see app.scraper.canonical), shared by
+    # every link to the same product
+    product_key: Optional[str] = Field(default=None, index=True, unique=True)
+    
     # Relationships
     price_history: List["PriceHistory"] = Relationship(back_populates="product")
     alerts: List["Alert"] = Relationship(back_populates="product")
@@ -41,6 +50,9 @@ class ProductRead(ProductBase):
     created_at: datetime
     updated_at: datetime
     image_url: Optional[str] = None
+    last_scraped_at: Optional[datetime] = None
+    next_scrape_at: Optional[datetime] = None
+    product_key: Optional[str] = None
 
 class ProductWithHistory(ProductRead):
     """Product with price history included."""
@@ -54,12 +66,21 @@ class PriceHistoryBase(SQLModel):
     currency: str = "INR"
 
 class PriceHistory(PriceHistoryBase, table=True):
-    """Price history table - stores historical prices for time-series analysis."""
+    """
+    Price history table - stores historical prices for time-series analysis.
+    
+    Each row is a run of identical observations (price, currency, availability):
+    scraped_at is when the run was first seen, last_seen_at the latest scrape
+    that still matched, and sample_count how many scrapes it stands for.
+    """
     __tablename__ = "price_history"
     
     id: Optional[int] = Field(default=None, primary_key=True)
     product_id: int = Field(foreign_key="products.id", index=True)
     scraped_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    last_seen_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    sample_count: int = 1
+    is_available: bool = True
     
     # Relationship
     product: Optional[Product] = Relationship(back_populates="price_history")
@@ -68,12 +89,25 @@ class PriceHistoryRead(PriceHistoryBase):
     """Schema for reading price history."""
     id: int
     scraped_at: datetime
+    last_seen_at: Optional[datetime] = None
+    sample_count: int = 1
+    is_available: bool = True
 
 
 # --- Alert Models ---
+class AlertRule(str, Enum):
+    """What makes an alert fire (see app/services/alert_rules.py)."""
+    TARGET_PRICE = "target_price"  # price <= target_price
+    PERCENT_BELOW_AVERAGE = "percent_below_average"  # price rule_percent% below the window average
+    NEW_LOW = "new_low"  # price below every price seen in the window
+    BACK_IN_STOCK = "back_in_stock"  # unavailable -> available
+
 class AlertBase(SQLModel):
     """Base alert fields."""
-    target_price: float
+    rule_type: str = AlertRule.TARGET_PRICE.value
+    target_price: Optional[float] = None  # TARGET_PRICE only
+    rule_percent: Optional[float] = None  # PERCENT_BELOW_AVERAGE only
+    rule_window_days: Optional[int] = None  # PERCENT_BELOW_AVERAGE / NEW_LOW
     contact_method: str = "telegram"  # telegram, sms, email
     contact_value: str  # telegram chat_id, phone number, or email
     is_active: bool = True
@@ -93,7 +127,10 @@ class Alert(AlertBase, table=True):
 class AlertCreate(SQLModel):
     """Schema for creating an alert."""
     product_id: int
-    target_price: float
+    rule_type: AlertRule = AlertRule.TARGET_PRICE
+    target_price: Optional[float] = None
+    rule_percent: Optional[float] = None
+    rule_window_days: Optional[int] = None
     contact_method: str = "telegram"
     contact_value: str
 
@@ -105,5 +142,48 @@ class AlertRead(AlertBase):
     triggered_at: Optional[datetime]
 
 
+# --- Notification Outbox ---
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENDING = "sending"  # Claimed by a drainer; reclaimed if its lease runs out
+    SENT = "sent"
+    FAILED = "failed"  # Gave up after OUTBOX_MAX_ATTEMPTS or a permanent error
+
+class NotificationOutbox(SQLModel, table=True):
+    """
+    Notifications waiting for delivery. Rows are written in the same
+    transaction that triggers the alert and drained by the worker, so a
+    triggered alert can't be lost between the commit and the send.
+    """
+    __tablename__ = "notification_outbox"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    dedup_key: str = Field(index=True, unique=True)
+    alert_id: Optional[int] = Field(default=None, index=True)
+    contact_method: str
+    contact_value: str
+    payload: dict = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    status: str = Field(default=OutboxStatus.PENDING.value, index=True)
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: Optional[datetime] = None
+
+class NotificationOutboxRead(SQLModel):
+    """Schema for reading outbox rows."""
+    id: int
+    dedup_key: str
+    alert_id: Optional[int]
+    contact_method: str
+    contact_value: str
+    status: str
+    attempts: int
+    next_attempt_at: datetime
+    last_error: Optional[str]
+    created_at: datetime
+    sent_at: Optional[datetime]
+
+
 # Update forward references
 ProductWithHistory.model_rebuild()
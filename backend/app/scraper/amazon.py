@@ -1,69 +1,105 @@
+import re
+from typing import Optional
 from playwright.async_api import Page
 from .base import BaseScraper, ScrapedProduct
+from .selectors import FieldSpec
+from .structured import parse_structured_data, find_json_ld_product, parse_price
 import logging
 
+# The buy-box availability block; the rest of the page (carousels, reviews,
+# inline scripts) mentions "unavailable" about other products
+AVAILABILITY_BLOCK = re.compile(r'id="availability"[^>]*>(.*?)</div>', re.S | re.I)
+
+# The first offer in the buy-box JSON; other "priceAmount"s on the page belong
+# to carousels, bundles and other sellers
+BUYBOX_PRICE = re.compile(r'"desktop_buybox_group_1"\s*:\s*\[\s*\{[^{}]*?"priceAmount"\s*:\s*([\d.]+)')
+PRICE_AMOUNT = re.compile(r'"priceAmount"\s*:\s*([\d.]+)')
+
+
+def buybox_price(html: str) -> Optional[float]:
+    """
+    The buy-box price from the embedded JSON. Without a buy-box group, a
+    priceAmount is only trusted if every one on the page agrees.
+    """
+    match = BUYBOX_PRICE.search(html)
+    if match:
+        return parse_price(match.group(1))
+    prices = {parse_price(amount) for amount in PRICE_AMOUNT.findall(html)}
+    return prices.pop() if len(prices) == 1 else None
+
+
 class AmazonScraper(BaseScraper):
+    PLATFORM = "amazon"
+    BLOCK_MARKERS = [
+        "/errors/validateCaptcha",
+        "Type the characters you see in this image",
+        "api-services-support@amazon.com"
+    ]
+
+    WAIT_FOR = "#productTitle"
+    SELECTORS = {
+        "title": FieldSpec(["#productTitle"], fallbacks=["h1"]),
+        # Price handling is tricky on Amazon (Deal price, regular price, etc.)
+        "price": FieldSpec(
+            [
+                "#corePriceDisplay_desktop_feature_div .a-price-whole",
+                "#priceblock_ourprice",
+                "#priceblock_dealprice"
+            ],
+            clean="price",
+            require=r"\d",
+            # First price anywhere on the page: may be a strike-through MRP or another offer
+            fallbacks=[".a-price-whole", ".a-offscreen"]
+        ),
+        "availability": FieldSpec(["#availability"]),
+        "image": FieldSpec(["#landingImage", "#imgBlkFront"], attr="src", require="^http"),
+    }
+
     def verify_url(self, url: str) -> bool:
         return "amazon" in url
 
+    def extract_fast(self, html: str, url: str) -> Optional[ScrapedProduct]:
+        data = parse_structured_data(html)
+        product = find_json_ld_product(data.json_ld)
+        if product and product["title"] and product["price"]:
+            return ScrapedProduct(url=url, source="http", **product)
+
+        # No JSON-LD: fall back to og:title plus the price embedded in the buy-box JSON
+        title = data.meta.get("og:title") or data.meta.get("title") or ""
+        price = buybox_price(html)
+        if not title or not price:
+            return None
+
+        block = AVAILABILITY_BLOCK.search(html)
+        availability_text = block.group(1).lower() if block else ""
+        in_stock = "out of stock" not in availability_text and "currently unavailable" not in availability_text
+        return ScrapedProduct(
+            title=title.strip(),
+            price=price,
+            currency="INR",
+            url=url,
+            availability=in_stock,
+            image_url=data.meta.get("og:image"),
+            source="http"
+        )
+
     async def scrape(self, page: Page, url: str) -> ScrapedProduct:
         logging.info(f"Scraping Amazon URL: {url}")
-        # Add random delay/mouse movement simulation here in future if needed
-        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        # Navigation happens once in ScrapePipeline; the page is already loaded
         
         try:
-            # Try multiple selectors for title
-            title = "Unknown Product"
-            try:
-                title_el = await page.wait_for_selector("#productTitle", timeout=15000)
-                if title_el:
-                    title = await title_el.inner_text()
-                    title = title.strip()
-            except:
-                logging.warning("Main title selector failed, trying backup")
-                # Backup selector
-                title_el = await page.query_selector("h1")
-                if title_el:
-                     title = await title_el.inner_text()
-
-            # Price handling is tricky on Amazon (Deal price, regular price, etc.)
-            # We try a few common selectors
-            price_text = ""
-            price_selectors = [
-                ".a-price-whole", 
-                "#priceblock_ourprice", 
-                "#priceblock_dealprice", 
-                ".a-offscreen",
-                "#corePriceDisplay_desktop_feature_div .a-price-whole"
-            ]
-            
-            for selector in price_selectors:
-                try:
-                    el = await page.query_selector(selector)
-                    if el:
-                        text = await el.inner_text()
-                        # prioritizing visible prices
-                        if text and any(char.isdigit() for char in text):
-                            price_text = text
-                            break
-                except:
-                    continue
-            
-            # Clean price text (remove currency symbols, commas)
-            cleaned_price = "".join([c for c in price_text if c.isdigit() or c == '.'])
-            price = float(cleaned_price) if cleaned_price else 0.0
+            fields = await self.extract_fields(page)
             
-            # Availability
-            availability_el = await page.query_selector("#availability")
-            availability_text = await availability_el.inner_text() if availability_el else ""
-            in_stock = "out of stock" not in availability_text.lower() and "currently unavailable" not in availability_text.lower()
+            availability_text = (fields["availability"].value or "").lower()
+            in_stock = "out of stock" not in availability_text and "currently unavailable" not in availability_text
 
             return ScrapedProduct(
-                title=title,
-                price=price,
+                title=fields["title"].value or "Unknown Product",
+                price=fields["price"].value or 0.0,
                 currency="INR", # Defaulting to INR for now, could be extracted
                 url=url,
-                availability=in_stock
+                availability=in_stock,
+                image_url=fields["image"].value
             )
 
         except Exception as e:
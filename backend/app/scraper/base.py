@@ -1,7 +1,11 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, List, Dict
 from pydantic import BaseModel
 from playwright.async_api import Page
+from app.core.config import settings
+from .selectors import FieldSpec, FieldResult, evaluate_spec
+from .selector_stats import selector_stats
 
 class ScrapedProduct(BaseModel):
     title: str
@@ -10,12 +14,25 @@ class ScrapedProduct(BaseModel):
     url: str
     availability: bool
     image_url: Optional[str] = None
+    source: str = "browser"  # Which path served the scrape: "http", "browser" or "cache"
 
 class BaseScraper(ABC):
+    # Text that means we got a captcha/bot wall instead of a product page
+    BLOCK_MARKERS: List[str] = ["captcha", "access denied", "are you a robot"]
+
+    # Platform key for shared per-selector statistics
+    PLATFORM: str = "unknown"
+    # Declarative extraction: field -> ordered candidate selectors + cleaning rule
+    SELECTORS: Dict[str, FieldSpec] = {}
+    # Selector to wait for before extracting (page is rendered enough)
+    WAIT_FOR: Optional[str] = None
+    WAIT_TIMEOUT: int = 15000
+
     @abstractmethod
     async def scrape(self, page: Page, url: str) -> Optional[ScrapedProduct]:
         """
-        Scrape product details from the given URL using the provided Playwright Page.
+        Extract product details from a Page that is already navigated to `url`.
+        Scrapers must not navigate themselves; ScrapePipeline does it once.
         """
         pass
 
@@ -25,3 +42,40 @@ class BaseScraper(ABC):
         Check if this scraper can handle the given URL.
         """
         pass
+
+    def extract_fast(self, html: str, url: str) -> Optional[ScrapedProduct]:
+        """
+        Optional lightweight extractor for raw HTML fetched without a browser
+        (JSON-LD, og: meta tags, embedded state JSON).
+        Return None to escalate to the Playwright `scrape` path.
+        """
+        return None
+
+    def looks_blocked(self, status_code: int, html: str) -> bool:
+        """Check whether a plain HTTP response is a bot wall rather than the page."""
+        if status_code in (403, 429, 503):
+            return True
+        head = html[:20000].lower()
+        return any(marker.lower() in head for marker in self.BLOCK_MARKERS)
+
+    async def extract_fields(self, page: Page) -> Dict[str, FieldResult]:
+        """
+        Resolve every field in SELECTORS with a single in-page evaluation,
+        trying candidates in order of their recent success rate.
+        """
+        if self.WAIT_FOR:
+            try:
+                await page.wait_for_selector(self.WAIT_FOR, timeout=self.WAIT_TIMEOUT)
+            except Exception:
+                logging.warning(f"{self.__class__.__name__}: {self.WAIT_FOR} not found, extracting anyway")
+
+        if not settings.SELECTOR_STATS_ENABLED:
+            return await evaluate_spec(page, self.SELECTORS)
+
+        spec = await selector_stats.order_spec(self.PLATFORM, self.SELECTORS)
+        results = await evaluate_spec(page, spec)
+        try:
+            await selector_stats.record(self.PLATFORM, spec, results)
+        except Exception as e:
+            logging.warning(f"[SelectorStats] Failed to record hits: {e}")
+        return results
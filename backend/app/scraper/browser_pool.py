@@ -0,0 +1,188 @@
+import os
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.core.config import settings
+from .utils import get_stealth_context
+
+BROWSER_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu"
+]
+
+
+def _process_tree_rss_mb(root_pid: int) -> float:
+    """
+    Sum the resident memory (MB) of every descendant of root_pid.
+    Reads /proc directly, so it only reports on Linux (returns 0.0 elsewhere).
+    """
+    if not os.path.isdir("/proc"):
+        return 0.0
+
+    children = {}
+    rss_kb = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/status") as f:
+                ppid, rss = None, 0
+                for line in f:
+                    if line.startswith("PPid:"):
+                        ppid = int(line.split()[1])
+                    elif line.startswith("VmRSS:"):
+                        rss = int(line.split()[1])
+        except (OSError, ValueError):
+            continue
+        pid = int(entry)
+        rss_kb[pid] = rss
+        children.setdefault(ppid, []).append(pid)
+
+    total_kb = 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        total_kb += rss_kb.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total_kb / 1024
+
+
+class BrowserPool:
+    """
+    Long-lived Chromium owned by one worker process.
+
+    Hands out fresh stealth contexts so each scrape stays isolated, while the
+    expensive browser launch is paid only once. The browser is recycled after
+    `max_pages` pages or once the browser process tree passes `max_rss_mb`
+    (sampled every BROWSER_RSS_CHECK_SECONDS: measuring walks /proc), and
+    relaunched transparently if it crashes or disconnects.
+    """
+
+    def __init__(self, max_pages: Optional[int] = None, max_rss_mb: Optional[int] = None):
+        self.max_pages = max_pages or settings.BROWSER_MAX_PAGES
+        self.max_rss_mb = max_rss_mb or settings.BROWSER_MAX_RSS_MB
+        self._playwright = None
+        self._browser = None
+        self._pages_served = 0
+        self._active_contexts = 0
+        self._rss_checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self):
+        """Start Playwright and launch the first browser."""
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        if not self.is_running:
+            await self._launch()
+
+    async def stop(self):
+        """Close the browser and shut Playwright down."""
+        await self._close_browser()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self):
+        self._browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=BROWSER_ARGS
+        )
+        self._pages_served = 0
+        self._rss_checked_at = time.monotonic()
+        logging.info(f"[BrowserPool] Launched Chromium (pid {os.getpid()})")
+
+    async def _close_browser(self):
+        browser, self._browser = self._browser, None
+        if browser is None:
+            return
+        try:
+            await browser.close()
+        except Exception as e:
+            logging.warning(f"[BrowserPool] Error closing browser: {e}")
+
+    def _needs_recycle(self) -> bool:
+        if self._pages_served >= self.max_pages:
+            logging.info(f"[BrowserPool] Recycling after {self._pages_served} pages")
+            return True
+        now = time.monotonic()
+        if now - self._rss_checked_at < settings.BROWSER_RSS_CHECK_SECONDS:
+            return False
+        self._rss_checked_at = now
+        rss = _process_tree_rss_mb(os.getpid())
+        if rss > self.max_rss_mb:
+            logging.info(f"[BrowserPool] Recycling at {rss:.0f} MB RSS")
+            return True
+        return False
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._playwright is None:
+                await self.start()
+                return
+
+            if not self.is_running:
+                # Crashed or disconnected underneath us
+                logging.warning("[BrowserPool] Browser not connected, relaunching")
+                self._browser = None
+                await self._launch()
+                return
+
+            if self._needs_recycle():
+                # Let in-flight scrapes finish on the old browser first
+                await self._idle.wait()
+                await self._close_browser()
+                await self._launch()
+
+    @asynccontextmanager
+    async def context(self, platform: Optional[str] = None):
+        """Yield a fresh stealth context on the pooled browser."""
+        await self._ensure_browser()
+
+        self._active_contexts += 1
+        self._idle.clear()
+        self._pages_served += 1
+        context = None
+        try:
+            context = await get_stealth_context(self._browser, platform)
+            yield context
+        finally:
+            try:
+                if context is not None:
+                    await context.close()
+            except Exception:
+                pass  # Browser may have died mid-scrape; next call relaunches
+            self._active_contexts -= 1
+            if self._active_contexts == 0:
+                self._idle.set()
+
+
+@asynccontextmanager
+async def standalone_context(platform: Optional[str] = None, headless: bool = True):
+    """
+    One-off browser + stealth context for callers without a pool
+    (the API process, ad-hoc scripts). Closes everything on exit.
+    """
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless, args=BROWSER_ARGS)
+        try:
+            context = await get_stealth_context(browser, platform)
+            try:
+                yield context
+            finally:
+                await context.close()
+        finally:
+            await browser.close()
@@ -0,0 +1,112 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from app.models.product import Platform
+
+# Query parameters that only track the click, never select the product
+TRACKING_PARAMS = {
+    "ref", "ref_", "tag", "psc", "smid", "th", "linkcode", "camp", "creative",
+    "creativeasin", "ascsubtag", "keywords", "qid", "sr", "sprefix", "crid",
+    "dib", "dib_tag", "content-id", "ref_src", "otracker", "otracker1", "fm",
+    "iid", "ppt", "ppn", "ssid", "lid", "marketplace", "store", "srno",
+    "spotlighttagid", "affid", "affextparam1", "affextparam2", "src",
+    "gclid", "fbclid", "_encoding", "_refid", "_appid", "cid",
+}
+TRACKING_PREFIXES = ("utm_", "pf_rd_", "pd_rd_")
+
+AMAZON_ASIN = re.compile(r"/(?:dp|gp/product|gp/aw/d|product|exec/obidos/asin|o/asin)/([a-z0-9]{10})(?:[/?]|$)", re.I)
+FLIPKART_ITEM = re.compile(r"^(.*?/p/(itm[0-9a-z]+))", re.I)
+MYNTRA_STYLE = re.compile(r"/(\d{5,})(?:/buy)?/?$")
+
+
+@dataclass(frozen=True)
+class CanonicalUrl:
+    """A stable identity for a product link, plus the clean URL to scrape."""
+    key: str
+    url: str
+
+
+def _bare_host(host: str) -> str:
+    host = host.lower().split(":")[0]
+    for prefix in ("www.", "m.", "dl.", "smile."):
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+
+def _clean_query(query: str) -> str:
+    params = [
+        (name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlencode(sorted(params))
+
+
+def _generic(parts) -> CanonicalUrl:
+    host = _bare_host(parts.netloc) + (f":{parts.port}" if parts.port else "")
+    path = parts.path.rstrip("/") or "/"
+    query = _clean_query(parts.query)
+    location = f"{host}{path}" + (f"?{query}" if query else "")
+    # The original host is kept for fetching; only the key drops www./m.
+    url = f"{parts.scheme or 'https'}://{parts.netloc.lower()}{path}" + (f"?{query}" if query else "")
+    return CanonicalUrl(key=f"url:{location}", url=url)
+
+
+def _amazon(parts) -> Optional[CanonicalUrl]:
+    match = AMAZON_ASIN.search(parts.path)
+    if not match:
+        return None
+    domain = _bare_host(parts.netloc)
+    asin = match.group(1).upper()
+    # Same ASIN on amazon.in and amazon.com are different listings
+    return CanonicalUrl(key=f"amazon:{domain}:{asin}", url=f"https://www.{domain}/dp/{asin}")
+
+
+def _flipkart(parts) -> Optional[CanonicalUrl]:
+    path = parts.path[3:] if parts.path.startswith("/dl/") else parts.path
+    match = FLIPKART_ITEM.match(path)
+    if not match:
+        return None
+    item_path, item_id = match.group(1), match.group(2).lower()
+    # pid picks the variant (size/colour) within an item
+    pid = dict(parse_qsl(parts.query)).get("pid")
+    key = f"flipkart:{item_id}" + (f":{pid.upper()}" if pid else "")
+    url = f"https://www.flipkart.com{item_path}" + (f"?pid={pid}" if pid else "")
+    return CanonicalUrl(key=key, url=url)
+
+
+def _myntra(parts) -> Optional[CanonicalUrl]:
+    match = MYNTRA_STYLE.search(parts.path)
+    if not match:
+        return None
+    return CanonicalUrl(key=f"myntra:{match.group(1)}", url=f"https://www.myntra.com{parts.path.rstrip('/')}")
+
+
+CANONICALIZERS: Dict[str, Callable] = {
+    Platform.AMAZON.value: _amazon,
+    Platform.FLIPKART.value: _flipkart,
+    Platform.MYNTRA.value: _myntra,
+}
+
+
+def _platform_of(host: str) -> str:
+    host = _bare_host(host)
+    for platform in CANONICALIZERS:
+        if host == f"{platform}.com" or host.startswith(f"{platform}."):
+            return platform
+    return Platform.UNKNOWN.value
+
+
+def canonicalize(url: str) -> CanonicalUrl:
+    """
+    Product identity for a URL. Tracking parameters, ref tags, mobile and
+    deep-link hosts all map to the same key: the ASIN for Amazon, the item
+    (and variant) id for Flipkart, the style id for Myntra. Links we can't
+    parse fall back to the URL without tracking parameters.
+    """
+    parts = urlsplit(url.strip())
+    canonicalizer = CANONICALIZERS.get(_platform_of(parts.netloc))
+    result = canonicalizer(parts) if canonicalizer else None
+    return result or _generic(parts)
@@ -1,19 +1,68 @@
-from .base import BaseScraper
+import logging
+from typing import Optional, List
+from app.core.config import settings
+from app.models.product import Platform
+from .base import BaseScraper, ScrapedProduct
 from .amazon import AmazonScraper
 from .flipkart import FlipkartScraper
 from .myntra import MyntraScraper
+from .http_client import fetch_html
+
+def detect_platform(url: str) -> Platform:
+    """Detect e-commerce platform from URL."""
+    url_lower = url.lower()
+    if "amazon" in url_lower:
+        return Platform.AMAZON
+    elif "flipkart" in url_lower:
+        return Platform.FLIPKART
+    elif "myntra" in url_lower:
+        return Platform.MYNTRA
+    return Platform.UNKNOWN
+
 
 class ScraperFactory:
     @staticmethod
-    def get_scraper(url: str) -> BaseScraper:
-        scrapers = [
+    def all_scrapers() -> List[BaseScraper]:
+        return [
             AmazonScraper(),
             FlipkartScraper(),
             MyntraScraper()
         ]
-        
-        for scraper in scrapers:
+
+    @staticmethod
+    def get_scraper(url: str) -> BaseScraper:
+        for scraper in ScraperFactory.all_scrapers():
             if scraper.verify_url(url):
                 return scraper
         
         raise ValueError(f"No scraper found for URL: {url}")
+
+    @staticmethod
+    async def scrape_fast(url: str) -> Optional[ScrapedProduct]:
+        """
+        Try the browserless path: plain HTTP GET + structured-data extraction.
+        Returns None when the caller should escalate to Playwright.
+        Not rate limited here: ScrapePipeline takes one token per product
+        for the fast path and any browser fallback together.
+        """
+        if not settings.FAST_PATH_ENABLED:
+            return None
+
+        scraper = ScraperFactory.get_scraper(url)
+        try:
+            status_code, html = await fetch_html(url)
+        except Exception as e:
+            logging.info(f"[FastPath] Fetch failed for {url}: {e}")
+            return None
+
+        if scraper.looks_blocked(status_code, html):
+            logging.info(f"[FastPath] Blocked ({status_code}) on {url}, escalating")
+            return None
+        if status_code != 200:
+            return None
+
+        try:
+            return scraper.extract_fast(html, url)
+        except Exception as e:
+            logging.info(f"[FastPath] Extraction failed for {url}: {e}")
+            return None
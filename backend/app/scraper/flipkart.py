@@ -1,16 +1,55 @@
+from typing import Optional
 from playwright.async_api import Page
 from .base import BaseScraper, ScrapedProduct
+from .selectors import FieldSpec
+from .structured import parse_structured_data, find_json_ld_product
 import logging
 
 class FlipkartScraper(BaseScraper):
+    PLATFORM = "flipkart"
+    SELECTORS = {
+        "title": FieldSpec([".B_NuCI", ".VU-ZEz"], require=r"\S.{2,}\S", fallbacks=["h1 span", "h1"]),
+        # Flipkart changes these frequently
+        "price": FieldSpec(
+            [
+                ".hZ3P6w",      # Current main price class
+                ".Nx9bqj",      # Alternative price class
+                "._30jeq3",     # Legacy price class
+                "._16Jk6d",     # Legacy deal price
+            ],
+            clean="digits",
+            require=r"\d",
+            fallbacks=["[class*='price']"]  # Also matches MRP and EMI prices
+        ),
+        "sold_out": FieldSpec(
+            ["._16FRp0", "[class*='sold-out']", "[class*='unavailable']"],
+            clean="flag",
+            require="sold out|unavailable"
+        ),
+        "og_image": FieldSpec(["meta[property='og:image']"], attr="content", require="^http"),
+        "image": FieldSpec(["._396cs4", ".DByuf4"], attr="src", require="http", fallbacks=["img[alt*='product']"]),
+    }
+
     def verify_url(self, url: str) -> bool:
         return "flipkart" in url
 
+    def extract_fast(self, html: str, url: str) -> Optional[ScrapedProduct]:
+        # Product pages ship a schema.org Product block (<script id="jsonLD">)
+        data = parse_structured_data(html)
+        product = find_json_ld_product(data.json_ld)
+        if not product or not product["title"] or not product["price"]:
+            return None
+
+        if not product["image_url"]:
+            product["image_url"] = data.meta.get("og:image")
+        # Availability comes from offers.availability: "sold out" anywhere in the
+        # page (recommendations, reviews) says nothing about this product
+        return ScrapedProduct(url=url, source="http", **product)
+
     async def scrape(self, page: Page, url: str) -> ScrapedProduct:
         logging.info(f"Scraping Flipkart URL: {url}")
         
-        # Note: page.goto() is called in test_scraper.py before this method
-        # We just need to extract data from the already loaded page
+        # Navigation happens once in ScrapePipeline; the page is already loaded
         
         try:
             # Wait a bit for any dynamic content
@@ -19,76 +58,13 @@ class FlipkartScraper(BaseScraper):
             except:
                 pass # Proceed even if timeout, DOM might be ready enough
             
-            # Title - try multiple selectors
-            title = "Unknown Product"
-            title_selectors = [".B_NuCI", ".VU-ZEz", "h1 span", "h1"]
-            for selector in title_selectors:
-                try:
-                    title_el = await page.query_selector(selector)
-                    if title_el:
-                        text = await title_el.inner_text()
-                        if text and len(text.strip()) > 3:
-                            title = text.strip()
-                            break
-                except Exception:
-                    continue
+            fields = await self.extract_fields(page)
             
-            # Price - try multiple selectors (Flipkart changes these frequently)
-            price = 0.0
-            price_selectors = [
-                ".hZ3P6w",      # Current main price class
-                ".Nx9bqj",      # Alternative price class
-                "._30jeq3",     # Legacy price class
-                "._16Jk6d",     # Legacy deal price
-                "[class*='price']"  # Fallback
-            ]
-            for selector in price_selectors:
-                try:
-                    price_el = await page.query_selector(selector)
-                    if price_el:
-                        price_text = await price_el.inner_text()
-                        # Clean price text (remove ₹, commas, etc.)
-                        cleaned = "".join([c for c in price_text if c.isdigit()])
-                        if cleaned:
-                            price = float(cleaned)
-                            break
-                except Exception:
-                    continue
-            
-            # Availability check
-            in_stock = True
-            sold_out_selectors = ["._16FRp0", "[class*='sold-out']", "[class*='unavailable']"]
-            for selector in sold_out_selectors:
-                try:
-                    sold_out_el = await page.query_selector(selector)
-                    if sold_out_el:
-                        text = await sold_out_el.inner_text()
-                        if "sold out" in text.lower() or "unavailable" in text.lower():
-                            in_stock = False
-                            break
-                except Exception:
-                    continue
-
-            # Image extraction
-            image_url = None
-            try:
-                # Try OG Image first (most reliable for clean full res)
-                meta_img = await page.query_selector("meta[property='og:image']")
-                if meta_img:
-                    image_url = await meta_img.get_attribute("content")
-                
-                # Fallback to visual element
-                if not image_url:
-                    img_selectors = ["._396cs4", ".DByuf4", "img[alt*='product']"]
-                    for sel in img_selectors:
-                        el = await page.query_selector(sel)
-                        if el:
-                            src = await el.get_attribute("src")
-                            if src and "http" in src:
-                                image_url = src
-                                break
-            except Exception:
-                pass
+            title = fields["title"].value or "Unknown Product"
+            price = fields["price"].value or 0.0
+            in_stock = not fields["sold_out"].value
+            # OG image first (most reliable for clean full res), then the visual element
+            image_url = fields["og_image"].value or fields["image"].value
 
             logging.info(f"Extracted - Title: {title[:50]}..., Price: {price}, Image: {image_url}")
             
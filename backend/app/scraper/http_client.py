@@ -0,0 +1,34 @@
+import asyncio
+import weakref
+from typing import Optional, Tuple
+import httpx
+
+from app.core.config import settings
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+# One pooled client per event loop (httpx connections can't cross loops)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers=HTTP_HEADERS,
+            follow_redirects=True,
+            timeout=settings.FAST_PATH_TIMEOUT
+        )
+        _clients[loop] = client
+    return client
+
+
+async def fetch_html(url: str) -> Tuple[int, Optional[str]]:
+    """Plain GET of a product page. Returns (status_code, html)."""
+    response = await get_http_client().get(url)
+    return response.status_code, response.text
@@ -1,30 +1,62 @@
+from typing import Optional
 from playwright.async_api import Page
 from .base import BaseScraper, ScrapedProduct
+from .selectors import FieldSpec
+from .structured import parse_structured_data, find_json_ld_product, extract_assigned_json, parse_price
 import logging
 
 class MyntraScraper(BaseScraper):
+    PLATFORM = "myntra"
+    # Myntra is heavily script based; wait for the PDP to render
+    WAIT_FOR = ".pdp-title"
+    WAIT_TIMEOUT = 5000
+    SELECTORS = {
+        "brand": FieldSpec([".pdp-title"]),
+        "name": FieldSpec([".pdp-name"]),
+        "price": FieldSpec([".pdp-price strong"], clean="digits", require=r"\d", fallbacks=[".pdp-price"]),
+        "image": FieldSpec(["meta[property='og:image']"], attr="content", require="^http"),
+    }
+
     def verify_url(self, url: str) -> bool:
         return "myntra" in url
 
+    def extract_fast(self, html: str, url: str) -> Optional[ScrapedProduct]:
+        data = parse_structured_data(html)
+
+        # Server-rendered state: window.__myx = {"pdpData": {...}}
+        state = extract_assigned_json(data.scripts, "window.__myx") or {}
+        pdp = state.get("pdpData") or {}
+        if pdp:
+            price = parse_price((pdp.get("price") or {}).get("discounted"))
+            brand = (pdp.get("brand") or {}).get("name") or ""
+            title = f"{brand} {pdp.get('name') or ''}".strip()
+            if title and price:
+                media = (pdp.get("media") or {}).get("albums") or []
+                images = media[0].get("images") if media else []
+                return ScrapedProduct(
+                    title=title,
+                    price=price,
+                    currency="INR",
+                    url=url,
+                    availability=not (pdp.get("flags") or {}).get("outOfStock", False),
+                    image_url=(images[0].get("imageURL") if images else None) or data.meta.get("og:image"),
+                    source="http"
+                )
+
+        product = find_json_ld_product(data.json_ld)
+        if product and product["title"] and product["price"]:
+            return ScrapedProduct(url=url, source="http", **product)
+        return None
+
     async def scrape(self, page: Page, url: str) -> ScrapedProduct:
         logging.info(f"Scraping Myntra URL: {url}")
-        await page.goto(url, wait_until="domcontentloaded")
+        # Navigation happens once in ScrapePipeline; the page is already loaded
         
         try:
-            # Myntra is heavily script based, meta tags are often reliable
-            title_el = await page.wait_for_selector(".pdp-title", timeout=5000)
-            name_el = await page.query_selector(".pdp-name")
-            
-            brand = await title_el.inner_text() if title_el else ""
-            name = await name_el.inner_text() if name_el else ""
-            full_title = f"{brand} {name}".strip()
-            
-            # Price
-            price_el = await page.query_selector(".pdp-price strong")
-            price_text = await price_el.inner_text() if price_el else "0"
+            fields = await self.extract_fields(page)
             
-            cleaned_price = "".join([c for c in price_text if c.isdigit()])
-            price = float(cleaned_price) if cleaned_price else 0.0
+            full_title = f"{fields['brand'].value or ''} {fields['name'].value or ''}".strip()
+            price = fields["price"].value or 0.0
             
             # Availability
             # Myntra shows 'Out of stock' in a specific container sometimes
@@ -37,7 +69,8 @@ class MyntraScraper(BaseScraper):
                 price=price,
                 currency="INR",
                 url=url,
-                availability=in_stock
+                availability=in_stock,
+                image_url=fields["image"].value
             )
 
         except Exception as e:
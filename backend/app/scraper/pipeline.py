@@ -0,0 +1,155 @@
+import time
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Callable, Awaitable, Any
+
+from .base import ScrapedProduct
+from .factory import ScraperFactory, detect_platform
+from .rate_limiter import rate_limiter
+from . import scrape_cache
+from .utils import apply_stealth, simulate_human_behavior
+
+class ScrapeValidationError(ValueError):
+    """Scraped data is not usable (missing title, or missing price on an available product)."""
+    pass
+
+
+@dataclass
+class PipelineResult:
+    """A scraped product plus where the time went."""
+    product: ScrapedProduct
+    timings: Dict[str, float] = field(default_factory=dict)  # Stage -> milliseconds
+    bytes_saved: int = 0
+    persisted: Any = None  # Whatever the persist callback returned
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.timings.values())
+
+
+class ScrapePipeline:
+    """
+    context -> navigate -> humanize -> extract -> validate -> persist
+
+    Navigation happens exactly once, here; scrapers only read the loaded page.
+    The HTTP fast path runs first and, when it succeeds, skips the browser
+    stages entirely. A product costs one rate-limit token however many of
+    those paths it goes through. Every fresh scrape is cached briefly by product key (see
+    app.scraper.canonical); with `use_cache`, a cached scrape of the same
+    product is reused instead of fetching. Only track jobs opt in: for
+    existing products a cache hit would be persisted as a new observation.
+
+    `context_factory(platform)` must return an async context manager yielding
+    a browser context (e.g. BrowserPool.context). `progress(stage)`, if given,
+    is awaited with "navigating" when fetching starts and "extracted" once
+    the product has been validated.
+    """
+
+    def __init__(
+        self,
+        context_factory: Callable[[str], Any],
+        persist: Optional[Callable[[ScrapedProduct], Awaitable[Any]]] = None,
+        humanize: bool = True,
+        use_fast_path: bool = True,
+        use_cache: bool = False,
+        progress: Optional[Callable[[str], Awaitable[Any]]] = None
+    ):
+        self.context_factory = context_factory
+        self.persist = persist
+        self.progress = progress
+        self.humanize = humanize
+        self.use_fast_path = use_fast_path
+        self.use_cache = use_cache
+
+    @asynccontextmanager
+    async def _stage(self, name: str, timings: Dict[str, float]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    async def run(self, url: str) -> PipelineResult:
+        timings: Dict[str, float] = {}
+        platform = detect_platform(url)
+        scraper = ScraperFactory.get_scraper(url)
+        product = None
+        bytes_saved = 0
+
+        await self._report("navigating")
+
+        if self.use_cache:
+            async with self._stage("cache", timings):
+                product = await scrape_cache.get_cached(url)
+
+        throttled = False
+        if product is None and self.use_fast_path:
+            async with self._stage("fast_path", timings):
+                await rate_limiter.acquire(platform)
+                throttled = True
+                product = await ScraperFactory.scrape_fast(url)
+
+        if product is None:
+            start = time.perf_counter()
+            async with self.context_factory(platform.value) as context:
+                timings["context"] = round((time.perf_counter() - start) * 1000, 1)
+
+                async with self._stage("navigate", timings):
+                    page = await context.new_page()
+                    await apply_stealth(page)
+                    if not throttled:
+                        await rate_limiter.acquire(platform)
+                    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+
+                if self.humanize:
+                    async with self._stage("humanize", timings):
+                        await simulate_human_behavior(page)
+
+                async with self._stage("extract", timings):
+                    product = await scraper.scrape(page, url)
+
+                if getattr(context, "resource_stats", None):
+                    bytes_saved = context.resource_stats.estimated_bytes_saved
+
+        async with self._stage("validate", timings):
+            self.validate(product)
+        if product.source != "cache":
+            await scrape_cache.store(url, product)
+        await self._report("extracted")
+
+        persisted = None
+        if self.persist is not None:
+            async with self._stage("persist", timings):
+                persisted = await self.persist(product)
+
+        result = PipelineResult(
+            product=product,
+            timings=timings,
+            bytes_saved=bytes_saved,
+            persisted=persisted
+        )
+        logging.info(f"[Pipeline] {url} via {product.source} in {result.total_ms:.0f} ms: {timings}")
+        return result
+
+    async def _report(self, stage: str):
+        if self.progress is not None:
+            try:
+                await self.progress(stage)
+            except Exception as e:
+                # Progress reporting must never fail the scrape
+                logging.warning(f"[Pipeline] Progress callback failed at {stage}: {e}")
+
+    @staticmethod
+    def validate(product: Optional[ScrapedProduct]):
+        """
+        Unavailable products may come back without a price (price 0.0):
+        "Currently unavailable" pages often show none. Persisting keeps the
+        last known price and records only the availability.
+        """
+        if product is None:
+            raise ScrapeValidationError("Scraper returned no product")
+        if not product.title or product.title == "Unknown Product":
+            raise ScrapeValidationError("Could not extract product title")
+        if product.price <= 0 and product.availability:
+            raise ScrapeValidationError("Could not extract a positive price")
@@ -0,0 +1,118 @@
+import time
+import asyncio
+import logging
+from typing import Dict, Tuple, Union
+
+from app.core.config import settings
+from app.db.redis import get_redis
+from app.models.product import Platform
+
+# Used when SCRAPE_RATE_LIMITS / SCRAPE_BURST_SIZES have no entry for a platform
+DEFAULT_RATE = 0.2
+DEFAULT_BURST = 2
+
+# Token bucket evaluated atomically in Redis so every worker and the API share
+# one budget per platform. Uses the Redis clock so hosts need not agree on time.
+# Returns 0 when a token was taken, otherwise milliseconds until one is available.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+
+tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', key, math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class RateLimiter:
+    """
+    Token buckets shared across all workers via Redis: one per scrape platform,
+    plus named buckets for other outbound APIs (e.g. Telegram).
+    """
+
+    KEY_PREFIX = "ratelimit:"
+
+    def _platform_key(self, platform: Union[Platform, str]) -> str:
+        """Bucket name for a platform; anything unrecognised shares the "unknown" bucket."""
+        try:
+            return Platform(platform).value
+        except ValueError:
+            logging.warning(f"[RateLimiter] Unknown platform {platform!r}, using the 'unknown' bucket")
+            return Platform.UNKNOWN.value
+
+    def _limits(self, platform: str):
+        unknown = Platform.UNKNOWN.value
+        rate = settings.SCRAPE_RATE_LIMITS.get(platform, settings.SCRAPE_RATE_LIMITS.get(unknown, DEFAULT_RATE))
+        burst = settings.SCRAPE_BURST_SIZES.get(platform, settings.SCRAPE_BURST_SIZES.get(unknown, DEFAULT_BURST))
+        return rate, burst
+
+    async def try_acquire_bucket(self, name: str, rate: float, burst: float) -> int:
+        """Take one token from a named bucket. Returns ms to wait (0 means acquired)."""
+        redis = get_redis()
+        return int(await redis.eval(
+            TOKEN_BUCKET_SCRIPT, 1, f"{self.KEY_PREFIX}{name}", rate, burst
+        ))
+
+    async def acquire_bucket(self, name: str, rate: float, burst: float):
+        """Block until the named bucket grants a token."""
+        while True:
+            try:
+                wait_ms = await self.try_acquire_bucket(name, rate, burst)
+            except Exception as e:
+                # Don't stall callers because Redis is briefly unreachable
+                logging.warning(f"[RateLimiter] Redis unavailable, not throttling: {e}")
+                return
+            if wait_ms <= 0:
+                return
+            await asyncio.sleep(wait_ms / 1000)
+
+    async def try_acquire(self, platform: Union[Platform, str]) -> int:
+        """Take one token if available. Returns ms to wait (0 means acquired)."""
+        platform = self._platform_key(platform)
+        return await self.try_acquire_bucket(platform, *self._limits(platform))
+
+    async def acquire(self, platform: Union[Platform, str]):
+        """Block until this platform's bucket grants a token."""
+        platform = self._platform_key(platform)
+        await self.acquire_bucket(platform, *self._limits(platform))
+
+
+class LocalRateLimiter:
+    """
+    In-process stand-in for RateLimiter's named buckets, for single-process
+    tools (benchmarks, scripts) that run without Redis.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def acquire_bucket(self, name: str, rate: float, burst: float):
+        while True:
+            now = time.monotonic()
+            tokens, ts = self._buckets.get(name, (burst, now))
+            tokens = min(burst, tokens + (now - ts) * rate)
+            if tokens >= 1:
+                self._buckets[name] = (tokens - 1, now)
+                return
+            self._buckets[name] = (tokens, now)
+            await asyncio.sleep((1 - tokens) / rate)
+
+
+rate_limiter = RateLimiter()
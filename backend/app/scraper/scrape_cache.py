@@ -0,0 +1,39 @@
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.db.redis import get_redis
+from .base import ScrapedProduct
+from .canonical import canonicalize
+
+CACHE_PREFIX = "scrape:cache:"
+
+# The cache is an optimisation: if Redis is unreachable, scrape anyway.
+
+
+def _key(url: str) -> str:
+    return f"{CACHE_PREFIX}{canonicalize(url).key}"
+
+
+async def get_cached(url: str) -> Optional[ScrapedProduct]:
+    """A scrape of the same product (any link to it) from the last SCRAPE_CACHE_SECONDS."""
+    if settings.SCRAPE_CACHE_SECONDS <= 0:
+        return None
+    try:
+        raw = await get_redis().get(_key(url))
+    except Exception as e:
+        logging.warning(f"[ScrapeCache] Lookup skipped: {e}")
+        return None
+    if not raw:
+        return None
+    product = ScrapedProduct.model_validate_json(raw)
+    return product.model_copy(update={"url": url, "source": "cache"})
+
+
+async def store(url: str, product: ScrapedProduct):
+    if settings.SCRAPE_CACHE_SECONDS <= 0:
+        return
+    try:
+        await get_redis().set(_key(url), product.model_dump_json(), ex=settings.SCRAPE_CACHE_SECONDS)
+    except Exception as e:
+        logging.warning(f"[ScrapeCache] Store skipped: {e}")
@@ -0,0 +1,145 @@
+import time
+import logging
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+from app.db.redis import get_redis
+from .selectors import FieldSpec, FieldResult
+
+SECONDS_PER_DAY = 86400
+
+
+class SelectorStats:
+    """
+    Hit/miss counts per selector per platform, kept in Redis so every worker
+    learns from every scrape.
+
+    Counts live in daily buckets that expire after the stats window, so the
+    success rate reflects recent behaviour. Specific candidates are then tried
+    in order of that rate; fallbacks always stay last, because a catch-all
+    never misses and would otherwise outrank the selector it backs up. Selectors with no hit for SELECTOR_DEAD_AFTER_DAYS are
+    reported as dead.
+
+    Flag fields (e.g. "sold out" markers) are skipped: a miss there is the
+    normal case, not a broken selector.
+    """
+
+    KEY_PREFIX = "selstats:"
+
+    def __init__(self):
+        # Orderings are cached briefly so a page costs no extra Redis round trip
+        self._order_cache: Dict[Tuple[str, str], Tuple[float, List[str]]] = {}
+
+    def _bucket_key(self, platform: str, field: str, day: datetime) -> str:
+        return f"{self.KEY_PREFIX}{platform}:{field}:{day.strftime('%Y%m%d')}"
+
+    def _meta_key(self, platform: str, field: str, kind: str) -> str:
+        return f"{self.KEY_PREFIX}{platform}:{field}:{kind}"
+
+    async def _load(self, platform: str, field: str) -> Dict[str, Dict[str, int]]:
+        """Sum hits/misses per selector over the stats window."""
+        redis = get_redis()
+        today = datetime.utcnow()
+        pipe = redis.pipeline(transaction=False)
+        for offset in range(settings.SELECTOR_STATS_WINDOW_DAYS):
+            pipe.hgetall(self._bucket_key(platform, field, today - timedelta(days=offset)))
+        buckets = await pipe.execute()
+
+        totals: Dict[str, Dict[str, int]] = {}
+        for bucket in buckets:
+            for key, count in bucket.items():
+                kind, selector = key.split(":", 1)
+                totals.setdefault(selector, {"hits": 0, "misses": 0})[kind] += int(count)
+        return totals
+
+    async def order(self, platform: str, field: str, selectors: List[str]) -> List[str]:
+        """Candidates sorted by recent success rate (ties keep declared order)."""
+        cached = self._order_cache.get((platform, field))
+        if cached and time.monotonic() - cached[0] < settings.SELECTOR_ORDER_CACHE_SECONDS:
+            known = [s for s in cached[1] if s in selectors]
+            return known + [s for s in selectors if s not in known]
+
+        totals = await self._load(platform, field)
+
+        def rate(selector: str) -> float:
+            counts = totals.get(selector, {"hits": 0, "misses": 0})
+            # Laplace smoothing: untried selectors start at 0.5
+            return (counts["hits"] + 1) / (counts["hits"] + counts["misses"] + 2)
+
+        ordered = sorted(selectors, key=lambda s: -rate(s))
+        self._order_cache[(platform, field)] = (time.monotonic(), ordered)
+        return ordered
+
+    async def order_spec(self, platform: str, spec: Dict[str, FieldSpec]) -> Dict[str, FieldSpec]:
+        ordered = {}
+        for name, field in spec.items():
+            if field.clean == "flag" or len(field.selectors) < 2:
+                ordered[name] = field
+                continue
+            try:
+                selectors = await self.order(platform, name, field.selectors)
+            except Exception as e:
+                logging.warning(f"[SelectorStats] Using declared order: {e}")
+                selectors = field.selectors
+            ordered[name] = replace(field, selectors=selectors)
+        return ordered
+
+    async def record(self, platform: str, spec: Dict[str, FieldSpec], results: Dict[str, FieldResult]):
+        """
+        Record one extraction. Every candidate tried before the winner is a
+        miss; if nothing matched, every candidate is a miss.
+        """
+        redis = get_redis()
+        now = datetime.utcnow()
+        pipe = redis.pipeline(transaction=False)
+        for name, field in spec.items():
+            if field.clean == "flag":
+                continue
+            result = results[name]
+            candidates = field.candidates
+            tried = candidates if result.index < 0 else candidates[:result.index]
+            bucket = self._bucket_key(platform, name, now)
+            first_seen = self._meta_key(platform, name, "first_seen")
+            for selector in candidates:
+                pipe.hsetnx(first_seen, selector, int(now.timestamp()))
+            for selector in tried:
+                pipe.hincrby(bucket, f"misses:{selector}", 1)
+            if result.selector:
+                pipe.hincrby(bucket, f"hits:{result.selector}", 1)
+                pipe.hset(self._meta_key(platform, name, "last_hit"), result.selector, int(now.timestamp()))
+            pipe.expire(bucket, settings.SELECTOR_STATS_WINDOW_DAYS * SECONDS_PER_DAY)
+        await pipe.execute()
+
+    async def report(self, platform: str, spec: Dict[str, FieldSpec]) -> Dict[str, List[dict]]:
+        """Per-field selector stats in current try order, with dead flags."""
+        redis = get_redis()
+        now = time.time()
+        dead_after = settings.SELECTOR_DEAD_AFTER_DAYS * SECONDS_PER_DAY
+        report = {}
+        for name, field in spec.items():
+            if field.clean == "flag":
+                continue
+            totals = await self._load(platform, name)
+            last_hits = await redis.hgetall(self._meta_key(platform, name, "last_hit"))
+            first_seen = await redis.hgetall(self._meta_key(platform, name, "first_seen"))
+            rows = []
+            for selector in await self.order(platform, name, field.selectors) + field.fallbacks:
+                counts = totals.get(selector, {"hits": 0, "misses": 0})
+                last_hit = int(last_hits[selector]) if selector in last_hits else None
+                seen = int(first_seen[selector]) if selector in first_seen else None
+                # Dead: tried for longer than the threshold without a single hit
+                reference = last_hit or seen
+                rows.append({
+                    "selector": selector,
+                    "hits": counts["hits"],
+                    "misses": counts["misses"],
+                    "last_hit": datetime.utcfromtimestamp(last_hit).isoformat() if last_hit else None,
+                    "dead": reference is not None and now - reference > dead_after
+                })
+            report[name] = rows
+        return report
+
+
+selector_stats = SelectorStats()
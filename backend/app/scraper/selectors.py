@@ -0,0 +1,94 @@
+from dataclasses import dataclass, asdict, field as dataclass_field
+from typing import Optional, List, Dict, Any
+from playwright.async_api import Page
+
+# Resolves every field of a spec in one in-page call. For each field the
+# candidates are tried in order; the first element whose value passes the
+# field's `require` regex wins. Returns {field: {value, index}}.
+EVALUATE_SPEC_JS = """
+(spec) => {
+    const out = {};
+    for (const [field, f] of Object.entries(spec)) {
+        out[field] = {value: null, index: -1};
+        const re = f.require ? new RegExp(f.require, 'i') : null;
+        for (let i = 0; i < f.selectors.length; i++) {
+            let el = null;
+            try { el = document.querySelector(f.selectors[i]); } catch (e) { continue; }
+            if (!el) continue;
+            const raw = f.attr ? el.getAttribute(f.attr) : (el.innerText ?? el.textContent);
+            if (raw === null || raw === undefined) continue;
+            const value = String(raw).trim();
+            if (re && !re.test(value)) continue;
+            out[field] = {value: value, index: i};
+            break;
+        }
+    }
+    return out;
+}
+"""
+
+
+@dataclass
+class FieldSpec:
+    """
+    How to extract one field: ordered candidate selectors plus a cleaning rule.
+
+    selectors: specific candidates, one per known page layout, so at most one
+               is present on a page; selector statistics may reorder them
+               without changing which element is extracted
+    fallbacks: catch-all candidates (e.g. "h1", "[class*='price']") that
+               can match the wrong element; always tried last, in this order
+    clean:     "text" (strip), "price" (digits and '.'), "digits", or "flag"
+               (True if any candidate matched)
+    attr:      read this attribute instead of the element's text
+    require:   regex the raw value must match for a candidate to count
+    """
+    selectors: List[str]
+    clean: str = "text"
+    attr: Optional[str] = None
+    require: Optional[str] = None
+    fallbacks: List[str] = dataclass_field(default_factory=list)
+
+    @property
+    def candidates(self) -> List[str]:
+        """Every candidate in try order: specific selectors, then fallbacks."""
+        return self.selectors + self.fallbacks
+
+
+@dataclass
+class FieldResult:
+    value: Any
+    selector: Optional[str]  # The candidate that matched, if any
+    index: int = -1
+
+
+def clean_value(raw: Optional[str], rule: str) -> Any:
+    if rule == "flag":
+        return raw is not None
+    if raw is None:
+        return None
+    if rule in ("price", "digits"):
+        keep = "." if rule == "price" else ""
+        cleaned = "".join(c for c in raw if c.isdigit() or c in keep).strip(".")
+        try:
+            return float(cleaned) if cleaned else None
+        except ValueError:
+            return None
+    return raw.strip()
+
+
+async def evaluate_spec(page: Page, spec: Dict[str, FieldSpec]) -> Dict[str, FieldResult]:
+    """Evaluate a whole selector spec in a single browser round trip."""
+    payload = {name: {**asdict(field), "selectors": field.candidates} for name, field in spec.items()}
+    raw = await page.evaluate(EVALUATE_SPEC_JS, payload)
+
+    results = {}
+    for name, field in spec.items():
+        hit = raw.get(name) or {}
+        index = hit.get("index", -1)
+        results[name] = FieldResult(
+            value=clean_value(hit.get("value"), field.clean),
+            selector=field.candidates[index] if index >= 0 else None,
+            index=index
+        )
+    return results
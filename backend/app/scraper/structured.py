@@ -0,0 +1,136 @@
+import re
+import json
+from html.parser import HTMLParser
+from typing import Optional, List, Dict, Any
+
+
+class StructuredDataParser(HTMLParser):
+    """
+    Single-pass collector for the machine-readable bits of a product page:
+    JSON-LD blocks, <meta> tags, inline <script> bodies and the <title>.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.json_ld: List[Any] = []
+        self.meta: Dict[str, str] = {}
+        self.scripts: List[str] = []
+        self.title: str = ""
+        self._in_script = False
+        self._script_is_json_ld = False
+        self._in_title = False
+        self._buffer: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            key = attrs.get("property") or attrs.get("name") or attrs.get("itemprop")
+            if key and attrs.get("content") is not None:
+                self.meta.setdefault(key.lower(), attrs["content"])
+        elif tag == "script":
+            self._in_script = True
+            self._script_is_json_ld = (attrs.get("type") or "").lower() == "application/ld+json"
+            self._buffer = []
+        elif tag == "title":
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._in_script:
+            body = "".join(self._buffer).strip()
+            if self._script_is_json_ld:
+                try:
+                    self.json_ld.append(json.loads(body))
+                except ValueError:
+                    pass
+            elif body:
+                self.scripts.append(body)
+            self._in_script = False
+        elif tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_script:
+            self._buffer.append(data)
+        elif self._in_title:
+            self.title += data
+
+
+def parse_structured_data(html: str) -> StructuredDataParser:
+    parser = StructuredDataParser()
+    parser.feed(html)
+    parser.close()
+    return parser
+
+
+def parse_price(value: Any) -> Optional[float]:
+    """Parse '₹1,299.00' / '1299' / 1299.0 into a float."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    cleaned = "".join(c for c in str(value) if c.isdigit() or c == ".")
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+
+def _iter_json_ld_nodes(node: Any):
+    if isinstance(node, list):
+        for item in node:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(node, dict):
+        yield node
+        if "@graph" in node:
+            yield from _iter_json_ld_nodes(node["@graph"])
+
+
+def find_json_ld_product(json_ld: List[Any]) -> Optional[dict]:
+    """
+    Pull name/price/currency/availability/image out of a schema.org Product.
+    """
+    for node in _iter_json_ld_nodes(json_ld):
+        node_type = node.get("@type")
+        types = node_type if isinstance(node_type, list) else [node_type]
+        if "Product" not in types:
+            continue
+
+        offers = node.get("offers") or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        price = parse_price(offers.get("price") or offers.get("lowPrice"))
+
+        image = node.get("image")
+        if isinstance(image, list):
+            image = image[0] if image else None
+        if isinstance(image, dict):
+            image = image.get("url")
+
+        availability = str(offers.get("availability") or "")
+        return {
+            "title": (node.get("name") or "").strip(),
+            "price": price,
+            "currency": offers.get("priceCurrency") or "INR",
+            "availability": not re.search(r"OutOfStock|SoldOut|Discontinued", availability),
+            "image_url": image
+        }
+    return None
+
+
+def extract_assigned_json(scripts: List[str], variable: str) -> Optional[dict]:
+    """
+    Find `variable = {...}` in inline scripts (e.g. window.__INITIAL_STATE__)
+    and decode the object literal.
+    """
+    pattern = re.compile(re.escape(variable) + r"\s*=\s*")
+    decoder = json.JSONDecoder()
+    for script in scripts:
+        match = pattern.search(script)
+        if not match:
+            continue
+        try:
+            value, _ = decoder.raw_decode(script, match.end())
+            return value
+        except ValueError:
+            continue
+    return None
@@ -1,15 +1,104 @@
 import random
 import asyncio
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List
 from playwright_stealth import Stealth
 
-async def get_stealth_context(browser):
-    """Create a browser context with stealth mode enabled."""
+from app.core.config import settings
+
+# Third-party analytics/ad hosts that never affect the price we read
+TRACKER_PATTERNS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo",
+    "branch.io",
+    "adsystem",
+]
+
+# Typical transfer size of each blocked resource type. Aborted requests are
+# never downloaded, so bytes saved can only be estimated.
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 35_000,
+    "stylesheet": 25_000,
+    "script": 30_000,
+    "xhr": 3_000,
+    "fetch": 3_000,
+}
+DEFAULT_RESOURCE_BYTES = 5_000
+
+
+@dataclass
+class ResourceStats:
+    """What the resource blocker dropped during one scrape."""
+    blocked_requests: int = 0
+    allowed_requests: int = 0
+    estimated_bytes_saved: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+
+class ResourceBlocker:
+    """
+    Aborts requests a scrape doesn't need (images, media, fonts, trackers).
+    Per-platform allow patterns win over everything, since some platforms
+    need specific scripts or assets to render the price.
+    """
+
+    def __init__(self, platform: Optional[str] = None):
+        platform = platform or "unknown"
+        self.blocked_types = set(settings.BLOCKED_RESOURCE_TYPES)
+        self.allow: List[str] = settings.RESOURCE_ALLOW_PATTERNS.get(platform, [])
+        self.deny: List[str] = TRACKER_PATTERNS + settings.RESOURCE_DENY_PATTERNS.get(platform, [])
+        self.stats = ResourceStats()
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if resource_type == "document":
+            return False
+        if any(pattern in url for pattern in self.allow):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return any(pattern in url for pattern in self.deny)
+
+    async def handle(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.stats.blocked_requests += 1
+            self.stats.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(
+                request.resource_type, DEFAULT_RESOURCE_BYTES
+            )
+            self.stats.blocked_by_type[request.resource_type] = (
+                self.stats.blocked_by_type.get(request.resource_type, 0) + 1
+            )
+            await route.abort()
+        else:
+            self.stats.allowed_requests += 1
+            await route.continue_()
+
+
+async def get_stealth_context(browser, platform: Optional[str] = None):
+    """
+    Create a browser context with stealth mode enabled.
+    When resource blocking is on, the context's stats are at `context.resource_stats`.
+    """
     context = await browser.new_context(
         viewport={'width': 1920, 'height': 1080},
         user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         locale='en-IN',
         timezone_id='Asia/Kolkata',
     )
+    context.resource_stats = None
+    if settings.BLOCK_RESOURCES:
+        blocker = ResourceBlocker(platform)
+        await context.route("**/*", blocker.handle)
+        context.resource_stats = blocker.stats
     return context
 
 async def apply_stealth(page):
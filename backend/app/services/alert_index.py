@@ -0,0 +1,116 @@
+import logging
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.redis import get_redis
+from app.models.product import Alert
+from app.services.alert_rules import index_score
+
+
+class AlertIndex:
+    """
+    Active, untriggered alerts per product, kept in Redis sorted sets
+    (member = alert id, score = highest price at which it could fire: the
+    target for target_price rules, +inf for rules that depend on history or
+    stock, see alert_rules.index_score).
+
+    A scrape at price P can only fire an alert scored >= P, which is one
+    ZRANGEBYSCORE per product, so rules are only evaluated for the rare
+    products that could actually fire.
+
+    The index is trusted only while the ready marker exists. The marker is set
+    by `rebuild` and dropped whenever a write to the index fails; without it
+    `candidates` returns None and callers check every product in Postgres.
+    """
+
+    KEY_PREFIX = "alerts:targets:"
+    READY_KEY = "alerts:targets:ready"
+
+    def _key(self, product_id: int) -> str:
+        return f"{self.KEY_PREFIX}{product_id}"
+
+    async def _invalidate(self, error: Exception):
+        logging.warning(f"[AlertIndex] Write failed, falling back to Postgres until rebuild: {error}")
+        try:
+            await get_redis().delete(self.READY_KEY)
+        except Exception:
+            pass  # Redis is down, so candidates() falls back on its own
+
+    async def add(self, alert_id: int, product_id: int, rule_type: str, target_price: Optional[float]):
+        if not settings.ALERT_INDEX_ENABLED:
+            return
+        try:
+            await get_redis().zadd(self._key(product_id), {str(alert_id): index_score(rule_type, target_price)})
+        except Exception as e:
+            await self._invalidate(e)
+
+    async def remove(self, alerts: Iterable[Tuple[int, int]]):
+        """Drop (alert_id, product_id) pairs from the index."""
+        alerts = list(alerts)
+        if not settings.ALERT_INDEX_ENABLED or not alerts:
+            return
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for alert_id, product_id in alerts:
+                pipe.zrem(self._key(product_id), str(alert_id))
+            await pipe.execute()
+        except Exception as e:
+            await self._invalidate(e)
+
+    async def remove_product(self, product_id: int):
+        if not settings.ALERT_INDEX_ENABLED:
+            return
+        try:
+            await get_redis().delete(self._key(product_id))
+        except Exception as e:
+            await self._invalidate(e)
+
+    async def candidates(self, prices: Dict[int, float]) -> Optional[Set[int]]:
+        """
+        Products whose new price could fire at least one alert.
+        None means the index can't be trusted right now: check them all.
+        """
+        if not settings.ALERT_INDEX_ENABLED:
+            return None
+        if not prices:
+            return set()
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.exists(self.READY_KEY)
+            for product_id, price in prices.items():
+                pipe.zrangebyscore(self._key(product_id), price, "+inf", start=0, num=1)
+            ready, *hits = await pipe.execute()
+        except Exception as e:
+            logging.warning(f"[AlertIndex] Lookup failed, checking alerts in Postgres: {e}")
+            return None
+        if not ready:
+            return None
+        return {product_id for product_id, hit in zip(prices.keys(), hits) if hit}
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """Reload the index from Postgres and mark it ready. Returns the number of alerts indexed."""
+        if not settings.ALERT_INDEX_ENABLED:
+            return 0
+        result = await session.execute(
+            select(Alert.id, Alert.product_id, Alert.rule_type, Alert.target_price)
+            .where(Alert.is_active == True)
+            .where(Alert.triggered_at == None)
+        )
+        targets: Dict[int, Dict[str, float]] = {}
+        for alert_id, product_id, rule_type, target_price in result.all():
+            targets.setdefault(product_id, {})[str(alert_id)] = index_score(rule_type, target_price)
+
+        # Only ever add here: an alert created while this runs must not be
+        # wiped. A stale member just costs one alerts query that finds nothing.
+        pipe = get_redis().pipeline(transaction=True)
+        for product_id, members in targets.items():
+            pipe.zadd(self._key(product_id), members)
+        pipe.set(self.READY_KEY, 1)
+        await pipe.execute()
+        return sum(len(members) for members in targets.values())
+
+
+alert_index = AlertIndex()
@@ -0,0 +1,143 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.product import AlertRule
+
+# Rules whose threshold depends on price history rather than a fixed target
+STATS_RULES = (AlertRule.PERCENT_BELOW_AVERAGE.value, AlertRule.NEW_LOW.value)
+
+
+def default_window_days(rule_type: str) -> Optional[int]:
+    if rule_type == AlertRule.PERCENT_BELOW_AVERAGE.value:
+        return settings.ALERT_AVERAGE_WINDOW_DAYS
+    if rule_type == AlertRule.NEW_LOW.value:
+        return settings.ALERT_LOW_WINDOW_DAYS
+    return None
+
+
+def validate_rule(
+    rule_type: str,
+    target_price: Optional[float],
+    rule_percent: Optional[float],
+    rule_window_days: Optional[int]
+) -> Optional[str]:
+    """Return an error message if the rule's parameters don't fit its type."""
+    if rule_type == AlertRule.TARGET_PRICE.value and (target_price is None or target_price <= 0):
+        return "target_price rules need a positive target_price"
+    if rule_type == AlertRule.PERCENT_BELOW_AVERAGE.value and not (rule_percent and 0 < rule_percent < 100):
+        return "percent_below_average rules need rule_percent between 0 and 100"
+    if rule_window_days is not None and not 1 <= rule_window_days <= 365:
+        return "rule_window_days must be between 1 and 365"
+    return None
+
+
+def index_score(rule_type: str, target_price: Optional[float]) -> float:
+    """
+    Score for the alert index: the highest price at which the alert could fire.
+    Only fixed targets have one; other rules are always candidates.
+    """
+    if rule_type == AlertRule.TARGET_PRICE.value:
+        return target_price
+    return float("inf")
+
+
+# Every active rule for every product in the batch, evaluated in one statement.
+# Window stats come from a LATERAL aggregate that only runs for stats rules
+# (the rule_type filter is a one-time filter, so other rules never scan
+# history). Runs that began with this very scrape are excluded, so "new low"
+# and "below average" compare against the past, not against themselves.
+EVALUATE_RULES_SQL = text("""
+    WITH obs AS (
+        SELECT *
+        FROM unnest(
+            CAST(:ids AS INTEGER[]),
+            CAST(:prices AS DOUBLE PRECISION[]),
+            CAST(:available AS BOOLEAN[]),
+            CAST(:was_available AS BOOLEAN[])
+        ) AS v(product_id, price, is_available, was_available)
+    ),
+    fired AS (
+        SELECT a.id, obs.price, stats.avg_price, stats.min_price
+        FROM alerts AS a
+        JOIN obs ON obs.product_id = a.product_id
+        LEFT JOIN LATERAL (
+            SELECT SUM(h.price * h.sample_count) / NULLIF(SUM(h.sample_count), 0) AS avg_price,
+                   MIN(h.price) AS min_price
+            FROM price_history AS h
+            WHERE a.rule_type IN ('percent_below_average', 'new_low')
+              AND h.product_id = a.product_id
+              AND h.is_available
+              AND h.scraped_at < CAST(:now AS TIMESTAMP)
+              AND h.last_seen_at >= CAST(:now AS TIMESTAMP) - make_interval(days => a.rule_window_days)
+        ) AS stats ON TRUE
+        WHERE a.is_active
+          AND a.triggered_at IS NULL
+          AND (
+            (a.rule_type = 'target_price'
+                AND obs.price > 0
+                AND obs.price <= a.target_price)
+            OR (a.rule_type = 'percent_below_average'
+                AND obs.is_available
+                AND obs.price <= stats.avg_price * (1 - a.rule_percent / 100))
+            OR (a.rule_type = 'new_low'
+                AND obs.is_available
+                AND obs.price < stats.min_price)
+            OR (a.rule_type = 'back_in_stock'
+                AND obs.is_available
+                AND NOT obs.was_available)
+          )
+    )
+    UPDATE alerts AS a
+    SET triggered_at = CAST(:now AS TIMESTAMP)
+    FROM fired, products AS p
+    WHERE a.id = fired.id
+      AND p.id = a.product_id
+    RETURNING a.id, a.product_id, a.rule_type, a.contact_method, a.contact_value,
+              a.target_price, a.rule_percent, a.rule_window_days,
+              fired.price, fired.avg_price, fired.min_price, p.name, p.url
+""")
+
+
+async def evaluate_alerts(
+    session: AsyncSession,
+    observations: Dict[int, dict],
+    now: datetime
+) -> List[dict]:
+    """
+    Fire every alert whose rule matches a fresh observation and return the
+    notification payloads. `observations` maps product_id ->
+    {price, is_available, was_available}. Costs one round trip however many
+    products and rule types are involved. The caller commits.
+    """
+    if not observations:
+        return []
+    ids = list(observations.keys())
+    result = await session.execute(EVALUATE_RULES_SQL, {
+        "now": now,
+        "ids": ids,
+        "prices": [observations[product_id]["price"] for product_id in ids],
+        "available": [observations[product_id]["is_available"] for product_id in ids],
+        "was_available": [observations[product_id]["was_available"] for product_id in ids]
+    })
+    return [
+        {
+            "alert_id": row.id,
+            "product_id": row.product_id,
+            "rule_type": row.rule_type,
+            "contact_method": row.contact_method,
+            "contact_value": row.contact_value,
+            "target_price": row.target_price,
+            "rule_percent": row.rule_percent,
+            "rule_window_days": row.rule_window_days,
+            "current_price": row.price,
+            "average_price": row.avg_price,
+            "previous_low": row.min_price,
+            "product_name": row.name,
+            "product_url": row.url
+        }
+        for row in result.all()
+    ]
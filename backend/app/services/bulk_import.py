@@ -0,0 +1,157 @@
+import csv
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+from app.scraper.canonical import canonicalize
+from app.scraper.factory import detect_platform
+
+# Shown until the first scrape fills in the real title
+PLACEHOLDER_NAME = "Pending first scrape"
+
+# Per-line outcomes
+STATUS_CREATED = "created"  # New placeholder, first scrape scheduled
+STATUS_EXISTS = "exists"  # Product already tracked (possibly via another link)
+STATUS_DUPLICATE = "duplicate"  # Same product as an earlier line of this import
+STATUS_INVALID = "invalid"
+
+
+async def read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Split a streamed body into (line_number, text) without buffering it whole."""
+    pending = b""
+    line_number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line.decode("utf-8", errors="replace").strip()
+    if pending:
+        yield line_number + 1, pending.decode("utf-8", errors="replace").strip()
+
+
+class LineParser:
+    """
+    Pulls the URL out of one CSV or NDJSON line.
+
+    NDJSON lines are objects with a "url" field (or bare JSON strings). CSV
+    may start with a header row; the "url" column is used if there is one,
+    otherwise the first column.
+    """
+
+    def __init__(self, ndjson: bool):
+        self.ndjson = ndjson
+        self.url_column: Optional[int] = None
+
+    def parse(self, line_number: int, line: str) -> Tuple[Optional[str], Optional[str]]:
+        """Returns (url, error); both None for lines to skip silently."""
+        if not line or line.startswith("#"):
+            return None, None
+        if self.ndjson:
+            try:
+                value = json.loads(line)
+            except ValueError:
+                return None, "not valid JSON"
+            url = value.get("url") if isinstance(value, dict) else value
+            if not isinstance(url, str):
+                return None, "no url field"
+        else:
+            row = next(csv.reader([line]), [])
+            if self.url_column is None:
+                header = [cell.strip().lower() for cell in row]
+                self.url_column = header.index("url") if "url" in header else 0
+                if "url" in header:
+                    return None, None
+            if self.url_column >= len(row):
+                return None, "no url column"
+            url = row[self.url_column]
+
+        url = url.strip()
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            return None, "not an http(s) URL"
+        return url, None
+
+
+async def import_batch(
+    session: AsyncSession,
+    items: List[Tuple[int, str]],
+    now: datetime,
+    seen: Optional[set] = None
+) -> List[dict]:
+    """
+    Track a batch of (line_number, url) pairs: one query finds products that
+    already exist (by canonical key), one multi-row INSERT adds placeholders
+    for the rest. Placeholders have no next_scrape_at, so the scheduler slots
+    them across the wheel and scrapes them at its normal, rate-limited pace.
+    `seen` collects product keys across batches, so repeats anywhere in one
+    import are reported as duplicates. Returns one result per item, in order.
+    The caller commits.
+    """
+    seen = set() if seen is None else seen
+    canonical = {line_number: canonicalize(url) for line_number, url in items}
+    keys = list({c.key for c in canonical.values()})
+
+    existing: Dict[str, int] = {}
+    if keys:
+        result = await session.execute(
+            select(Product.product_key, Product.id).where(Product.product_key.in_(keys))
+        )
+        existing = dict(result.all())
+
+    new_rows: Dict[str, dict] = {}
+    for line_number, url in items:
+        c = canonical[line_number]
+        if c.key not in existing and c.key not in new_rows:
+            new_rows[c.key] = {
+                "url": c.url,
+                "product_key": c.key,
+                "name": PLACEHOLDER_NAME,
+                "current_price": 0.0,
+                "currency": "INR",
+                "platform": detect_platform(c.url),
+                "is_available": True,
+                "created_at": now,
+                "updated_at": now
+            }
+
+    created: Dict[str, int] = {}
+    if new_rows:
+        result = await session.execute(
+            insert(Product)
+            .values(list(new_rows.values()))
+            .on_conflict_do_nothing()  # Raced in since the lookup: reported as existing
+            .returning(Product.product_key, Product.id)
+        )
+        created = dict(result.all())
+        raced = [key for key in new_rows if key not in created]
+        if raced:
+            result = await session.execute(
+                select(Product.product_key, Product.id).where(Product.product_key.in_(raced))
+            )
+            existing.update(result.all())
+
+    results = []
+    for line_number, url in items:
+        key = canonical[line_number].key
+        if key in seen:
+            status = STATUS_DUPLICATE
+        elif key in created:
+            status = STATUS_CREATED
+        else:
+            status = STATUS_EXISTS
+        seen.add(key)
+        results.append({
+            "line": line_number,
+            "url": url,
+            "status": status,
+            "product_id": created.get(key) or existing.get(key),
+            "product_key": key
+        })
+    return results
@@ -18,7 +18,7 @@ class NotificationService:
             print("⚠️ Telegram not configured. Skipping notification.")
             return False
             
-        url = f"https://api.telegram.org/bot{token}/sendMessage"
+        url = f"{settings.TELEGRAM_API_BASE}/bot{token}/sendMessage"
         payload = {
             "chat_id": target_chat_id,
             "text": message,
@@ -33,6 +33,38 @@ class NotificationService:
             print(f"❌ Failed to send Telegram message: {e}")
             return False
 
+    @staticmethod
+    def format_triggered_alert(alert_data: dict) -> str:
+        """Format the message for a fired alert according to its rule."""
+        rule_type = alert_data.get("rule_type", "target_price")
+        product_name = alert_data.get("product_name", "Product")
+        current_price = alert_data["current_price"]
+        url = alert_data.get("product_url", "")
+        
+        if rule_type == "target_price":
+            return NotificationService.format_alert_message(
+                product_name, current_price, alert_data["target_price"], url
+            )
+        if rule_type == "percent_below_average":
+            headline = "Below Average Price!"
+            detail = (f"📉 {alert_data['rule_percent']:g}% under the {alert_data['rule_window_days']}-day "
+                      f"average of ₹{alert_data['average_price']:,.2f}")
+        elif rule_type == "new_low":
+            headline = "New Lowest Price!"
+            detail = (f"📉 Lowest in {alert_data['rule_window_days']} days "
+                      f"(previous low ₹{alert_data['previous_low']:,.2f})")
+        else:
+            headline = "Back in Stock!"
+            detail = "✅ Available again"
+        
+        return (
+            f"🎯 <b>{headline}</b>\n\n"
+            f"📦 <b>{product_name}</b>\n"
+            f"💰 Price: <b>₹{current_price:,.2f}</b>\n"
+            f"{detail}\n\n"
+            f"<a href='{url}'>👉 Buy Now</a>"
+        )
+
     @staticmethod
     def format_alert_message(product_name: str, current_price: float, target_price: float, url: str) -> str:
         """Format the alert message with HTML."""
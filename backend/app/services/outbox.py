@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import select, update, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.product import NotificationOutbox, OutboxStatus
+
+
+def dedup_key(alert: dict, triggered_at: datetime) -> str:
+    """One delivery per alert trigger, however often the write is retried."""
+    return f"alert:{alert['alert_id']}:{triggered_at.isoformat()}"
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the Nth failed attempt, capped."""
+    seconds = settings.OUTBOX_BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.OUTBOX_BACKOFF_MAX_SECONDS))
+
+
+async def enqueue_notifications(session: AsyncSession, alerts: List[dict], triggered_at: datetime) -> int:
+    """
+    Queue triggered alerts for delivery in the caller's transaction (the one
+    that set triggered_at). Duplicate dedup keys are ignored. The caller commits.
+    """
+    if not alerts:
+        return 0
+    result = await session.execute(
+        insert(NotificationOutbox)
+        .values([
+            {
+                "dedup_key": dedup_key(alert, triggered_at),
+                "alert_id": alert["alert_id"],
+                "contact_method": alert["contact_method"],
+                "contact_value": alert["contact_value"],
+                "payload": alert,
+                "status": OutboxStatus.PENDING.value,
+                "attempts": 0,
+                "next_attempt_at": triggered_at,
+                "created_at": triggered_at
+            }
+            for alert in alerts
+        ])
+        .on_conflict_do_nothing(index_elements=["dedup_key"])
+    )
+    return result.rowcount
+
+
+async def claim_notifications(session: AsyncSession, now: datetime, limit: int) -> List[Tuple[int, dict, int]]:
+    """
+    Claim up to `limit` due rows as (id, payload, attempts), oldest first.
+    Claimed rows are leased for OUTBOX_SEND_LEASE_SECONDS: if the drainer dies
+    mid-send they become due again. SKIP LOCKED lets several drainers run at once.
+    """
+    due = (
+        select(NotificationOutbox.id)
+        .where(NotificationOutbox.status.in_([OutboxStatus.PENDING.value, OutboxStatus.SENDING.value]))
+        .where(NotificationOutbox.next_attempt_at <= now)
+        .order_by(NotificationOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(due))
+        .values(
+            status=OutboxStatus.SENDING.value,
+            attempts=NotificationOutbox.attempts + 1,
+            next_attempt_at=now + timedelta(seconds=settings.OUTBOX_SEND_LEASE_SECONDS)
+        )
+        .returning(NotificationOutbox.id, NotificationOutbox.payload, NotificationOutbox.attempts)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def record_deliveries(session: AsyncSession, deliveries: List[Tuple[int, int, dict]], now: datetime):
+    """
+    Store dispatcher results for claimed rows: (id, attempts, result).
+    Failures are retried with backoff until OUTBOX_MAX_ATTEMPTS or a permanent
+    error. The caller commits.
+    """
+    rows = []
+    for row_id, attempts, result in deliveries:
+        if result["success"]:
+            rows.append({"id": row_id, "status": OutboxStatus.SENT.value, "sent_at": now, "last_error": None})
+        elif result["retryable"] and attempts < settings.OUTBOX_MAX_ATTEMPTS:
+            rows.append({
+                "id": row_id,
+                "status": OutboxStatus.PENDING.value,
+                "next_attempt_at": now + backoff_delay(attempts),
+                "last_error": result["error"]
+            })
+        else:
+            rows.append({"id": row_id, "status": OutboxStatus.FAILED.value, "last_error": result["error"]})
+    if rows:
+        # ORM bulk UPDATE by primary key
+        await session.execute(update(NotificationOutbox), rows)
+
+
+async def outbox_stats(session: AsyncSession, window_hours: int = 24) -> dict:
+    """Row counts by status, plus delivery latency and attempts over the window."""
+    counts = await session.execute(
+        select(NotificationOutbox.status, func.count()).group_by(NotificationOutbox.status)
+    )
+    by_status = {status.value: 0 for status in OutboxStatus}
+    by_status.update(dict(counts.all()))
+
+    since = datetime.utcnow() - timedelta(hours=window_hours)
+    delivery = await session.execute(
+        text("""
+            SELECT
+                COUNT(*) AS sent,
+                percentile_cont(0.5) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM sent_at - created_at)) AS p50,
+                percentile_cont(0.95) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM sent_at - created_at)) AS p95,
+                AVG(attempts) AS avg_attempts
+            FROM notification_outbox
+            WHERE status = 'sent' AND sent_at >= CAST(:since AS TIMESTAMP)
+        """),
+        {"since": since}
+    )
+    sent, p50, p95, avg_attempts = delivery.one()
+
+    oldest = await session.execute(
+        select(func.min(NotificationOutbox.created_at))
+        .where(NotificationOutbox.status.in_([OutboxStatus.PENDING.value, OutboxStatus.SENDING.value]))
+    )
+    oldest_pending = oldest.scalar_one_or_none()
+
+    return {
+        "by_status": by_status,
+        "window_hours": window_hours,
+        "sent_in_window": sent,
+        "latency_p50_seconds": round(p50, 2) if p50 is not None else None,
+        "latency_p95_seconds": round(p95, 2) if p95 is not None else None,
+        "avg_attempts": round(float(avg_attempts), 2) if avg_attempts is not None else None,
+        "oldest_pending_seconds": (
+            round((datetime.utcnow() - oldest_pending).total_seconds(), 1) if oldest_pending else None
+        )
+    }
@@ -0,0 +1,139 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import select, update, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.product import PriceHistory
+
+
+def _same_run(run: PriceHistory, observation: dict) -> bool:
+    return (
+        run.price == observation["price"]
+        and run.currency == observation["currency"]
+        and run.is_available == observation["is_available"]
+    )
+
+
+async def record_prices(session: AsyncSession, observations: List[dict]):
+    """
+    Store price observations, one dict per product:
+    {product_id, price, currency, is_available, scraped_at}.
+
+    In "runs" mode an observation identical to the product's latest run only
+    extends that run (last_seen_at, sample_count); a new row is written only
+    when price, currency or availability changes. In "every_scrape" mode
+    every observation is its own row.
+
+    Uses one query to load the latest runs plus one bulk UPDATE and one bulk
+    INSERT, so it works the same for one product or a whole batch.
+    The caller commits.
+    """
+    if not observations:
+        return
+
+    latest = {}
+    if settings.PRICE_HISTORY_MODE == "runs":
+        result = await session.execute(
+            select(PriceHistory)
+            .where(PriceHistory.product_id.in_([o["product_id"] for o in observations]))
+            .distinct(PriceHistory.product_id)
+            .order_by(PriceHistory.product_id, PriceHistory.scraped_at.desc(), PriceHistory.id.desc())
+        )
+        latest = {run.product_id: run for run in result.scalars().all()}
+
+    extended = []
+    new_rows = []
+    for observation in observations:
+        run = latest.get(observation["product_id"])
+        if run is not None and _same_run(run, observation):
+            extended.append({
+                "id": run.id,
+                "last_seen_at": observation["scraped_at"],
+                "sample_count": run.sample_count + 1
+            })
+        else:
+            new_rows.append({
+                "product_id": observation["product_id"],
+                "price": observation["price"],
+                "currency": observation["currency"],
+                "is_available": observation["is_available"],
+                "scraped_at": observation["scraped_at"],
+                "last_seen_at": observation["scraped_at"],
+                "sample_count": 1
+            })
+
+    if extended:
+        await session.execute(update(PriceHistory), extended)
+    if new_rows:
+        await session.execute(insert(PriceHistory), new_rows)
+
+
+async def record_price(
+    session: AsyncSession,
+    product_id: int,
+    price: float,
+    currency: str,
+    is_available: bool,
+    scraped_at: Optional[datetime] = None
+):
+    """Store a single price observation (see record_prices)."""
+    await record_prices(session, [{
+        "product_id": product_id,
+        "price": price,
+        "currency": currency,
+        "is_available": is_available,
+        "scraped_at": scraped_at or datetime.utcnow()
+    }])
+
+
+# Collapses consecutive identical rows of the given products into runs:
+# the first row of each run absorbs the others' last_seen_at/sample_count,
+# then the rest are deleted. Safe to re-run on already compacted data.
+COMPACT_SQL = text("""
+WITH ordered AS (
+    SELECT id, product_id, scraped_at, last_seen_at, sample_count,
+           CASE WHEN (price, currency, is_available) IS NOT DISTINCT FROM
+                     (LAG(price) OVER w, LAG(currency) OVER w, LAG(is_available) OVER w)
+                THEN 0 ELSE 1 END AS new_run
+    FROM price_history
+    WHERE product_id = ANY(:product_ids)
+    WINDOW w AS (PARTITION BY product_id ORDER BY scraped_at, id)
+),
+numbered AS (
+    SELECT *, SUM(new_run) OVER (PARTITION BY product_id ORDER BY scraped_at, id) AS run_no
+    FROM ordered
+),
+marked AS (
+    SELECT *, FIRST_VALUE(id) OVER (PARTITION BY product_id, run_no ORDER BY scraped_at, id) AS first_id
+    FROM numbered
+),
+collapsed AS (
+    SELECT first_id, MAX(last_seen_at) AS last_seen_at, SUM(sample_count) AS sample_count
+    FROM marked
+    GROUP BY first_id
+    HAVING COUNT(*) > 1
+),
+updated AS (
+    UPDATE price_history ph
+    SET last_seen_at = c.last_seen_at, sample_count = c.sample_count
+    FROM collapsed c
+    WHERE ph.id = c.first_id
+    RETURNING ph.id
+),
+deleted AS (
+    DELETE FROM price_history ph
+    USING marked m
+    WHERE ph.id = m.id AND m.id <> m.first_id
+    RETURNING ph.id
+)
+SELECT COUNT(*) FROM deleted
+""")
+
+
+async def compact_price_history(session: AsyncSession, product_ids: List[int]) -> int:
+    """Run-length compact existing history for these products. Returns rows removed."""
+    result = await session.execute(COMPACT_SQL, {"product_ids": product_ids})
+    removed = result.scalar_one()
+    await session.commit()
+    return removed
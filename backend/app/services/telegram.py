@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.scraper.rate_limiter import rate_limiter
+from app.services.notification import NotificationService
+
+# Telegram rejects messages longer than this
+MAX_MESSAGE_LENGTH = 4096
+
+# One pooled client per event loop (httpx connections can't cross loops)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_telegram_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            base_url=settings.TELEGRAM_API_BASE,
+            timeout=settings.TELEGRAM_TIMEOUT,
+            limits=httpx.Limits(max_connections=settings.TELEGRAM_MAX_CONCURRENCY)
+        )
+        _clients[loop] = client
+    return client
+
+
+def resolve_chat_id(contact_value: Optional[str]) -> Optional[str]:
+    """The alert's own chat, or the bot's default chat."""
+    if not contact_value or contact_value == "default":
+        return settings.TELEGRAM_CHAT_ID
+    return contact_value
+
+
+def build_digest(alerts: List[dict]) -> List[Tuple[str, int]]:
+    """
+    One message for a single alert; otherwise a digest of all of them, split
+    on alert boundaries so no message exceeds Telegram's length limit.
+    Returns (message, number of alerts it carries) in alert order.
+    """
+    if len(alerts) == 1:
+        return [(NotificationService.format_triggered_alert(alerts[0]), 1)]
+
+    header = f"🔔 <b>{len(alerts)} alerts fired</b>\n\n"
+    separator = "\n\n➖➖➖\n\n"
+    messages = []
+    current, count = header, 0
+    for alert in alerts:
+        block = NotificationService.format_triggered_alert(alert)
+        if count and len(current) + len(separator) + len(block) > MAX_MESSAGE_LENGTH:
+            messages.append((current, count))
+            current, count = "", 0
+        current += (separator if count else "") + block
+        count += 1
+    messages.append((current, count))
+    return messages
+
+
+class TelegramDispatcher:
+    """
+    Sends triggered alerts over one pooled async HTTP client.
+
+    Alerts for the same chat are coalesced into a digest, and every send is
+    paced through two token buckets: one for the whole bot
+    (TELEGRAM_GLOBAL_RATE messages/s) and one per chat
+    (one message per TELEGRAM_CHAT_INTERVAL seconds). 429 responses are
+    retried after Telegram's retry_after; network and 5xx errors back off
+    exponentially.
+    """
+
+    def __init__(self, limiter=None):
+        # Redis-backed buckets are shared by every worker (the limit is per bot)
+        self.limiter = limiter or rate_limiter
+
+    async def dispatch(self, alerts: List[dict]) -> List[dict]:
+        """
+        Send a batch of triggered alerts. Returns one result per alert, in
+        input order: {alert_id, chat_id, success, error, retryable}.
+        """
+        token = settings.TELEGRAM_BOT_TOKEN
+        by_chat: "OrderedDict[str, List[int]]" = OrderedDict()
+        results: List[Optional[dict]] = [None] * len(alerts)
+        for index, alert in enumerate(alerts):
+            chat_id = resolve_chat_id(alert.get("contact_value"))
+            if alert.get("contact_method") != "telegram":
+                results[index] = _result(alert, chat_id, "method_not_supported", retryable=False)
+            elif not token or not chat_id:
+                results[index] = _result(alert, chat_id, "telegram_not_configured", retryable=True)
+            else:
+                by_chat.setdefault(chat_id, []).append(index)
+
+        if not by_chat:
+            return results
+
+        semaphore = asyncio.Semaphore(settings.TELEGRAM_MAX_CONCURRENCY)
+
+        async def send_chat(chat_id: str, indexes: List[int]):
+            # Each digest part settles only its own alerts, so a retry never
+            # resends parts that were delivered. Parts after a failure aren't
+            # attempted and stay retryable.
+            async with semaphore:
+                start, failed = 0, False
+                for message, count in build_digest([alerts[index] for index in indexes]):
+                    if failed:
+                        error, retryable = "not sent: an earlier digest part failed", True
+                    else:
+                        error, retryable = await self._send(token, chat_id, message)
+                        failed = error is not None
+                    for index in indexes[start:start + count]:
+                        results[index] = _result(alerts[index], chat_id, error, retryable)
+                    start += count
+
+        await asyncio.gather(*[send_chat(chat_id, indexes) for chat_id, indexes in by_chat.items()])
+
+        sent = sum(1 for result in results if result["success"])
+        print(f"[Telegram] {sent}/{len(alerts)} alerts delivered in {len(by_chat)} chat(s)")
+        return results
+
+    async def _send(self, token: str, chat_id: str, message: str) -> Tuple[Optional[str], bool]:
+        """Send one message. Returns (error, retryable); error is None on success."""
+        client = get_telegram_client()
+        payload = {"chat_id": chat_id, "text": message, "parse_mode": "HTML"}
+        error = None
+        for attempt in range(settings.TELEGRAM_MAX_RETRIES + 1):
+            await self.limiter.acquire_bucket(
+                f"telegram:chat:{chat_id}", 1 / settings.TELEGRAM_CHAT_INTERVAL, 1
+            )
+            await self.limiter.acquire_bucket(
+                "telegram:global", settings.TELEGRAM_GLOBAL_RATE, settings.TELEGRAM_GLOBAL_RATE
+            )
+            try:
+                response = await client.post(f"/bot{token}/sendMessage", json=payload)
+            except httpx.HTTPError as e:
+                error = f"network: {e}"
+                await asyncio.sleep(0.5 * 2 ** attempt)
+                continue
+
+            if response.status_code == 200:
+                return None, False
+            if response.status_code == 429:
+                retry_after = _retry_after(response)
+                error = f"rate limited (retry after {retry_after}s)"
+                logging.warning(f"[Telegram] 429 for chat {chat_id}, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+                continue
+            if response.status_code >= 500:
+                error = f"server error {response.status_code}"
+                await asyncio.sleep(0.5 * 2 ** attempt)
+                continue
+            # Bad chat id, bot blocked, malformed message: retrying won't help
+            return f"rejected {response.status_code}: {response.text[:200]}", False
+
+        print(f"❌ Failed to send Telegram message to {chat_id}: {error}")
+        return error, True
+
+
+def _result(alert: dict, chat_id: Optional[str], error: Optional[str], retryable: bool) -> dict:
+    return {
+        "alert_id": alert.get("alert_id"),
+        "chat_id": chat_id,
+        "success": error is None,
+        "error": error,
+        "retryable": error is not None and retryable
+    }
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return float(response.json().get("parameters", {}).get("retry_after", 1))
+    except ValueError:
+        return 1.0
+
+
+telegram_dispatcher = TelegramDispatcher()
@@ -0,0 +1,115 @@
+import json
+import time
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from uuid import uuid4
+
+from app.core.config import settings
+from app.db.redis import get_redis
+
+# Stages in the order a job moves through them
+STAGE_QUEUED = "queued"
+STAGE_NAVIGATING = "navigating"
+STAGE_EXTRACTED = "extracted"
+STAGE_SAVED = "saved"
+STAGE_FAILED = "failed"
+TERMINAL_STAGES = (STAGE_SAVED, STAGE_FAILED)
+
+
+class TrackJobs:
+    """
+    Progress of "track this URL" jobs, kept in Redis so the API process can
+    report on scrapes running in the worker.
+
+    Each job is one JSON document (expiring after TRACK_JOB_TTL_SECONDS);
+    every update is also published on the job's channel for SSE listeners.
+    """
+
+    KEY_PREFIX = "trackjob:"
+    PRODUCT_KEY_PREFIX = "trackjob:key:"
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}:events"
+
+    async def create(self, url: str, stage: str = STAGE_QUEUED, **fields) -> dict:
+        job = {
+            "job_id": str(uuid4()),
+            "url": url,
+            "stage": stage,
+            "product_id": None,
+            "error": None,
+            "created_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.utcnow().isoformat(),
+            **fields
+        }
+        await get_redis().set(self._key(job["job_id"]), json.dumps(job), ex=settings.TRACK_JOB_TTL_SECONDS)
+        return job
+
+    async def claim(self, product_key: str, job_id: str) -> str:
+        """
+        Make `job_id` the job tracking `product_key`, unless another job
+        already is. Returns the id of the job that owns the product, so
+        concurrent submissions of one product share a single scrape.
+        """
+        redis = get_redis()
+        key = f"{self.PRODUCT_KEY_PREFIX}{product_key}"
+        if await redis.set(key, job_id, nx=True, ex=settings.TRACK_KEY_CLAIM_SECONDS):
+            return job_id
+        return await redis.get(key) or job_id
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raw = await get_redis().get(self._key(job_id))
+        return json.loads(raw) if raw else None
+
+    async def update(self, job_id: str, stage: str, **fields) -> Optional[dict]:
+        """Move a job to `stage` and notify listeners. Only the worker running the job writes it."""
+        job = await self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields, stage=stage, updated_at=datetime.utcnow().isoformat())
+        payload = json.dumps(job)
+        redis = get_redis()
+        pipe = redis.pipeline(transaction=True)
+        pipe.set(self._key(job_id), payload, ex=settings.TRACK_JOB_TTL_SECONDS)
+        pipe.publish(self._channel(job_id), payload)
+        if stage in TERMINAL_STAGES and job.get("product_key"):
+            # Later submissions find the saved product (or retry a failure)
+            pipe.delete(f"{self.PRODUCT_KEY_PREFIX}{job['product_key']}")
+        await pipe.execute()
+        return job
+
+    async def events(self, job_id: str) -> AsyncIterator[Optional[dict]]:
+        """
+        Yield the job's current state, then every update until it finishes.
+        Yields None every TRACK_EVENTS_KEEPALIVE_SECONDS without news, so
+        the caller can keep the connection alive.
+        """
+        pubsub = get_redis().pubsub()
+        # Subscribe before reading the state so no update can slip in between
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            yield job
+
+            deadline = time.monotonic() + settings.TRACK_JOB_TTL_SECONDS
+            while job["stage"] not in TERMINAL_STAGES and time.monotonic() < deadline:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=settings.TRACK_EVENTS_KEEPALIVE_SECONDS
+                )
+                if message is None:
+                    yield None
+                    continue
+                job = json.loads(message["data"])
+                yield job
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.reset()
+
+
+track_jobs = TrackJobs()
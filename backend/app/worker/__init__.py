@@ -1,4 +1,4 @@
 from app.worker.celery_app import celery_app
-from app.worker.tasks import scrape_product, check_all_prices, send_notification
+from app.worker.tasks import track_product, scrape_product, scrape_batch, release_due_scrapes, check_all_prices, send_notification, drain_outbox
 
-__all__ = ["celery_app", "scrape_product", "check_all_prices", "send_notification"]
+__all__ = ["celery_app", "track_product", "scrape_product", "scrape_batch", "release_due_scrapes", "check_all_prices", "send_notification", "drain_outbox"]
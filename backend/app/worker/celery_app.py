@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Queue
 from app.core.config import settings
 import sys
 import asyncio
@@ -16,6 +17,19 @@ celery_app = Celery(
 
 celery_app.autodiscover_tasks(['app.worker'])
 
+# Queues in priority order: a user clicking refresh never waits behind the
+# sweep, and products close to an alert target jump ahead of routine scrapes.
+QUEUE_INTERACTIVE = "interactive"
+QUEUE_ALERTS = "alerts"
+QUEUE_SWEEP = "sweep"
+# Scheduler ticks: milliseconds of DB work, so they share the interactive
+# worker (never stuck behind a sweep batch) without sitting in its queue
+QUEUE_SCHEDULE = "schedule"
+# Telegram delivery and alert-index upkeep: seconds of HTTP/DB work on their
+# own worker, so a notification never waits for a 15-minute scrape batch
+QUEUE_NOTIFY = "notify"
+QUEUES = [QUEUE_INTERACTIVE, QUEUE_SCHEDULE, QUEUE_NOTIFY, QUEUE_ALERTS, QUEUE_SWEEP]
+
 # Celery configuration
 celery_app.conf.update(
     task_serializer="json",
@@ -26,11 +40,48 @@ celery_app.conf.update(
     
     # Beat schedule for periodic tasks
     beat_schedule={
-        "check-all-prices-every-15-minutes": {
-            "task": "app.worker.tasks.check_all_prices",
-            "schedule": 15 * 60,  # 15 minutes in seconds
+        "release-due-scrapes": {
+            "task": "app.worker.tasks.release_due_scrapes",
+            "schedule": settings.SCHEDULER_TICK_SECONDS,
+        },
+        "drain-outbox": {
+            "task": "app.worker.tasks.drain_outbox",
+            "schedule": settings.OUTBOX_DRAIN_SECONDS,
+        },
+        "rebuild-alert-index": {
+            "task": "app.worker.tasks.rebuild_alert_index",
+            "schedule": settings.ALERT_INDEX_REBUILD_MINUTES * 60,
         },
+        # Optional full sweep: one entry per partition so no single task walks the catalogue
+        **{
+            f"sweep-partition-{partition}": {
+                "task": "app.worker.tasks.check_all_prices",
+                "schedule": settings.SWEEP_BEAT_MINUTES * 60,
+                "args": (partition, settings.SWEEP_PARTITIONS),
+            }
+            for partition in range(settings.SWEEP_PARTITIONS)
+            if settings.SWEEP_BEAT_MINUTES > 0
+        },
+    },
+    
+    # Queues & routing: one worker runs -Q interactive,schedule, one -Q notify
+    # and another -Q alerts,sweep, so long scrape batches can't take every slot
+    # a manual refresh or an outbox drain needs
+    task_queues=[Queue(name) for name in QUEUES],
+    task_default_queue=QUEUE_SWEEP,
+    task_routes={
+        "app.worker.tasks.scrape_product": {"queue": QUEUE_INTERACTIVE},
+        "app.worker.tasks.track_product": {"queue": QUEUE_INTERACTIVE},
+        "app.worker.tasks.release_due_scrapes": {"queue": QUEUE_SCHEDULE},
+        "app.worker.tasks.send_notification": {"queue": QUEUE_NOTIFY},
+        "app.worker.tasks.drain_outbox": {"queue": QUEUE_NOTIFY},
+        "app.worker.tasks.rebuild_alert_index": {"queue": QUEUE_NOTIFY},
+        "app.worker.tasks.scrape_batch": {"queue": QUEUE_SWEEP},
+        "app.worker.tasks.check_all_prices": {"queue": QUEUE_SWEEP},
+        "app.worker.tasks.compact_price_history": {"queue": QUEUE_SWEEP},
     },
+    # Drain queues strictly in the order the worker lists them
+    broker_transport_options={"queue_order_strategy": "priority"},
     
     # Task settings
     task_track_started=True,
@@ -0,0 +1,102 @@
+import json
+import logging
+from datetime import datetime
+from typing import Optional, Dict, List
+
+from app.core.config import settings
+from app.db.redis import get_redis
+
+LEASE_PREFIX = "scrape:lease:"
+FRESH_PREFIX = "scrape:fresh:"
+
+# Only the owner may release a lease (it may have expired and been re-taken)
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Dedup is an optimisation: if Redis is unreachable, scrape anyway.
+
+
+async def try_lease(product_id: int, owner: str) -> Optional[str]:
+    """
+    Take the in-flight lease for a product.
+    Returns None if `owner` now holds it, otherwise the current holder's id
+    (a Celery task id callers can attach to).
+    """
+    try:
+        redis = get_redis()
+        key = f"{LEASE_PREFIX}{product_id}"
+        if await redis.set(key, owner, nx=True, ex=settings.SCRAPE_LEASE_SECONDS):
+            return None
+        holder = await redis.get(key)
+        return None if holder in (None, owner) else holder
+    except Exception as e:
+        logging.warning(f"[Dedup] Lease check skipped: {e}")
+        return None
+
+
+async def lease_many(product_ids: List[int], owner: str) -> List[int]:
+    """Take leases for a batch in one round trip. Returns the ids now held by `owner`."""
+    try:
+        redis = get_redis()
+        pipe = redis.pipeline(transaction=False)
+        for product_id in product_ids:
+            pipe.set(f"{LEASE_PREFIX}{product_id}", owner, nx=True, ex=settings.SCRAPE_LEASE_SECONDS)
+        acquired = await pipe.execute()
+        return [product_id for product_id, ok in zip(product_ids, acquired) if ok]
+    except Exception as e:
+        logging.warning(f"[Dedup] Lease check skipped: {e}")
+        return list(product_ids)
+
+
+async def release_leases(product_ids: List[int], owner: str):
+    try:
+        redis = get_redis()
+        pipe = redis.pipeline(transaction=False)
+        for product_id in product_ids:
+            pipe.eval(RELEASE_SCRIPT, 1, f"{LEASE_PREFIX}{product_id}", owner)
+        await pipe.execute()
+    except Exception as e:
+        logging.warning(f"[Dedup] Lease release failed (will expire): {e}")
+
+
+async def mark_fresh(results: Dict[int, dict]):
+    """Remember just-scraped results for SCRAPE_FRESHNESS_SECONDS."""
+    if not results or settings.SCRAPE_FRESHNESS_SECONDS <= 0:
+        return
+    scraped_at = datetime.utcnow().isoformat()
+    try:
+        redis = get_redis()
+        pipe = redis.pipeline(transaction=False)
+        for product_id, data in results.items():
+            payload = {
+                "title": data.get("title"),
+                "price": data["price"],
+                "currency": data["currency"],
+                "availability": data["availability"],
+                "image_url": data.get("image_url"),
+                "scraped_at": scraped_at
+            }
+            pipe.set(f"{FRESH_PREFIX}{product_id}", json.dumps(payload), ex=settings.SCRAPE_FRESHNESS_SECONDS)
+        await pipe.execute()
+    except Exception as e:
+        logging.warning(f"[Dedup] Could not cache fresh results: {e}")
+
+
+async def fresh_results(product_ids: List[int]) -> Dict[int, dict]:
+    """Results scraped within the freshness window, keyed by product id."""
+    if not product_ids or settings.SCRAPE_FRESHNESS_SECONDS <= 0:
+        return {}
+    try:
+        values = await get_redis().mget([f"{FRESH_PREFIX}{product_id}" for product_id in product_ids])
+    except Exception as e:
+        logging.warning(f"[Dedup] Freshness check skipped: {e}")
+        return {}
+    return {
+        product_id: json.loads(value)
+        for product_id, value in zip(product_ids, values)
+        if value
+    }
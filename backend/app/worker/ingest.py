@@ -0,0 +1,241 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.alert_index import alert_index
+from app.services.alert_rules import evaluate_alerts
+from app.services.bulk_import import PLACEHOLDER_NAME
+from app.services.outbox import enqueue_notifications
+from app.services.price_history import record_prices
+from app.worker.scheduling import compute_next_scrapes
+
+# One statement updates every product in the batch; rows that were deleted
+# mid-scrape simply don't come back from RETURNING. `old` is read from the
+# statement's snapshot, so it returns availability from before the update.
+# Name and currency are only filled in while the product is still a bulk
+# import placeholder, whichever path scrapes it first. A scrape without a
+# price (unavailable page) keeps the last known price; RETURNING gives the
+# price the product ends up with.
+UPDATE_PRODUCTS_SQL = text("""
+    UPDATE products AS p
+    SET current_price = CASE WHEN v.price > 0 THEN v.price ELSE p.current_price END,
+        name = CASE WHEN p.name = :placeholder THEN COALESCE(v.name, p.name) ELSE p.name END,
+        currency = CASE WHEN p.name = :placeholder THEN COALESCE(v.currency, p.currency) ELSE p.currency END,
+        is_available = v.is_available,
+        image_url = COALESCE(v.image_url, p.image_url),
+        updated_at = CAST(:now AS TIMESTAMP),
+        last_scraped_at = CAST(:now AS TIMESTAMP)
+    FROM unnest(
+        CAST(:ids AS INTEGER[]),
+        CAST(:prices AS DOUBLE PRECISION[]),
+        CAST(:available AS BOOLEAN[]),
+        CAST(:images AS VARCHAR[]),
+        CAST(:names AS VARCHAR[]),
+        CAST(:currencies AS VARCHAR[])
+    ) AS v(id, price, is_available, image_url, name, currency),
+    products AS old
+    WHERE p.id = v.id
+      AND old.id = p.id
+    RETURNING p.id, old.is_available, p.current_price
+""")
+
+UPDATE_NEXT_SCRAPE_SQL = text("""
+    UPDATE products AS p
+    SET next_scrape_at = v.next_scrape_at
+    FROM unnest(CAST(:ids AS INTEGER[]), CAST(:next AS TIMESTAMP[])) AS v(id, next_scrape_at)
+    WHERE p.id = v.id
+""")
+
+async def write_scrape_results(
+    session: AsyncSession,
+    results: Dict[int, dict],
+    now: Optional[datetime] = None
+) -> Dict[int, dict]:
+    """
+    Write a batch of scrape results with set-based statements: one UPDATE for
+    the products, one bulk write for price history, one UPDATE for schedules
+    and one set-based evaluation of every alert rule.
+
+    Results with no price (price <= 0, only accepted for unavailable
+    products) keep the product's last known price everywhere downstream; no
+    history row is written until a price has ever been seen.
+
+    Returns {product_id: {"price", "triggered_alerts"}} for products that
+    still exist. The caller commits.
+    """
+    if not results:
+        return {}
+    now = now or datetime.utcnow()
+    ids = list(results.keys())
+
+    updated = await session.execute(UPDATE_PRODUCTS_SQL, {
+        "now": now,
+        "placeholder": PLACEHOLDER_NAME,
+        "ids": ids,
+        "prices": [results[product_id]["price"] for product_id in ids],
+        "available": [results[product_id]["availability"] for product_id in ids],
+        "images": [results[product_id].get("image_url") for product_id in ids],
+        "names": [results[product_id].get("title") for product_id in ids],
+        "currencies": [results[product_id].get("currency") for product_id in ids]
+    })
+    rows = updated.all()
+    was_available = {product_id: available for product_id, available, _ in rows}
+    prices = {product_id: price for product_id, _, price in rows}
+    existing = list(was_available.keys())
+    if not existing:
+        return {}
+
+    await record_prices(session, [
+        {
+            "product_id": product_id,
+            "price": prices[product_id],
+            "currency": results[product_id]["currency"],
+            "is_available": results[product_id]["availability"],
+            "scraped_at": now
+        }
+        for product_id in existing
+        if prices[product_id] > 0
+    ])
+
+    next_scrapes = await compute_next_scrapes(
+        session,
+        {product_id: (prices[product_id], results[product_id]["availability"]) for product_id in existing},
+        now
+    )
+    await session.execute(UPDATE_NEXT_SCRAPE_SQL, {
+        "ids": existing,
+        "next": [next_scrapes[product_id] for product_id in existing]
+    })
+
+    outcome = {
+        product_id: {"price": prices[product_id], "triggered_alerts": []}
+        for product_id in existing
+    }
+
+    # Most scrapes can't fire anything; only evaluate rules for those that might
+    candidates = await alert_index.candidates(prices)
+    if candidates is not None:
+        existing = [product_id for product_id in existing if product_id in candidates]
+    if not existing:
+        return outcome
+
+    triggered = await evaluate_alerts(session, {
+        product_id: {
+            "price": prices[product_id],
+            "is_available": results[product_id]["availability"],
+            "was_available": was_available[product_id]
+        }
+        for product_id in existing
+    }, now)
+    # Delivery is queued in this same transaction, so a fired alert is never lost
+    await enqueue_notifications(session, triggered, now)
+    for alert in triggered:
+        outcome[alert["product_id"]]["triggered_alerts"].append(alert)
+    return outcome
+
+
+async def forget_triggered(outcome: Dict[int, dict]):
+    """Drop alerts that just fired from the alert index (after commit)."""
+    await alert_index.remove(
+        (alert["alert_id"], product_id)
+        for product_id, result in outcome.items()
+        for alert in result["triggered_alerts"]
+    )
+
+
+class IngestBuffer:
+    """
+    Collects scrape results as they complete and writes them in batches of
+    up to INGEST_BATCH_ROWS, or after INGEST_FLUSH_SECONDS, whichever comes
+    first. `submit` resolves once the row's batch has been committed.
+
+    Scope: one buffer per worker process, fed by the scrape_batch running in
+    it. At most SCRAPE_CONCURRENCY_PER_PLATFORM pages per platform are in
+    flight there, so results arrive a few per second and a flush carries
+    roughly INGEST_FLUSH_SECONDS worth of them, never more than one batch
+    (SCRAPE_BATCH_SIZE). It saves round trips per batch; it does not pool
+    writes across processes.
+
+    Bound to the event loop it is first used on (the worker's persistent loop).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_rows: Optional[int] = None,
+        max_wait: Optional[float] = None
+    ):
+        self.session_factory = session_factory
+        self.max_rows = max_rows or settings.INGEST_BATCH_ROWS
+        self.max_wait = max_wait if max_wait is not None else settings.INGEST_FLUSH_SECONDS
+        self._pending: List[Tuple[int, dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        # The loop only keeps weak references to tasks; hold flushes until done
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def submit(self, product_id: int, data: dict) -> Optional[dict]:
+        """Queue one result; returns its write outcome (None if the product is gone)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((product_id, data, future))
+
+        if len(self._pending) >= self.max_rows:
+            self._cancel_timer()
+            self._start_flush(loop)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._start_flush, loop)
+
+        return await future
+
+    def _start_flush(self, loop: asyncio.AbstractEventLoop):
+        task = loop.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def flush(self):
+        """Write everything pending now."""
+        self._cancel_timer()
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        # Later results for the same product win; every submitter still gets an answer
+        results = {product_id: data for product_id, data, _ in batch}
+
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        try:
+            async with self._write_lock:
+                async with self.session_factory() as session:
+                    outcome = await write_scrape_results(session, results)
+                    await session.commit()
+                await forget_triggered(outcome)
+        except Exception as e:
+            logging.error(f"[Ingest] Failed to write {len(results)} results: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        print(f"[Ingest] Wrote {len(outcome)} results in one batch")
+        alerts_sent = set()
+        for product_id, _, future in batch:
+            if future.done():
+                continue
+            result = outcome.get(product_id)
+            # Hand each triggered alert to only one submitter
+            if result is not None and product_id in alerts_sent:
+                result = {**result, "triggered_alerts": []}
+            alerts_sent.add(product_id)
+            future.set_result(result)
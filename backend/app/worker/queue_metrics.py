@@ -0,0 +1,71 @@
+import time
+from typing import Optional
+import redis
+from celery.signals import before_task_publish, task_prerun
+
+from app.core.config import settings
+from app.worker.celery_app import QUEUES
+
+LATENCY_KEY_PREFIX = "queue_latency:"
+LATENCY_SAMPLES = 500  # Recent samples kept per queue
+
+_client: Optional[redis.Redis] = None
+
+
+def _redis() -> redis.Redis:
+    # Signal handlers run in sync Celery/publisher code, so use the sync client
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+@before_task_publish.connect
+def _stamp_enqueue_time(headers=None, **kwargs):
+    """Stamp every published task so the worker can measure queue wait."""
+    if headers is not None:
+        headers.setdefault("enqueued_at", time.time())
+
+
+@task_prerun.connect
+def _record_queue_latency(task=None, **kwargs):
+    """Record how long the task waited in its queue before a worker picked it up."""
+    enqueued_at = getattr(task.request, "enqueued_at", None)
+    queue = (task.request.delivery_info or {}).get("routing_key")
+    if not enqueued_at or not queue:
+        return
+    wait_ms = (time.time() - float(enqueued_at)) * 1000
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.lpush(f"{LATENCY_KEY_PREFIX}{queue}", f"{wait_ms:.0f}")
+        pipe.ltrim(f"{LATENCY_KEY_PREFIX}{queue}", 0, LATENCY_SAMPLES - 1)
+        pipe.execute()
+    except redis.RedisError:
+        pass  # Metrics must never fail a task
+
+
+def _percentile(samples: list, pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def get_queue_stats(redis_client) -> dict:
+    """Depth and recent wait-time percentiles (ms) for each scrape queue."""
+    stats = {}
+    for queue in QUEUES:
+        depth = await redis_client.llen(queue)
+        raw = await redis_client.lrange(f"{LATENCY_KEY_PREFIX}{queue}", 0, -1)
+        samples = [float(value) for value in raw]
+        stats[queue] = {
+            "depth": depth,
+            "latency_ms": {
+                "last": samples[0] if samples else None,
+                "p50": _percentile(samples, 50),
+                "p95": _percentile(samples, 95),
+                "max": max(samples) if samples else None,
+                "samples": len(samples)
+            }
+        }
+    return stats
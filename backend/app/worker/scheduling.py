@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, func, update, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.product import Product, PriceHistory, Alert
+
+# Knuth multiplicative hash: spreads sequential ids evenly over the wheel
+_HASH_MULTIPLIER = 2654435761
+_HASH_MODULUS = 2 ** 32
+
+
+def wheel_slot(product_id: int) -> int:
+    """Stable offset (seconds) of a product within the scheduling wheel."""
+    return (product_id * _HASH_MULTIPLIER) % _HASH_MODULUS % settings.SCHEDULER_WHEEL_SECONDS
+
+
+def align_to_slot(product_id: int, when: datetime) -> datetime:
+    """
+    First moment at or after `when` that falls on the product's wheel slot.
+    Adds at most one wheel revolution, and keeps products with equal
+    intervals spread evenly instead of bunching where they were scraped.
+    """
+    wheel = settings.SCHEDULER_WHEEL_SECONDS
+    position = int(when.timestamp()) % wheel
+    delay = (wheel_slot(product_id) - position) % wheel
+    return when.replace(microsecond=0) + timedelta(seconds=delay)
+
+
+def compute_scrape_interval(
+    changes_per_day: float,
+    alert_gap_pct: Optional[float],
+    is_available: bool
+) -> timedelta:
+    """
+    How long until a product should be scraped again.
+    
+    - Volatile products (frequent price changes) are scraped more often
+    - Products within a few percent of an active alert target drop to the minimum
+    - Unavailable products are checked half as often (restocks are rarer than price moves)
+    """
+    minimum = settings.SCRAPE_INTERVAL_MIN_MINUTES
+    base = settings.SCRAPE_INTERVAL_BASE_MINUTES
+    near = settings.SCRAPE_ALERT_NEAR_PERCENT
+    
+    minutes = base / (1 + changes_per_day)
+    if not is_available:
+        minutes *= 2
+    
+    if alert_gap_pct is not None:
+        if alert_gap_pct <= near:
+            minutes = minimum
+        elif alert_gap_pct <= 4 * near:
+            # Ramp from the minimum at `near`% to the base interval at 4x `near`%
+            ramp = minimum + (base - minimum) * (alert_gap_pct - near) / (3 * near)
+            minutes = min(minutes, ramp)
+    
+    minutes = max(minimum, min(settings.SCRAPE_INTERVAL_MAX_MINUTES, minutes))
+    return timedelta(minutes=minutes)
+
+
+async def compute_next_scrapes(
+    session: AsyncSession,
+    observations: Dict[int, Tuple[float, bool]],
+    now: datetime
+) -> Dict[int, datetime]:
+    """
+    Next scrape time for each freshly scraped product.
+    `observations` maps product_id -> (current_price, is_available).
+    Two grouped queries cover the whole batch: volatility and nearest alert target.
+    """
+    product_ids = list(observations.keys())
+    window_days = settings.SCRAPE_VOLATILITY_WINDOW_DAYS
+    
+    # Distinct prices seen in the window: N prices means at least N-1 changes
+    volatility = await session.execute(
+        select(PriceHistory.product_id, func.count(func.distinct(PriceHistory.price)))
+        .where(PriceHistory.product_id.in_(product_ids))
+        .where(PriceHistory.last_seen_at >= now - timedelta(days=window_days))
+        .group_by(PriceHistory.product_id)
+    )
+    changes_per_day = {
+        product_id: max(distinct_prices - 1, 0) / window_days
+        for product_id, distinct_prices in volatility.all()
+    }
+    
+    # The highest active target is the one a falling price reaches first
+    targets = await session.execute(
+        select(Alert.product_id, func.max(Alert.target_price))
+        .where(Alert.product_id.in_(product_ids))
+        .where(Alert.is_active == True)
+        .where(Alert.triggered_at == None)
+        .group_by(Alert.product_id)
+    )
+    nearest_target = dict(targets.all())
+    
+    next_scrapes = {}
+    for product_id, (price, is_available) in observations.items():
+        gap_pct = None
+        target = nearest_target.get(product_id)
+        if target is not None and price > 0:
+            gap_pct = max((price - target) / price * 100, 0.0)
+        interval = compute_scrape_interval(
+            changes_per_day.get(product_id, 0.0), gap_pct, is_available
+        )
+        next_scrapes[product_id] = align_to_slot(product_id, now + interval)
+    return next_scrapes
+
+
+async def assign_initial_slots(session: AsyncSession, now: datetime) -> int:
+    """
+    Give never-scheduled products (next_scrape_at IS NULL) their slot in the
+    coming wheel revolution, so a bulk import or first deploy is spread out
+    instead of released at once. Same hash as wheel_slot, in SQL.
+    """
+    result = await session.execute(
+        text("""
+            UPDATE products
+            SET next_scrape_at = CAST(:now AS TIMESTAMP) + make_interval(secs => ((id::bigint * :multiplier) % :modulus) % :wheel)
+            WHERE next_scrape_at IS NULL
+        """),
+        {
+            "now": now,
+            "multiplier": _HASH_MULTIPLIER,
+            "modulus": _HASH_MODULUS,
+            "wheel": settings.SCHEDULER_WHEEL_SECONDS
+        }
+    )
+    return result.rowcount
+
+
+async def claim_due_products(session: AsyncSession, now: datetime, limit: int) -> list:
+    """
+    Atomically claim up to `limit` due products, oldest due first.
+    Claimed products are pushed SCRAPE_CLAIM_MINUTES ahead so the next tick
+    doesn't release them again; the scrape then sets the real next time.
+    SKIP LOCKED keeps overlapping ticks from claiming the same rows.
+    """
+    due = (
+        select(Product.id)
+        .where(Product.next_scrape_at <= now)
+        .order_by(Product.next_scrape_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(Product)
+        .where(Product.id.in_(due))
+        .values(next_scrape_at=now + timedelta(minutes=settings.SCRAPE_CLAIM_MINUTES))
+        .returning(Product.id)
+    )
+    return list(result.scalars().all())
+
+
+async def near_alert_products(session: AsyncSession, product_ids: list) -> set:
+    """Products whose current price is within SCRAPE_ALERT_NEAR_PERCENT of an active target."""
+    if not product_ids:
+        return set()
+    result = await session.execute(
+        select(Product.id)
+        .join(Alert, Alert.product_id == Product.id)
+        .where(Product.id.in_(product_ids))
+        .where(Alert.is_active == True)
+        .where(Alert.triggered_at == None)
+        .where(Alert.target_price >= Product.current_price * (1 - settings.SCRAPE_ALERT_NEAR_PERCENT / 100))
+        .distinct()
+    )
+    return set(result.scalars().all())
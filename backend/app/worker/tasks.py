@@ -1,149 +1,375 @@
-from typing import Optional
+from typing import AsyncIterator, Optional, List, Dict
 from datetime import datetime
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 import asyncio
 
-from app.worker.celery_app import celery_app
-from app.core.config import settings
-from app.models.product import Product, PriceHistory, Alert
-from app.scraper.factory import ScraperFactory
-from app.scraper.utils import get_stealth_context, apply_stealth, simulate_human_behavior
-from app.services.notification import NotificationService
+from celery.signals import worker_process_init, worker_process_shutdown
 
-from sqlalchemy.pool import NullPool
+from app.worker.celery_app import celery_app, QUEUE_ALERTS, QUEUE_SWEEP
+from app.worker import queue_metrics  # noqa: F401  (registers latency signals)
+from app.core.config import settings
+from app.models.product import Product, Platform
+from app.scraper.base import ScrapedProduct
+from app.scraper.browser_pool import BrowserPool
+from app.scraper.pipeline import ScrapePipeline
+from app.services.telegram import telegram_dispatcher
+from app.services.outbox import claim_notifications, record_deliveries
+from app.worker.dedup import try_lease, lease_many, release_leases, mark_fresh, fresh_results
+from app.worker.scheduling import assign_initial_slots, claim_due_products, near_alert_products
+from app.services.price_history import record_price, compact_price_history
+from app.services.track_jobs import track_jobs, STAGE_SAVED, STAGE_FAILED
+from app.scraper.factory import detect_platform
+from app.scraper.canonical import canonicalize
+from app.services.alert_index import alert_index
+from app.worker.ingest import IngestBuffer, write_scrape_results, forget_triggered
 
-# Create async engine for worker
-# Use NullPool to prevent connections from being tied to closed event loops in Celery tasks
+# Create async engine for worker.
+# Every task runs on one long-lived loop per worker process (see run_async),
+# so connections stay valid between tasks and can be pooled.
 worker_engine = create_async_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    poolclass=NullPool
+    pool_size=settings.WORKER_DB_POOL_SIZE,
+    max_overflow=settings.WORKER_DB_MAX_OVERFLOW,
+    pool_recycle=settings.WORKER_DB_POOL_RECYCLE,
+    pool_pre_ping=True
 )
 WorkerSessionLocal = sessionmaker(worker_engine, class_=AsyncSession, expire_on_commit=False)
 
+# Batches scrape results from concurrent scrapes into set-based writes
+ingest_buffer = IngestBuffer(WorkerSessionLocal)
+
+
+# Per-process runtime: one event loop shared by the DB pool, Redis client and
+# browser pool. asyncpg connections and Playwright objects are bound to the
+# loop they were created on, so everything must run on this one.
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_browser_pool: Optional[BrowserPool] = None
+
+
+def _ensure_runtime() -> asyncio.AbstractEventLoop:
+    global _worker_loop, _browser_pool
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _worker_loop
+
 
 def run_async(coro):
-    """Helper to run async code in sync Celery task."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    """Helper to run async code in sync Celery task, on the worker's persistent loop."""
+    return _ensure_runtime().run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _start_worker_runtime(**kwargs):
+    """Create the loop, reset the inherited DB pool and launch the browser once per process."""
+    # Never reuse connections opened in the parent before fork
+    worker_engine.sync_engine.dispose(close=False)
+    loop = _ensure_runtime()
     try:
-        return loop.run_until_complete(coro)
+        loop.run_until_complete(_browser_pool.start())
+    except Exception as e:
+        # Not fatal: the pool launches lazily on first scrape
+        print(f"[Worker] Browser pool failed to start: {e}")
+
+
+@worker_process_shutdown.connect
+def _stop_worker_runtime(**kwargs):
+    global _worker_loop, _browser_pool
+    if _worker_loop is None:
+        return
+    try:
+        if _browser_pool is not None:
+            _worker_loop.run_until_complete(_browser_pool.stop())
+        _worker_loop.run_until_complete(worker_engine.dispose())
     finally:
-        loop.close()
+        _worker_loop.close()
+        _worker_loop, _browser_pool = None, None
 
 
-async def _scrape_product_async(url: str) -> Optional[dict]:
-    """Async function to scrape a product."""
-    from playwright.async_api import async_playwright
-    
+async def _scrape_product_async(url: str, persist=None) -> Optional[dict]:
+    """
+    Async function to scrape a product through the single-navigation pipeline
+    on the pooled browser. `persist(product)` runs as the pipeline's last stage.
+    """
+    pipeline = ScrapePipeline(context_factory=_browser_pool.context, persist=persist)
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=["--disable-blink-features=AutomationControlled", "--no-sandbox"]
-            )
-            context = await get_stealth_context(browser)
-            page = await context.new_page()
-            await apply_stealth(page)
-            
-            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await simulate_human_behavior(page)
-            
-            scraper = ScraperFactory.get_scraper(url)
-            result = await scraper.scrape(page, url)
-            
-            await context.close()
-            await browser.close()
-            
-            return {
-                "title": result.title,
-                "price": result.price,
-                "currency": result.currency,
-                "availability": result.availability,
-                "image_url": result.image_url
-            }
+        outcome = await pipeline.run(url)
     except Exception as e:
         print(f"Error scraping {url}: {e}")
         return None
+    
+    result = outcome.product
+    print(f"[Scrape] {url} served via {result.source} in {outcome.total_ms:.0f} ms "
+          f"(~{outcome.bytes_saved // 1024} KB blocked)")
+    return {
+        "title": result.title,
+        "price": result.price,
+        "currency": result.currency,
+        "availability": result.availability,
+        "image_url": result.image_url,
+        "source": result.source,
+        "bytes_saved": outcome.bytes_saved,
+        "timings": outcome.timings,
+        "persisted": outcome.persisted
+    }
 
 
-async def _update_product_price_async(product_id: int, scraped_data: dict):
-    """Update product price in database."""
+async def _update_product_price_async(product_id: int, scraped_data: dict) -> Optional[dict]:
+    """
+    Update product price and check its alerts in a single transaction.
+    Returns {"price", "triggered_alerts"}, or None if the product is gone.
+    """
+    async with WorkerSessionLocal() as session:
+        outcome = await write_scrape_results(session, {product_id: scraped_data})
+        await session.commit()
+    await forget_triggered(outcome)
+    return outcome.get(product_id)
+
+
+async def _iter_product_ids_async(partition: int, partitions: int, page_size: int) -> AsyncIterator[List[int]]:
+    """
+    Yield a partition's product ids in pages, by keyset (id > last seen) so
+    every page is an index range scan and only one page is held at a time.
+    Each page uses its own short session; no cursor stays open between them.
+    """
+    last_id = 0
+    while True:
+        async with WorkerSessionLocal() as session:
+            result = await session.execute(
+                select(Product.id)
+                .where(Product.id > last_id)
+                .where(Product.id % partitions == partition)
+                .order_by(Product.id)
+                .limit(page_size)
+            )
+            page = list(result.scalars().all())
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]
+
+
+async def _sweep_partition_async(partition: int, partitions: int) -> dict:
+    """Queue scrape_batch chunks for one partition, page by page, over one broker connection."""
+    products = 0
+    batches = 0
+    batch_size = settings.SCRAPE_BATCH_SIZE
+    with celery_app.producer_or_acquire() as producer:
+        async for page in _iter_product_ids_async(partition, partitions, settings.SWEEP_PAGE_SIZE):
+            for i in range(0, len(page), batch_size):
+                scrape_batch.apply_async(args=[page[i:i + batch_size]], producer=producer)
+                batches += 1
+            products += len(page)
+    return {"products_count": products, "batches": batches}
+
+
+async def _release_due_products_async():
+    """
+    Slot unscheduled products, then claim this tick's share of due ones.
+    Returns (near_alert_ids, routine_ids).
+    """
+    now = datetime.utcnow()
+    async with WorkerSessionLocal() as session:
+        await assign_initial_slots(session, now)
+        product_ids = await claim_due_products(session, now, settings.SCHEDULER_MAX_PER_TICK)
+        near_alert = await near_alert_products(session, product_ids)
+        await session.commit()
+        return (
+            [product_id for product_id in product_ids if product_id in near_alert],
+            [product_id for product_id in product_ids if product_id not in near_alert]
+        )
+
+
+async def _get_products_by_ids_async(product_ids: List[int]):
+    """Get (id, url, platform) for a batch of products in one query."""
     async with WorkerSessionLocal() as session:
-        # Get product
         result = await session.execute(
-            select(Product).where(Product.id == product_id)
+            select(Product.id, Product.url, Product.platform)
+            .where(Product.id.in_(product_ids))
         )
-        product = result.scalar_one_or_none()
+        return result.all()
+
+
+async def _scrape_batch_async(product_ids: List[int], owner: str) -> dict:
+    """
+    Scrape a chunk of products concurrently on one loop and one browser.
+    Concurrency is bounded per platform so one slow site can't starve the rest.
+    Products scraped within the freshness window, or already being scraped
+    by another task, are skipped.
+    """
+    fresh = await fresh_results(product_ids)
+    leased = await lease_many([product_id for product_id in product_ids if product_id not in fresh], owner)
+    
+    try:
+        products = await _get_products_by_ids_async(leased) if leased else []
         
-        if not product:
-            return
+        semaphores: Dict[str, asyncio.Semaphore] = {}
         
-        # Update product
-        product.current_price = scraped_data["price"]
-        product.is_available = scraped_data["availability"]
-        # Update image if it changed (or was missing)
-        if scraped_data.get("image_url"):
-            product.image_url = scraped_data["image_url"]
-        product.updated_at = datetime.utcnow()
+        async def scrape_one(product_id: int, url: str, platform: Platform):
+            key = Platform(platform).value
+            if key not in semaphores:
+                semaphores[key] = asyncio.Semaphore(settings.SCRAPE_CONCURRENCY_PER_PLATFORM)
+            async with semaphores[key]:
+                data = await _scrape_product_async(url)
+            if not data:
+                return product_id, None, None
+            # Results stream into the ingest buffer as they land and are written in batches
+            written = await ingest_buffer.submit(product_id, data)
+            return product_id, data, written
         
-        # Add price history entry
-        price_entry = PriceHistory(
-            product_id=product_id,
-            price=scraped_data["price"],
-            currency=scraped_data["currency"],
-            scraped_at=datetime.utcnow()
-        )
-        session.add(price_entry)
+        # One product's failure must not abandon its siblings: every coroutine
+        # finishes (and is accounted for) before the leases are released
+        outcomes = await asyncio.gather(*[
+            scrape_one(product_id, url, platform)
+            for product_id, url, platform in products
+        ], return_exceptions=True)
         
-        await session.commit()
+        scraped = []
+        errors = {}
+        for (product_id, url, platform), outcome in zip(products, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"[Batch] Product {product_id} failed: {outcome!r}")
+                errors[product_id] = f"{type(outcome).__name__}: {outcome}"
+            else:
+                scraped.append(outcome)
+        
+        results = {product_id: data for product_id, data, written in scraped if written}
+        triggered_alerts = [
+            alert
+            for product_id, data, written in scraped if written
+            for alert in written["triggered_alerts"]
+        ]
+        await mark_fresh(results)
+    finally:
+        await release_leases(leased, owner)
+    
+    return {
+        "scraped": len(results),
+        "failed": len(products) - len(results),
+        "skipped": len(product_ids) - len(leased),
+        "errors": errors,
+        "triggered_alerts": triggered_alerts
+    }
+
+
+async def _scrape_product_deduped(product_id: int, url: str, owner: str, persist) -> dict:
+    """
+    Single-product scrape guarded by the in-flight lease.
+    The API may already hold the lease on this task's behalf (owner == task id),
+    so it is taken first and released on every path, including "fresh".
+    """
+    holder = await try_lease(product_id, owner)
+    if holder is not None:
+        return {"status": "coalesced", "task_id": holder}
+    
+    try:
+        fresh = (await fresh_results([product_id])).get(product_id)
+        if fresh:
+            return {"status": "fresh", "result": fresh}
         
-        return product.current_price
+        scraped_data = await _scrape_product_async(url, persist=persist)
+        if scraped_data:
+            await mark_fresh({product_id: scraped_data})
+        return {"status": "scraped", "result": scraped_data}
+    finally:
+        await release_leases([product_id], owner)
 
 
-async def _check_alerts_async(product_id: int, current_price: float):
-    """Check if any alerts should be triggered."""
+async def _create_tracked_product(url: str, product_key: str, product: ScrapedProduct) -> int:
+    """
+    Insert a newly tracked product with its first price. Returns its id
+    (existing one if the product raced in). A product that is unavailable
+    with no price is stored at 0.0 and gets no history row until it has one.
+    """
+    now = datetime.utcnow()
     async with WorkerSessionLocal() as session:
-        # Get active alerts for this product
         result = await session.execute(
-            select(Alert, Product)
-            .join(Product, Alert.product_id == Product.id)
-            .where(Alert.product_id == product_id)
-            .where(Alert.is_active == True)
-            .where(Alert.triggered_at == None)
+            insert(Product)
+            .values(
+                url=url,
+                product_key=product_key,
+                name=product.title,
+                current_price=product.price,
+                currency=product.currency,
+                platform=detect_platform(url),
+                is_available=product.availability,
+                image_url=product.image_url,
+                created_at=now,
+                updated_at=now,
+                last_scraped_at=now
+            )
+            .on_conflict_do_nothing()  # Either the URL or the product key is taken
+            .returning(Product.id)
         )
-        rows = result.all()
-        
-        triggered_alerts = []
-        for alert, product in rows:
-            if current_price <= alert.target_price:
-                # Price dropped below target!
-                alert.triggered_at = datetime.utcnow()
-                triggered_alerts.append({
-                    "alert_id": alert.id,
-                    "contact_method": alert.contact_method,
-                    "contact_value": alert.contact_value,
-                    "target_price": alert.target_price,
-                    "current_price": current_price,
-                    "product_name": product.name,
-                    "product_url": product.url
-                })
+        product_id = result.scalar_one_or_none()
+        if product_id is None:
+            result = await session.execute(
+                select(Product.id).where((Product.product_key == product_key) | (Product.url == url)).limit(1)
+            )
+            return result.scalar_one()
         
+        if product.price > 0:
+            await record_price(
+                session,
+                product_id,
+                price=product.price,
+                currency=product.currency,
+                is_available=product.availability,
+                scraped_at=now
+            )
         await session.commit()
-        return triggered_alerts
+        return product_id
 
 
-async def _get_all_products_async():
-    """Get all tracked products."""
-    async with WorkerSessionLocal() as session:
-        result = await session.execute(select(Product))
-        products = result.scalars().all()
-        return [(p.id, p.url, p.name) for p in products]
+async def _track_product_async(job_id: str, url: str, product_key: str) -> Optional[int]:
+    """Run a track job's first scrape on the pooled browser, reporting each stage."""
+    async def progress(stage: str):
+        await track_jobs.update(job_id, stage)
+    
+    async def persist(product: ScrapedProduct):
+        return await _create_tracked_product(url, product_key, product)
+    
+    # Duplicate submissions of one product reuse a scrape from the last SCRAPE_CACHE_SECONDS
+    pipeline = ScrapePipeline(
+        context_factory=_browser_pool.context, persist=persist, progress=progress, use_cache=True
+    )
+    try:
+        outcome = await pipeline.run(url)
+    except Exception as e:
+        print(f"[Track] Failed to track {url}: {e!r}")
+        await track_jobs.update(job_id, STAGE_FAILED, error=f"{type(e).__name__}: {e}")
+        return None
+    
+    print(f"[Track] {url} served via {outcome.product.source} in {outcome.total_ms:.0f} ms: {outcome.timings}")
+    await track_jobs.update(job_id, STAGE_SAVED, product_id=outcome.persisted)
+    return outcome.persisted
 
 
 # ============ CELERY TASKS ============
 
+@celery_app.task(bind=True, name="app.worker.tasks.track_product")
+def track_product(self, job_id: str, url: str, product_key: Optional[str] = None):
+    """
+    Task: First scrape of a newly submitted URL (POST /products/track).
+    Progress is published to the job for status polling and SSE.
+    """
+    if product_key is None:
+        # Queued before links were canonicalized
+        canonical = canonicalize(url)
+        url, product_key = canonical.url, canonical.key
+    product_id = run_async(_track_product_async(job_id, url, product_key))
+    if product_id is None:
+        return {"status": "failed", "job_id": job_id}
+    return {"status": "success", "job_id": job_id, "product_id": product_id}
+
+
 @celery_app.task(bind=True, name="app.worker.tasks.scrape_product")
 def scrape_product(self, product_id: int, url: str):
     """
@@ -151,49 +377,128 @@ def scrape_product(self, product_id: int, url: str):
     """
     print(f"[Task] Scraping product {product_id}: {url}")
     
-    # Scrape the product
-    scraped_data = run_async(_scrape_product_async(url))
+    async def persist(product: ScrapedProduct):
+        return await _update_product_price_async(product_id, {
+            "title": product.title,
+            "price": product.price,
+            "currency": product.currency,
+            "availability": product.availability,
+            "image_url": product.image_url
+        })
+    
+    # Scrape the product and update the database (and alerts) as the pipeline's persist stage
+    outcome = run_async(_scrape_product_deduped(product_id, url, self.request.id, persist))
     
+    if outcome["status"] == "fresh":
+        print(f"[Task] Product {product_id} scraped moments ago, skipping")
+        return {"status": "fresh", "product_id": product_id, "price": outcome["result"]["price"]}
+    if outcome["status"] == "coalesced":
+        print(f"[Task] Product {product_id} already being scraped by {outcome['task_id']}")
+        return {"status": "coalesced", "product_id": product_id, "task_id": outcome["task_id"]}
+    
+    scraped_data = outcome["result"]
     if not scraped_data:
         print(f"[Task] Failed to scrape product {product_id}")
         return {"status": "failed", "product_id": product_id}
     
-    # Update database
-    current_price = run_async(_update_product_price_async(product_id, scraped_data))
+    persisted = scraped_data["persisted"]
+    if persisted is None:
+        return {"status": "skipped", "reason": "product_not_found", "product_id": product_id}
     
-    # Check alerts
-    triggered_alerts = run_async(_check_alerts_async(product_id, current_price))
+    # Alerts were checked in the same transaction as the price update
+    current_price = persisted["price"]
+    triggered_alerts = persisted["triggered_alerts"]
     
-    # Send notifications for triggered alerts
-    for alert in triggered_alerts:
-        send_notification.delay(alert)
+    # Notifications were queued in the outbox with the update; deliver them now
+    if triggered_alerts:
+        drain_outbox.delay()
     
     print(f"[Task] Product {product_id} updated. Price: {current_price}")
     return {
         "status": "success",
         "product_id": product_id,
         "price": current_price,
-        "alerts_triggered": len(triggered_alerts)
+        "alerts_triggered": len(triggered_alerts),
+        "source": scraped_data["source"],
+        "timings": scraped_data["timings"]
     }
 
 
-@celery_app.task(bind=True, name="app.worker.tasks.check_all_prices")
-def check_all_prices(self):
+@celery_app.task(bind=True, name="app.worker.tasks.scrape_batch", time_limit=900)
+def scrape_batch(self, product_ids: List[int]):
     """
-    Periodic Task: Check prices for all tracked products.
-    Runs every 30 minutes via Celery Beat.
+    Task: Scrape a chunk of products concurrently and write results in bulk.
     """
-    print("[Periodic Task] Checking all product prices...")
+    print(f"[Batch] Scraping {len(product_ids)} products")
     
-    products = run_async(_get_all_products_async())
+    outcome = run_async(_scrape_batch_async(product_ids, self.request.id))
     
-    print(f"[Periodic Task] Found {len(products)} products to check")
+    if outcome["triggered_alerts"]:
+        drain_outbox.delay()
+    
+    print(f"[Batch] Done. Scraped: {outcome['scraped']}, Failed: {outcome['failed']}, "
+          f"Skipped: {outcome['skipped']}")
+    return {
+        "status": "success",
+        "scraped": outcome["scraped"],
+        "failed": outcome["failed"],
+        "skipped": outcome["skipped"],
+        "errors": outcome["errors"],
+        "alerts_triggered": len(outcome["triggered_alerts"])
+    }
+
+
+@celery_app.task(bind=True, name="app.worker.tasks.release_due_scrapes")
+def release_due_scrapes(self):
+    """
+    Periodic Task: Time-wheel scheduler tick.
+    Runs every SCHEDULER_TICK_SECONDS via Celery Beat and releases at most
+    SCHEDULER_MAX_PER_TICK due products, so queue depth and outbound request
+    rate stay flat instead of spiking once per interval.
+    """
+    near_alert_ids, routine_ids = run_async(_release_due_products_async())
     
-    # Queue individual scrape tasks for each product
-    for product_id, url, name in products:
-        scrape_product.delay(product_id, url)
+    # Products about to cross an alert target go ahead of the routine sweep
+    if near_alert_ids:
+        scrape_batch.apply_async(args=[near_alert_ids], queue=QUEUE_ALERTS)
+    if routine_ids:
+        scrape_batch.apply_async(args=[routine_ids], queue=QUEUE_SWEEP)
     
-    return {"status": "queued", "products_count": len(products)}
+    return {
+        "status": "queued",
+        "products_count": len(near_alert_ids) + len(routine_ids),
+        "near_alert_count": len(near_alert_ids)
+    }
+
+
+@celery_app.task(bind=True, name="app.worker.tasks.check_all_prices")
+def check_all_prices(self, partition: Optional[int] = None, partitions: Optional[int] = None):
+    """
+    Task: Scrape every tracked product now (manual refresh-all, or the
+    optional SWEEP_BEAT_MINUTES schedule).
+    Routine scraping is driven by release_due_scrapes.
+    
+    Without arguments, fans out into SWEEP_PARTITIONS partition tasks
+    (product id modulo partitions). Each partition streams its ids in keyset
+    pages and queues one scrape_batch per SCRAPE_BATCH_SIZE chunk, so memory
+    stays flat however large the catalogue is.
+    """
+    if partition is None:
+        partitions = max(settings.SWEEP_PARTITIONS, 1)
+        if partitions > 1:
+            for index in range(partitions):
+                check_all_prices.apply_async(args=[index, partitions])
+            print(f"[Task] Full sweep split into {partitions} partitions")
+            return {"status": "fanned_out", "partitions": partitions}
+        partition = 0
+    
+    print(f"[Task] Sweeping partition {partition}/{partitions}...")
+    
+    outcome = run_async(_sweep_partition_async(partition, partitions))
+    
+    print(f"[Task] Partition {partition}/{partitions}: queued {outcome['products_count']} products "
+          f"in {outcome['batches']} batches")
+    return {"status": "queued", "partition": partition, "partitions": partitions, **outcome}
 
 
 @celery_app.task(bind=True, name="app.worker.tasks.send_notification")
@@ -201,24 +506,85 @@ def send_notification(self, alert_data: dict):
     """
     Task: Send notification to user when price drops.
     """
-    contact_method = alert_data["contact_method"]
-    current_price = alert_data["current_price"]
-    target_price = alert_data["target_price"]
-    product_name = alert_data.get("product_name", "Product")
-    product_url = alert_data.get("product_url", "")
-    
-    # Format message
-    message = NotificationService.format_alert_message(
-        product_name, current_price, target_price, product_url
-    )
+    results = run_async(telegram_dispatcher.dispatch([alert_data]))
+    result = results[0]
+    if result["error"] == "method_not_supported":
+        return {"status": "skipped", "reason": "method_not_supported"}
+    return {"status": "sent", "success": result["success"]}
+
+
+async def _drain_outbox_async() -> dict:
+    """Claim due outbox rows, deliver them, and record each outcome."""
+    async with WorkerSessionLocal() as session:
+        claimed = await claim_notifications(session, datetime.utcnow(), settings.OUTBOX_BATCH_SIZE)
+        await session.commit()
+    if not claimed:
+        return {"claimed": 0, "sent": 0, "failed": 0}
     
-    print(f"[Notification] Sending {contact_method} alert...")
+    results = await telegram_dispatcher.dispatch([payload for _, payload, _ in claimed])
     
-    if contact_method == "telegram":
-        success = NotificationService.send_telegram_message(
-            message=message,
-            chat_id=alert_data.get("contact_value") # Use user's specific chat_id if stored
+    async with WorkerSessionLocal() as session:
+        await record_deliveries(
+            session,
+            [(row_id, attempts, result) for (row_id, _, attempts), result in zip(claimed, results)],
+            datetime.utcnow()
         )
-        return {"status": "sent", "success": success}
+        await session.commit()
+    
+    sent = sum(1 for result in results if result["success"])
+    return {"claimed": len(claimed), "sent": sent, "failed": len(claimed) - sent}
+
+
+@celery_app.task(bind=True, name="app.worker.tasks.drain_outbox")
+def drain_outbox(self):
+    """
+    Periodic Task: Deliver pending notifications from the outbox.
+    Also kicked right after a scrape triggers alerts; retries back off
+    exponentially until OUTBOX_MAX_ATTEMPTS.
+    """
+    outcome = run_async(_drain_outbox_async())
+    if outcome["claimed"]:
+        print(f"[Outbox] Sent {outcome['sent']}/{outcome['claimed']} notifications")
+    return {"status": "success", **outcome}
+
+
+async def _rebuild_alert_index_async() -> int:
+    async with WorkerSessionLocal() as session:
+        return await alert_index.rebuild(session)
+
+
+@celery_app.task(bind=True, name="app.worker.tasks.rebuild_alert_index")
+def rebuild_alert_index(self):
+    """
+    Periodic Task: Reload the Redis alert index from Postgres.
+    Heals any drift and re-enables the index after a failed write.
+    """
+    indexed = run_async(_rebuild_alert_index_async())
+    print(f"[AlertIndex] Indexed {indexed} active alerts")
+    return {"status": "success", "alerts_indexed": indexed}
+
+
+async def _compact_price_history_async(chunk_size: int) -> int:
+    """Compact history product by product, in chunks, so no transaction grows unbounded."""
+    async with WorkerSessionLocal() as session:
+        result = await session.execute(select(Product.id).order_by(Product.id))
+        product_ids = list(result.scalars().all())
     
-    return {"status": "skipped", "reason": "method_not_supported"}
+    removed = 0
+    for i in range(0, len(product_ids), chunk_size):
+        async with WorkerSessionLocal() as session:
+            removed += await compact_price_history(session, product_ids[i:i + chunk_size])
+    return removed
+
+
+@celery_app.task(bind=True, name="app.worker.tasks.compact_price_history", time_limit=3600)
+def compact_price_history_task(self, chunk_size: int = 100):
+    """
+    One-off Task: Collapse existing duplicate price_history rows into runs.
+    Run when switching PRICE_HISTORY_MODE from the default "every_scrape" to "runs":
+        celery -A app.worker.celery_app call app.worker.tasks.compact_price_history
+    """
+    print("[Maintenance] Compacting price history...")
+    removed = run_async(_compact_price_history_async(chunk_size))
+    print(f"[Maintenance] Removed {removed} duplicate price history rows")
+    return {"status": "success", "rows_removed": removed}
@@ -0,0 +1,243 @@
+"""
+Price analysis benchmark.
+
+Seeds a throwaway product with a year of price history, then times
+analyze_price (one round trip with FILTERed window aggregates) against the
+original layout: a product query plus one plain AVG/MIN/MAX/COUNT scan per
+window, written out here so it shares no code with analyze_price.
+Reports round trips, p50/p95 latency and checks both return the same stats.
+Needs the Postgres database from the app settings (.env); the seeded
+products are deleted afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_analytics
+    python -m benchmarks.bench_analytics --scrapes-per-day 48 --iterations 200 --json analytics.json
+    python -m benchmarks.bench_analytics --runs
+
+History is stored one row per scrape (the default "every_scrape" mode), so
+both paths must agree exactly. With --runs, analyze_price reads a copy of
+the same history stored as runs ("runs" mode) while the original query
+keeps the per-scrape rows; the report then shows how far the run-weighted
+stats drift from exact ones (runs straddling a cutoff are prorated).
+Exits non-zero if the stats differ by more than --tolerance.
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import event, insert, delete, select, func
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.core.config import settings
+from app.models.product import Product, PriceHistory, Platform
+from app.analytics.fake_sale_detector import analyze_price, ANALYSIS_WINDOWS
+
+
+def make_history(product_id: int, days: int, scrapes_per_day: int, every_scrape: bool) -> list:
+    """A year of a price that drifts, with occasional sales, ending now."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    step = timedelta(days=1) / scrapes_per_day
+    price = 10000.0
+    rows = []
+    for index in range(days * scrapes_per_day):
+        scraped_at = now - timedelta(days=days) + index * step
+        if rng.random() < 0.02:
+            price = round(max(price * rng.uniform(0.85, 1.12), 500), 2)
+        if not every_scrape and rows and rows[-1]["price"] == price:
+            rows[-1]["last_seen_at"] = scraped_at
+            rows[-1]["sample_count"] += 1
+            continue
+        rows.append({
+            "product_id": product_id,
+            "price": price,
+            "currency": "INR",
+            "is_available": True,
+            "scraped_at": scraped_at,
+            "last_seen_at": scraped_at,
+            "sample_count": 1
+        })
+    return rows
+
+
+async def original_price_stats(session: AsyncSession, product_id: int, days: int) -> dict:
+    """get_price_stats as it was before runs and window aggregates: one row per scrape."""
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    result = await session.execute(
+        select(
+            func.avg(PriceHistory.price).label("avg_price"),
+            func.min(PriceHistory.price).label("min_price"),
+            func.max(PriceHistory.price).label("max_price"),
+            func.count(PriceHistory.id).label("data_points")
+        )
+        .where(PriceHistory.product_id == product_id)
+        .where(PriceHistory.scraped_at >= cutoff_date)
+    )
+    row = result.one()
+    return {
+        "avg": float(row.avg_price) if row.avg_price else None,
+        "min": float(row.min_price) if row.min_price else None,
+        "max": float(row.max_price) if row.max_price else None,
+        "data_points": int(row.data_points)
+    }
+
+
+async def legacy_analysis(session: AsyncSession, product_id: int) -> dict:
+    """The data-access half of analyze_price before it was folded into one query."""
+    result = await session.execute(select(Product).where(Product.id == product_id))
+    result.scalar_one()
+    return {days: await original_price_stats(session, product_id, days) for days in ANALYSIS_WINDOWS}
+
+
+def stats_of(analysis) -> dict:
+    return {
+        7: analysis.avg_7_day,
+        30: (analysis.avg_30_day, analysis.min_price_30_day, analysis.max_price_30_day),
+        90: analysis.avg_90_day
+    }
+
+
+def legacy_stats(stats: dict) -> dict:
+    return {
+        7: stats[7]["avg"],
+        30: (stats[30]["avg"], stats[30]["min"], stats[30]["max"]),
+        90: stats[90]["avg"]
+    }
+
+
+def deviation(a, b) -> float:
+    """Largest relative difference between two stats values (inf if only one is missing)."""
+    if isinstance(a, tuple):
+        return max(deviation(x, y) for x, y in zip(a, b))
+    if a is None or b is None:
+        return 0.0 if a is b else float("inf")
+    return abs(a - b) / max(abs(b), 1)
+
+
+async def timed(engine, fn, iterations: int) -> dict:
+    statements = []
+    listener = lambda *args: statements.append(1)  # noqa: E731
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    latencies = []
+    try:
+        async with AsyncSession(engine) as session:
+            await fn(session)  # Warm-up (connection, plan cache)
+            statements.clear()
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await fn(session)
+                latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+    latencies.sort()
+    return {
+        "round_trips": len(statements) // iterations,
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+        "mean_ms": round(statistics.fmean(latencies), 3)
+    }
+
+
+async def seed_product(session: AsyncSession, args, every_scrape: bool) -> tuple:
+    """Insert a benchmark product with its history. Returns (product_id, history rows)."""
+    result = await session.execute(
+        insert(Product)
+        .values(
+            url=f"https://bench.example.com/p/{uuid4()}",
+            name="Benchmark product",
+            current_price=8500.0,
+            currency="INR",
+            platform=Platform.UNKNOWN,
+            is_available=True,
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        .returning(Product.id)
+    )
+    product_id = result.scalar_one()
+    rows = make_history(product_id, args.days, args.scrapes_per_day, every_scrape)
+    for i in range(0, len(rows), 5000):
+        await session.execute(insert(PriceHistory), rows[i:i + 5000])
+    return product_id, len(rows)
+
+
+async def run(args) -> dict:
+    engine = create_async_engine(settings.SQLALCHEMY_DATABASE_URI)
+    product_ids = []
+    try:
+        async with AsyncSession(engine) as session:
+            # The original query always reads one row per scrape
+            legacy_id, legacy_rows = await seed_product(session, args, every_scrape=True)
+            product_ids.append(legacy_id)
+            product_id, rows = legacy_id, legacy_rows
+            if args.runs:
+                product_id, rows = await seed_product(session, args, every_scrape=False)
+                product_ids.append(product_id)
+            await session.commit()
+
+        try:
+            async with AsyncSession(engine) as session:
+                new = stats_of(await analyze_price(session, product_id))
+                old = legacy_stats(await legacy_analysis(session, legacy_id))
+            drift = max(deviation(new[days], old[days]) for days in ANALYSIS_WINDOWS)
+
+            single = await timed(engine, lambda session: analyze_price(session, product_id), args.iterations)
+            legacy = await timed(engine, lambda session: legacy_analysis(session, legacy_id), args.iterations)
+        finally:
+            async with AsyncSession(engine) as session:
+                await session.execute(delete(PriceHistory).where(PriceHistory.product_id.in_(product_ids)))
+                await session.execute(delete(Product).where(Product.id.in_(product_ids)))
+                await session.commit()
+    finally:
+        await engine.dispose()
+
+    return {
+        "history_rows": rows,
+        "legacy_history_rows": legacy_rows,
+        "days": args.days,
+        "layout": "runs" if args.runs else "every_scrape",
+        "max_deviation": drift,
+        "matches": drift <= args.tolerance,
+        "single_query": single,
+        "per_window": legacy,
+        "speedup_p50": round(legacy["p50_ms"] / single["p50_ms"], 2) if single["p50_ms"] else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Price analysis benchmark")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--scrapes-per-day", type=int, default=24)
+    parser.add_argument("--runs", action="store_true", help="Analyse history stored as runs (PRICE_HISTORY_MODE=runs)")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--tolerance", type=float, help="Allowed relative difference in stats "
+                        "(default 1e-6, or 1e-2 with --runs)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+    if args.tolerance is None:
+        args.tolerance = 1e-2 if args.runs else 1e-6
+
+    report = asyncio.run(run(args))
+
+    print(f"{report['history_rows']} history rows ({report['layout']}) over {report['days']} days")
+    for label in ("single_query", "per_window"):
+        row = report[label]
+        print(f"{label:<13} {row['round_trips']} round trip(s)  p50 {row['p50_ms']:>8} ms  "
+              f"p95 {row['p95_ms']:>8} ms  mean {row['mean_ms']:>8} ms")
+    print(f"{'OK  ' if report['matches'] else 'FAIL'} stats match (max relative deviation "
+          f"{report['max_deviation']:.2e}); p50 speedup x{report['speedup_p50']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    sys.exit(0 if report["matches"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Offline notification benchmark.
+
+Fires a burst of triggered alerts (as during a big sale) at the Telegram
+dispatcher, pointed at a local stand-in for the Bot API that enforces
+Telegram-style rate limits. Reports messages sent, 429s received, wall time
+and delivery rate, with per-chat coalescing on and off. Needs no internet
+access and no Redis (pacing uses an in-process limiter).
+
+Usage (from backend/):
+    python -m benchmarks.bench_notifications
+    python -m benchmarks.bench_notifications --alerts 500 --chats 60 --json notify.json
+
+Exits non-zero if any alert is not delivered.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+# Settings require these; the benchmark never touches Postgres or Redis
+for key, value in {
+    "PROJECT_NAME": "bench",
+    "SECRET_KEY": "bench",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_PORT": "5432",
+    "TELEGRAM_BOT_TOKEN": "bench-token",
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.core.config import settings
+from app.scraper.rate_limiter import LocalRateLimiter
+from app.services.telegram import TelegramDispatcher
+from benchmarks.telegram_stub import TelegramStubServer
+
+
+def make_alerts(count: int, chats: int) -> list:
+    rng = random.Random(42)
+    alerts = []
+    for alert_id in range(1, count + 1):
+        price = rng.randint(500, 50000)
+        alerts.append({
+            "alert_id": alert_id,
+            "rule_type": "target_price",
+            "contact_method": "telegram",
+            "contact_value": str(1000 + rng.randrange(chats)),
+            "target_price": float(price),
+            "current_price": float(price - rng.randint(1, 400)),
+            "product_name": f"Product {alert_id}",
+            "product_url": f"https://example.com/p/{alert_id}"
+        })
+    return alerts
+
+
+async def run(alerts: list, coalesce: bool) -> list:
+    dispatcher = TelegramDispatcher(limiter=LocalRateLimiter())
+    if coalesce:
+        return await dispatcher.dispatch(alerts)
+    # One dispatch per alert: what per-alert notification tasks amount to
+    batches = await asyncio.gather(*[dispatcher.dispatch([alert]) for alert in alerts])
+    return [result for batch in batches for result in batch]
+
+
+def bench(alerts: list, coalesce: bool) -> dict:
+    with TelegramStubServer() as stub:
+        settings.TELEGRAM_API_BASE = stub.base_url
+        start = time.perf_counter()
+        results = asyncio.run(run(alerts, coalesce))
+        elapsed = time.perf_counter() - start
+        delivered = sum(1 for result in results if result["success"])
+        return {
+            "mode": "digest" if coalesce else "per-alert",
+            "alerts": len(alerts),
+            "delivered": delivered,
+            "messages_sent": len(stub.messages),
+            "rate_limited": stub.rejected,
+            "seconds": round(elapsed, 2),
+            "alerts_per_sec": round(delivered / elapsed, 1) if elapsed else None
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline notification benchmark")
+    parser.add_argument("--alerts", type=int, default=300)
+    parser.add_argument("--chats", type=int, default=40)
+    parser.add_argument("--skip-per-alert", action="store_true", help="Only run the coalesced dispatcher")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    alerts = make_alerts(args.alerts, args.chats)
+    rows = [bench(alerts, coalesce=True)]
+    if not args.skip_per_alert:
+        rows.append(bench(alerts, coalesce=False))
+
+    for row in rows:
+        status = "OK  " if row["delivered"] == row["alerts"] else "FAIL"
+        print(f"{status} {row['mode']:<10} {row['delivered']}/{row['alerts']} delivered  "
+              f"{row['messages_sent']:>5} messages  {row['rate_limited']:>4} x 429  "
+              f"{row['seconds']:>7} s  {row['alerts_per_sec']} alerts/s")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    sys.exit(0 if all(row["delivered"] == row["alerts"] for row in rows) else 1)
+
+
+if __name__ == "__main__":
+    main()
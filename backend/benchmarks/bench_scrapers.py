@@ -0,0 +1,175 @@
+"""
+Offline scraper benchmark.
+
+Runs every scraper in app/scraper/ against the fixture corpus and reports
+pages/second, per-field extraction time and correctness for both the HTTP
+fast path (extract_fast on raw HTML) and the browser path (Playwright
+against a local static server). Needs no internet access.
+
+The fixtures are synthetic, hand-written pages that mimic each platform's
+markup; they are much smaller than live pages, so timings are a lower bound.
+tests/test_scraper_fixtures.py runs the fast-path correctness check.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scrapers
+    python -m benchmarks.bench_scrapers --iterations 20 --no-browser
+    python -m benchmarks.bench_scrapers --json bench_output.json
+
+Exits non-zero if any fixture extracts incorrectly.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from statistics import median
+
+# Settings require these; the benchmark never touches Postgres or Redis
+for key, value in {
+    "PROJECT_NAME": "bench",
+    "SECRET_KEY": "bench",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_PORT": "5432",
+    "SELECTOR_STATS_ENABLED": "false",
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.scraper.factory import ScraperFactory
+from app.scraper.selectors import evaluate_spec
+from app.scraper.utils import get_stealth_context
+from app.scraper.browser_pool import BROWSER_ARGS
+from benchmarks.static_server import FixtureServer, FIXTURES_DIR
+
+
+def load_expected() -> dict:
+    with open(FIXTURES_DIR / "expected.json") as f:
+        return json.load(f)
+
+
+def check(product, expected: dict) -> list:
+    """Return a list of mismatch descriptions (empty means correct)."""
+    if product is None:
+        return ["no product extracted"]
+    errors = []
+    for field, value in expected.items():
+        actual = getattr(product, field)
+        if actual != value:
+            errors.append(f"{field}: expected {value!r}, got {actual!r}")
+    return errors
+
+
+def bench_fast_path(server: FixtureServer, expected: dict, iterations: int) -> list:
+    rows = []
+    for fixture, want in expected.items():
+        url = server.url_for(fixture)
+        scraper = ScraperFactory.get_scraper(url)
+        html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+
+        timings = []
+        product = None
+        for _ in range(iterations):
+            start = time.perf_counter()
+            product = scraper.extract_fast(html, url)
+            timings.append(time.perf_counter() - start)
+
+        rows.append({
+            "path": "http",
+            "fixture": fixture,
+            "median_ms": round(median(timings) * 1000, 3),
+            "pages_per_sec": round(1 / median(timings), 1) if median(timings) else None,
+            "errors": check(product, want)
+        })
+    return rows
+
+
+async def bench_browser_path(server: FixtureServer, expected: dict, iterations: int) -> list:
+    from playwright.async_api import async_playwright
+
+    rows = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=BROWSER_ARGS)
+        try:
+            for fixture, want in expected.items():
+                url = server.url_for(fixture)
+                scraper = ScraperFactory.get_scraper(url)
+
+                page_times, extract_times = [], []
+                field_times = {name: [] for name in scraper.SELECTORS}
+                product = None
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    context = await get_stealth_context(browser, scraper.PLATFORM)
+                    page = await context.new_page()
+                    await page.goto(url, wait_until="domcontentloaded")
+
+                    extract_start = time.perf_counter()
+                    product = await scraper.scrape(page, url)
+                    extract_times.append(time.perf_counter() - extract_start)
+                    page_times.append(time.perf_counter() - start)
+
+                    # Each field on its own, to see which selectors are slow
+                    for name, field in scraper.SELECTORS.items():
+                        field_start = time.perf_counter()
+                        await evaluate_spec(page, {name: field})
+                        field_times[name].append(time.perf_counter() - field_start)
+
+                    await context.close()
+
+                rows.append({
+                    "path": "browser",
+                    "fixture": fixture,
+                    "median_ms": round(median(page_times) * 1000, 1),
+                    "extract_ms": round(median(extract_times) * 1000, 2),
+                    "pages_per_sec": round(1 / median(page_times), 2),
+                    "field_ms": {
+                        name: round(median(times) * 1000, 2) for name, times in field_times.items()
+                    },
+                    "errors": check(product, want)
+                })
+        finally:
+            await browser.close()
+    return rows
+
+
+def print_rows(rows: list):
+    for row in rows:
+        status = "OK  " if not row["errors"] else "FAIL"
+        line = f"{status} {row['path']:<8} {row['fixture']:<28} {row['median_ms']:>9} ms  {row['pages_per_sec']:>9} pages/s"
+        if "extract_ms" in row:
+            line += f"  extract {row['extract_ms']} ms"
+        print(line)
+        for name, ms in row.get("field_ms", {}).items():
+            print(f"         {name:<14} {ms} ms")
+        for error in row["errors"]:
+            print(f"         ! {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--no-browser", action="store_true", help="Only benchmark the HTTP fast path")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    expected = load_expected()
+    with FixtureServer() as server:
+        rows = bench_fast_path(server, expected, max(args.iterations, 50))
+        if not args.no_browser:
+            rows += asyncio.run(bench_browser_path(server, expected, args.iterations))
+
+    print_rows(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    failures = [row for row in rows if row["errors"]]
+    print(f"\n{len(rows) - len(failures)}/{len(rows)} fixture runs correct")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
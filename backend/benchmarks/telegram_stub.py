@@ -0,0 +1,94 @@
+import json
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SEND_MESSAGE = re.compile(r"^/bot[^/]+/sendMessage$")
+
+
+class TelegramStubServer:
+    """
+    Stand-in for the Telegram Bot API sendMessage endpoint on 127.0.0.1.
+
+    Enforces the same shape of limits as the real API (messages per second
+    for the bot, and a minimum gap per chat) and answers 429 with
+    retry_after when they are exceeded. Every accepted message is recorded.
+    """
+
+    def __init__(self, global_rate: float = 30.0, chat_interval: float = 1.0, latency: float = 0.02):
+        self.global_rate = global_rate
+        self.chat_interval = chat_interval
+        self.latency = latency
+        self.messages = []
+        self.rejected = 0
+        self._recent = []
+        self._last_by_chat = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _admit(self, chat_id: str):
+        """Returns seconds to wait if this send breaks a limit, else None."""
+        now = time.monotonic()
+        with self._lock:
+            self._recent = [t for t in self._recent if now - t < 1.0]
+            if len(self._recent) >= self.global_rate:
+                return 1.0 - (now - self._recent[0])
+            last = self._last_by_chat.get(chat_id)
+            if last is not None and now - last < self.chat_interval:
+                return self.chat_interval - (now - last)
+            self._recent.append(now)
+            self._last_by_chat[chat_id] = now
+            return None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not SEND_MESSAGE.match(self.path):
+                    return self._reply(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+
+                time.sleep(stub.latency)
+                wait = stub._admit(str(payload.get("chat_id")))
+                if wait is not None:
+                    with stub._lock:
+                        stub.rejected += 1
+                    return self._reply(429, {
+                        "ok": False,
+                        "error_code": 429,
+                        "description": "Too Many Requests",
+                        "parameters": {"retry_after": max(1, round(wait))}
+                    })
+                with stub._lock:
+                    stub.messages.append(payload)
+                return self._reply(200, {"ok": True, "result": {"message_id": len(stub.messages)}})
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
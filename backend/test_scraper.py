@@ -1,8 +1,8 @@
 import asyncio
 import sys
-from playwright.async_api import async_playwright
 from app.scraper.factory import ScraperFactory
-from app.scraper.utils import get_stealth_context
+from app.scraper.browser_pool import standalone_context
+from app.scraper.pipeline import ScrapePipeline
 
 async def main():
     # Test URL from user report
@@ -14,29 +14,22 @@ async def main():
         scraper = ScraperFactory.get_scraper(url)
         print(f"Scraper: {scraper.__class__.__name__}")
         
-        async with async_playwright() as p:
-            print("Launching browser...")
-            browser = await p.chromium.launch(
-                headless=False, 
-                args=["--disable-blink-features=AutomationControlled"]
-            )
-            context = await get_stealth_context(browser)
-            page = await context.new_page()
-            
-            print(f"Navigating to {url}...")
-            await page.goto(url, timeout=60000)
-            
-            print("Scraping...")
-            product = await scraper.scrape(page, url)
-            
-            print("\n----- Scraped Result -----")
-            print(f"Title: {product.title}")
-            print(f"Price: {product.price}")
-            print(f"Availability: {product.availability}")
-            print(f"Image URL: {product.image_url}")
-            print("--------------------------")
-            
-            await browser.close()
+        pipeline = ScrapePipeline(
+            context_factory=lambda platform: standalone_context(platform, headless=False),
+            use_fast_path=False
+        )
+        
+        print(f"Navigating to {url} and scraping...")
+        outcome = await pipeline.run(url)
+        product = outcome.product
+        
+        print("\n----- Scraped Result -----")
+        print(f"Title: {product.title}")
+        print(f"Price: {product.price}")
+        print(f"Availability: {product.availability}")
+        print(f"Image URL: {product.image_url}")
+        print(f"Stage timings (ms): {outcome.timings}")
+        print("--------------------------")
             
     except Exception as e:
         print(f"Error: {e}")
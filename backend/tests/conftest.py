@@ -0,0 +1,14 @@
+import os
+
+# Settings require these; the tests never touch Postgres or Redis
+for key, value in {
+    "PROJECT_NAME": "test",
+    "SECRET_KEY": "test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "POSTGRES_PORT": "5432",
+    "SELECTOR_STATS_ENABLED": "false",
+}.items():
+    os.environ.setdefault(key, value)
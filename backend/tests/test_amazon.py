@@ -0,0 +1,32 @@
+from app.scraper.amazon import AmazonScraper, buybox_price
+
+URL = "https://www.amazon.in/dp/B07PR1CL3S"
+CAROUSEL = '{"sims":[{"asin":"B0OTHER001","priceAmount":499.00}]}'
+BUYBOX = '{"desktop_buybox_group_1":[{"displayPrice":"₹1,299.00","priceAmount":1299.00},{"priceAmount":1349.00}]}'
+
+
+def page(*scripts: str) -> str:
+    body = "".join(f"<script>var d = {script};</script>" for script in scripts)
+    return (
+        '<html><head><meta property="og:title" content="boAt Rockerz 450"></head>'
+        f'<body>{body}<div id="availability"><span>In stock</span></div></body></html>'
+    )
+
+
+def test_buybox_price_wins_over_earlier_matches():
+    assert buybox_price(page(CAROUSEL, BUYBOX)) == 1299.0
+
+
+def test_single_unanchored_price_is_used():
+    assert buybox_price(page('{"priceAmount":1299.00}', '{"priceAmount": 1299}')) == 1299.0
+
+
+def test_conflicting_unanchored_prices_are_not_guessed():
+    assert buybox_price(page(CAROUSEL, '{"priceAmount":1299.00}')) is None
+
+
+def test_fast_path_falls_back_to_the_browser_when_ambiguous():
+    scraper = AmazonScraper()
+
+    assert scraper.extract_fast(page(CAROUSEL, '{"priceAmount":1299.00}'), URL) is None
+    assert scraper.extract_fast(page(CAROUSEL, BUYBOX), URL).price == 1299.0
@@ -0,0 +1,50 @@
+from app.services.bulk_import import LineParser, read_lines
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def test_read_lines_rejoins_lines_split_across_chunks():
+    lines = [line async for line in read_lines(chunks(b"url\nhttps://a.example/1\nhttps://b.exa", b"mple/2\r\n", b"https://c.example/3"))]
+
+    assert lines == [(1, "url"), (2, "https://a.example/1"), (3, "https://b.example/2"), (4, "https://c.example/3")]
+
+
+def test_csv_header_selects_the_url_column():
+    parser = LineParser(ndjson=False)
+
+    assert parser.parse(1, "name,url,note") == (None, None)
+    assert parser.parse(2, 'Headphones,https://www.amazon.in/dp/B07PR1CL3S,"gift, maybe"') == ("https://www.amazon.in/dp/B07PR1CL3S", None)
+    assert parser.parse(3, "Jeans") == (None, "no url column")
+
+
+def test_csv_without_header_uses_the_first_column():
+    parser = LineParser(ndjson=False)
+
+    assert parser.parse(1, "https://www.myntra.com/jeans/11345678,extra") == ("https://www.myntra.com/jeans/11345678", None)
+    assert parser.parse(2, "https://www.flipkart.com/x/p/itm1") == ("https://www.flipkart.com/x/p/itm1", None)
+
+
+def test_ndjson_objects_and_strings():
+    parser = LineParser(ndjson=True)
+
+    assert parser.parse(1, '{"url": " https://a.example/1 ", "tag": "x"}') == ("https://a.example/1", None)
+    assert parser.parse(2, '"https://b.example/2"') == ("https://b.example/2", None)
+    assert parser.parse(3, '{"link": "https://c.example/3"}') == (None, "no url field")
+    assert parser.parse(4, "{not json") == (None, "not valid JSON")
+
+
+def test_blank_lines_and_comments_are_skipped():
+    parser = LineParser(ndjson=False)
+
+    assert parser.parse(1, "") == (None, None)
+    assert parser.parse(2, "# exported from my wishlist") == (None, None)
+
+
+def test_only_http_urls_are_accepted():
+    parser = LineParser(ndjson=True)
+
+    assert parser.parse(1, '"ftp://files.example/1"') == (None, "not an http(s) URL")
+    assert parser.parse(2, '"www.amazon.in/dp/B07PR1CL3S"') == (None, "not an http(s) URL")
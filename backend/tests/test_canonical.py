@@ -0,0 +1,45 @@
+from app.scraper.canonical import canonicalize
+
+
+def test_amazon_links_collapse_to_the_asin():
+    links = [
+        "https://www.amazon.in/boAt-Rockerz-450/dp/B07PR1CL3S/ref=sr_1_3?keywords=boat&qid=1700000000",
+        "https://amazon.in/dp/B07PR1CL3S?tag=affiliate-21&th=1",
+        "https://m.amazon.in/gp/product/b07pr1cl3s/",
+        "https://www.amazon.in/gp/aw/d/B07PR1CL3S",
+    ]
+
+    keys = {canonicalize(link).key for link in links}
+
+    assert keys == {"amazon:amazon.in:B07PR1CL3S"}
+    assert canonicalize(links[0]).url == "https://www.amazon.in/dp/B07PR1CL3S"
+
+
+def test_amazon_marketplaces_stay_distinct():
+    assert canonicalize("https://www.amazon.in/dp/B07PR1CL3S").key != canonicalize("https://www.amazon.com/dp/B07PR1CL3S").key
+
+
+def test_flipkart_keeps_the_variant_and_drops_tracking():
+    base = "https://www.flipkart.com/samsung-galaxy-s23-fe/p/itm1234abcd"
+
+    plain = canonicalize(f"{base}?pid=MOBGVTA2QK9&lid=LSTMOB&marketplace=FLIPKART&otracker=search")
+    deep_link = canonicalize("https://dl.flipkart.com/dl/samsung-galaxy-s23-fe/p/itm1234abcd?pid=MOBGVTA2QK9")
+    other_variant = canonicalize(f"{base}?pid=MOBGVTA2ZZZ")
+
+    assert plain.key == deep_link.key == "flipkart:itm1234abcd:MOBGVTA2QK9"
+    assert plain.url == f"{base}?pid=MOBGVTA2QK9"
+    assert other_variant.key != plain.key
+
+
+def test_myntra_uses_the_style_id():
+    first = canonicalize("https://www.myntra.com/jeans/roadster/roadster-men-blue-jeans/11345678/buy?utm_source=x")
+    second = canonicalize("https://myntra.com/jeans/roadster/roadster-men-blue-jeans/11345678")
+
+    assert first.key == second.key == "myntra:11345678"
+
+
+def test_unknown_sites_drop_tracking_but_keep_scheme_and_port():
+    result = canonicalize("http://shop.example.com:8080/item/42/?utm_source=mail&color=red&gclid=abc")
+
+    assert result.key == "url:shop.example.com:8080/item/42?color=red"
+    assert result.url == "http://shop.example.com:8080/item/42?color=red"
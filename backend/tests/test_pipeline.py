@@ -0,0 +1,95 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.models.product import Platform
+from app.scraper import pipeline
+from app.scraper.base import ScrapedProduct
+from app.scraper.pipeline import ScrapePipeline, ScrapeValidationError
+
+
+def product(**fields) -> ScrapedProduct:
+    values = {"title": "Prestige Iris 750", "price": 3199.0, "currency": "INR", "url": "https://www.amazon.in/dp/B00", "availability": True}
+    return ScrapedProduct(**{**values, **fields})
+
+
+def test_available_product_needs_a_price():
+    with pytest.raises(ScrapeValidationError):
+        ScrapePipeline.validate(product(price=0.0))
+
+
+def test_unavailable_product_may_have_no_price():
+    ScrapePipeline.validate(product(price=0.0, availability=False))
+
+
+@pytest.mark.parametrize("title", ["", "Unknown Product"])
+def test_title_is_required(title):
+    with pytest.raises(ScrapeValidationError):
+        ScrapePipeline.validate(product(title=title, availability=False))
+
+
+def test_missing_product_is_rejected():
+    with pytest.raises(ScrapeValidationError):
+        ScrapePipeline.validate(None)
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = []
+
+    async def acquire(self, platform):
+        self.acquired.append(platform)
+
+
+class FakePage:
+    async def goto(self, url, **kwargs):
+        pass
+
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage()
+
+
+@asynccontextmanager
+async def fake_context(platform: str):
+    yield FakeContext()
+
+
+class FakeScraper:
+    async def scrape(self, page, url):
+        return product(url=url)
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = CountingLimiter()
+    monkeypatch.setattr(pipeline, "rate_limiter", limiter)
+    monkeypatch.setattr(pipeline, "apply_stealth", lambda page: asyncio.sleep(0))
+    monkeypatch.setattr(pipeline.ScraperFactory, "get_scraper", staticmethod(lambda url: FakeScraper()))
+    monkeypatch.setattr(pipeline.scrape_cache, "store", lambda url, product: asyncio.sleep(0))
+    return limiter
+
+
+@pytest.mark.parametrize("use_fast_path", [True, False])
+async def test_browser_fallback_takes_one_token_per_product(limiter, monkeypatch, use_fast_path):
+    async def fast_path_misses(url):
+        return None
+    monkeypatch.setattr(pipeline.ScraperFactory, "scrape_fast", staticmethod(fast_path_misses))
+
+    result = await ScrapePipeline(fake_context, humanize=False, use_fast_path=use_fast_path).run("https://www.amazon.in/dp/B00")
+
+    assert result.product.source == "browser"
+    assert limiter.acquired == [Platform.AMAZON]
+
+
+async def test_fast_path_hit_takes_one_token(limiter, monkeypatch):
+    async def fast_path_hits(url):
+        return product(url=url, source="http")
+    monkeypatch.setattr(pipeline.ScraperFactory, "scrape_fast", staticmethod(fast_path_hits))
+
+    result = await ScrapePipeline(fake_context, humanize=False).run("https://www.amazon.in/dp/B00")
+
+    assert result.product.source == "http"
+    assert limiter.acquired == [Platform.AMAZON]
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.product import PriceHistory
+from app.services.price_history import record_prices
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+class Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Answers the latest-run query and records the bulk UPDATE/INSERT."""
+
+    def __init__(self, latest_runs):
+        self.latest_runs = latest_runs
+        self.updated = []
+        self.inserted = []
+
+    async def execute(self, statement, params=None):
+        if statement.is_select:
+            return Result(self.latest_runs)
+        if statement.is_update:
+            self.updated.extend(params)
+        elif statement.is_insert:
+            self.inserted.extend(params)
+        return Result([])
+
+
+def run(product_id: int, price: float, is_available: bool = True, sample_count: int = 3) -> PriceHistory:
+    return PriceHistory(
+        id=product_id * 10,
+        product_id=product_id,
+        price=price,
+        currency="INR",
+        is_available=is_available,
+        scraped_at=NOW - timedelta(hours=3),
+        last_seen_at=NOW - timedelta(hours=1),
+        sample_count=sample_count
+    )
+
+
+def observation(product_id: int, price: float, is_available: bool = True) -> dict:
+    return {"product_id": product_id, "price": price, "currency": "INR", "is_available": is_available, "scraped_at": NOW}
+
+
+@pytest.fixture
+def runs_mode(monkeypatch):
+    monkeypatch.setattr(settings, "PRICE_HISTORY_MODE", "runs")
+
+
+async def test_unchanged_observation_extends_the_latest_run(runs_mode):
+    session = FakeSession([run(1, 999.0)])
+
+    await record_prices(session, [observation(1, 999.0)])
+
+    assert session.updated == [{"id": 10, "last_seen_at": NOW, "sample_count": 4}]
+    assert session.inserted == []
+
+
+async def test_changes_start_new_runs(runs_mode):
+    session = FakeSession([run(1, 999.0), run(2, 500.0)])
+
+    await record_prices(session, [
+        observation(1, 949.0),  # Price moved
+        observation(2, 500.0, is_available=False),  # Went out of stock
+        observation(3, 120.0)  # No history yet
+    ])
+
+    assert session.updated == []
+    assert [(row["product_id"], row["price"], row["is_available"]) for row in session.inserted] == [
+        (1, 949.0, True), (2, 500.0, False), (3, 120.0, True)
+    ]
+    assert all(row["scraped_at"] == row["last_seen_at"] == NOW and row["sample_count"] == 1 for row in session.inserted)
+
+
+async def test_every_scrape_mode_always_inserts(monkeypatch):
+    monkeypatch.setattr(settings, "PRICE_HISTORY_MODE", "every_scrape")
+    session = FakeSession([run(1, 999.0)])
+
+    await record_prices(session, [observation(1, 999.0)])
+
+    assert session.updated == []
+    assert len(session.inserted) == 1
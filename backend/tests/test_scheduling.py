@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.worker.scheduling import compute_scrape_interval
+
+
+@pytest.fixture(autouse=True)
+def intervals(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_INTERVAL_MIN_MINUTES", 5)
+    monkeypatch.setattr(settings, "SCRAPE_INTERVAL_BASE_MINUTES", 60)
+    monkeypatch.setattr(settings, "SCRAPE_INTERVAL_MAX_MINUTES", 720)
+    monkeypatch.setattr(settings, "SCRAPE_ALERT_NEAR_PERCENT", 5.0)
+
+
+def test_stable_product_gets_the_base_interval():
+    assert compute_scrape_interval(0, None, True) == timedelta(minutes=60)
+
+
+def test_volatile_products_are_scraped_more_often():
+    assert compute_scrape_interval(3, None, True) == timedelta(minutes=15)
+
+
+def test_unavailable_products_are_checked_half_as_often():
+    assert compute_scrape_interval(0, None, False) == timedelta(minutes=120)
+
+
+def test_near_an_alert_target_drops_to_the_minimum():
+    assert compute_scrape_interval(0, 2.0, True) == timedelta(minutes=5)
+    assert compute_scrape_interval(0, 2.0, False) == timedelta(minutes=5)
+
+
+def test_alert_gap_ramps_up_to_the_base_interval():
+    # Halfway between 5% and 20%: halfway between 5 and 60 minutes
+    assert compute_scrape_interval(0, 12.5, True) == timedelta(minutes=32.5)
+    assert compute_scrape_interval(0, 30.0, True) == timedelta(minutes=60)
+
+
+def test_interval_is_clamped(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPE_INTERVAL_MAX_MINUTES", 90)
+
+    assert compute_scrape_interval(0, None, False) == timedelta(minutes=90)
+    assert compute_scrape_interval(1000, None, True) == timedelta(minutes=5)
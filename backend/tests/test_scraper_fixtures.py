@@ -0,0 +1,18 @@
+"""Fast-path correctness over the benchmark fixtures (bench_scrapers --no-browser)."""
+import pytest
+
+from app.scraper.factory import ScraperFactory
+from benchmarks.bench_scrapers import check, load_expected
+from benchmarks.static_server import FIXTURES_DIR
+
+EXPECTED = load_expected()
+
+
+@pytest.mark.parametrize("fixture", sorted(EXPECTED))
+def test_fast_path_extracts_fixture(fixture):
+    url = f"http://127.0.0.1/{fixture}"
+    html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+
+    product = ScraperFactory.get_scraper(url).extract_fast(html, url)
+
+    assert check(product, EXPECTED[fixture]) == []
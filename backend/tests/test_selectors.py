@@ -0,0 +1,28 @@
+import pytest
+
+from app.scraper.selectors import clean_value
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("₹1,299.00", 1299.0),
+    ("1,299.", 1299.0),
+    ("Rs. 499", 499.0),
+    ("", None),
+    ("Currently unavailable", None),
+    (None, None),
+])
+def test_price(raw, expected):
+    assert clean_value(raw, "price") == expected
+
+
+def test_digits_drop_decimal_points():
+    assert clean_value("Rs. 1,299", "digits") == 1299.0
+
+
+def test_flag_is_presence():
+    assert clean_value("", "flag") is True
+    assert clean_value(None, "flag") is False
+
+
+def test_text_is_stripped():
+    assert clean_value("  boAt Rockerz 450 \n", "text") == "boAt Rockerz 450"
@@ -0,0 +1,103 @@
+import pytest
+
+from app.core.config import settings
+from app.scraper.rate_limiter import LocalRateLimiter
+from app.services.telegram import MAX_MESSAGE_LENGTH, TelegramDispatcher, build_digest
+from benchmarks.telegram_stub import TelegramStubServer
+
+
+class NoPacing:
+    """Lets every send through, so the stub's own limits are what gets hit."""
+
+    async def acquire_bucket(self, name: str, rate: float, burst: float):
+        return
+
+
+def make_alert(alert_id: int, chat_id: str = "1001", name_length: int = 20) -> dict:
+    return {
+        "alert_id": alert_id,
+        "rule_type": "target_price",
+        "contact_method": "telegram",
+        "contact_value": chat_id,
+        "target_price": 1000.0,
+        "current_price": 900.0,
+        "product_name": f"Product {alert_id:04d} " + "x" * name_length,
+        "product_url": f"https://example.com/p/{alert_id}"
+    }
+
+
+@pytest.fixture
+def telegram_stub(monkeypatch):
+    with TelegramStubServer(latency=0) as stub:
+        monkeypatch.setattr(settings, "TELEGRAM_API_BASE", stub.base_url)
+        monkeypatch.setattr(settings, "TELEGRAM_BOT_TOKEN", "test-token")
+        yield stub
+
+
+def test_single_alert_is_one_plain_message():
+    parts = build_digest([make_alert(1)])
+
+    assert len(parts) == 1
+    message, count = parts[0]
+    assert count == 1
+    assert "alerts fired" not in message
+
+
+def test_digest_splits_on_alert_boundaries_under_the_length_limit():
+    alerts = [make_alert(alert_id, name_length=400) for alert_id in range(1, 41)]
+
+    parts = build_digest(alerts)
+
+    assert len(parts) > 1
+    assert all(len(message) <= MAX_MESSAGE_LENGTH for message, _ in parts)
+    assert sum(count for _, count in parts) == len(alerts)
+    # Every alert lands whole in the part its count says it does, in order
+    start = 0
+    for message, count in parts:
+        for alert in alerts[start:start + count]:
+            assert alert["product_name"] in message
+        start += count
+
+
+async def test_alerts_for_one_chat_are_coalesced(telegram_stub):
+    alerts = [make_alert(alert_id, chat_id=str(1000 + alert_id % 3)) for alert_id in range(1, 10)]
+
+    results = await TelegramDispatcher(limiter=LocalRateLimiter()).dispatch(alerts)
+
+    assert all(result["success"] for result in results)
+    assert [result["alert_id"] for result in results] == [alert["alert_id"] for alert in alerts]
+    assert sorted(message["chat_id"] for message in telegram_stub.messages) == ["1000", "1001", "1002"]
+    assert telegram_stub.rejected == 0
+
+
+async def test_429_is_retried_after_retry_after(telegram_stub):
+    dispatcher = TelegramDispatcher(limiter=NoPacing())
+
+    first = await dispatcher.dispatch([make_alert(1)])
+    second = await dispatcher.dispatch([make_alert(2)])  # Inside the stub's per-chat interval
+
+    assert first[0]["success"] and second[0]["success"]
+    assert telegram_stub.rejected == 1
+    assert len(telegram_stub.messages) == 2
+
+
+async def test_failed_digest_part_only_fails_its_own_alerts(telegram_stub, monkeypatch):
+    monkeypatch.setattr(settings, "TELEGRAM_MAX_RETRIES", 0)
+    alerts = [make_alert(alert_id, name_length=400) for alert_id in range(1, 41)]
+    first_part = build_digest(alerts)[0][1]
+
+    # No pacing and no retries: the second part hits the per-chat limit and gives up
+    results = await TelegramDispatcher(limiter=NoPacing()).dispatch(alerts)
+
+    assert all(result["success"] for result in results[:first_part])
+    assert not any(result["success"] for result in results[first_part:])
+    assert all(result["retryable"] for result in results[first_part:])
+    assert len(telegram_stub.messages) == 1
+
+
+async def test_non_telegram_alerts_are_skipped(telegram_stub):
+    results = await TelegramDispatcher(limiter=NoPacing()).dispatch([{**make_alert(1), "contact_method": "email"}])
+
+    assert results[0]["error"] == "method_not_supported"
+    assert not results[0]["retryable"]
+    assert telegram_stub.messages == []
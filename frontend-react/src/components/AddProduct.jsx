@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { trackProduct } from '../services/api';
+import { trackProduct, waitForTrackJob } from '../services/api';
 import { Search, Plus, Loader2 } from 'lucide-react';
 import { motion } from 'framer-motion';
 
@@ -12,7 +12,8 @@ export default function AddProduct({ onProductAdded }) {
     if (!url) return;
     setLoading(true);
     try {
-      await trackProduct(url);
+      const { data: job } = await trackProduct(url);
+      await waitForTrackJob(job);
       setUrl('');
       if (onProductAdded) onProductAdded();
     } catch (err) {
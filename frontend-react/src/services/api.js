@@ -8,6 +8,27 @@ export const api = axios.create({
 
 export const getProducts = () => api.get('/products/');
 export const trackProduct = (url) => api.post('/products/track', { url });
+export const getTrackJob = (jobId) => api.get(`/products/track/${jobId}`);
+
+// Resolves with the finished job once the first scrape is saved (or rejects if it failed)
+export const waitForTrackJob = (job) => new Promise((resolve, reject) => {
+  if (job.stage === 'saved') return resolve(job);
+  if (job.stage === 'failed') return reject(new Error(job.error || 'Tracking failed'));
+
+  const events = new EventSource(`${API_URL}/products/track/${job.job_id}/events`);
+  events.addEventListener('saved', (e) => { events.close(); resolve(JSON.parse(e.data)); });
+  events.addEventListener('failed', (e) => {
+    events.close();
+    reject(new Error(JSON.parse(e.data).error || 'Tracking failed'));
+  });
+  events.onerror = () => {
+    // Stream dropped: fall back to one status poll
+    events.close();
+    getTrackJob(job.job_id)
+      .then(({ data }) => (data.stage === 'saved' ? resolve(data) : reject(new Error(data.error || 'Tracking interrupted'))))
+      .catch(reject);
+  };
+});
 export const refreshProduct = (id) => api.post(`/products/${id}/refresh`);
 export const getPriceHistory = (id) => api.get(`/analytics/${id}/trend`);
 export const getAnalysis = (id) => api.get(`/analytics/${id}/analysis`);